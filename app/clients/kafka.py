@@ -1,18 +1,20 @@
+import asyncio
 import datetime
 import json
 import logging
 import os
-import sys
-from typing import Optional
+import time
+from typing import Any, Dict, Optional, Sequence, Set, Union
 
 from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
 from dotenv import load_dotenv
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
+from app.clients.kafka_codec import encode_dlq_message, encode_moderation_request
+from app.observability.metrics import (
+    KAFKA_DELIVERY_DURATION_SECONDS,
+    KAFKA_MESSAGES_SENT_TOTAL,
 )
+from app.observability.tracing import traced
 
 logger = logging.getLogger("app")
 
@@ -20,47 +22,172 @@ load_dotenv()
 
 
 class KafkaProducer:
-    def __init__(self, bootstrap_servers: str, moderation_topic: str, dlq_topic: str):
+    """
+    Отправка не блокирует вызывающего: сообщение кладется в буфер
+    AIOKafkaProducer, а send_* возвращает future доставки. Результат
+    каждой доставки считается в KAFKA_MESSAGES_SENT_TOTAL, ошибки
+    пишутся в лог. Неподтвержденные сообщения дожидаются в stop().
+
+    По умолчанию события модерации и DLQ пишутся в прежнем JSON:
+    воркеры, которые еще не обновлены, читают только его.
+    event_format="binary" включает формат из kafka_codec, когда все
+    потребители обновлены.
+
+    Сообщения ключуются по item_id: события одного объявления попадают
+    в одну партицию и обрабатываются по порядку, а воркеры из одной
+    consumer group делят партиции между собой.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers: str,
+        moderation_topic: str,
+        dlq_topic: str,
+        linger_ms: int = 0,
+        compression_type: Optional[str] = None,
+        max_batch_size: int = 16384,
+        acks: Union[int, str] = 1,
+        event_format: str = "json",
+    ):
         self._producer: Optional[AIOKafkaProducer] = None
         self._bootstrap = bootstrap_servers
         self._moderation_topic = moderation_topic
         self._dlq_topic = dlq_topic
+        self._linger_ms = linger_ms
+        self._compression_type = compression_type
+        self._max_batch_size = max_batch_size
+        self._acks = acks
+        self._event_format = event_format
+        self._in_flight: Set[asyncio.Future] = set()
+
+    @property
+    def moderation_topic(self) -> str:
+        return self._moderation_topic
 
     async def start(self) -> None:
         if not self._producer:
-            self._producer = AIOKafkaProducer(bootstrap_servers=self._bootstrap)
+            self._producer = AIOKafkaProducer(
+                bootstrap_servers=self._bootstrap,
+                linger_ms=self._linger_ms,
+                compression_type=self._compression_type,
+                max_batch_size=self._max_batch_size,
+                acks=self._acks,
+            )
             await self._producer.start()
 
     async def stop(self) -> None:
         if self._producer:
+            await self._producer.flush()
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
             await self._producer.stop()
 
-    async def send_moderation_request(
-        self, task_id: int, item_id: int, timestamp: datetime.datetime
-    ):
+    async def _send(
+        self, topic: str, data: bytes, key: Optional[Union[int, str]] = None
+    ) -> asyncio.Future:
         if not self._producer:
             await self.start()
 
-        message = {
-            "task_id": task_id,
-            "item_id": item_id,
-            "timestamp": timestamp.isoformat(),
-        }
-        data = json.dumps(message).encode("utf-8")
-        await self._producer.send_and_wait(self._moderation_topic, data)
+        started_at = time.perf_counter()
+        delivery = await self._producer.send(
+            topic, data, key=str(key).encode("utf-8") if key is not None else None
+        )
+        self._in_flight.add(delivery)
+        delivery.add_done_callback(
+            lambda future: self._on_delivery(future, topic, started_at)
+        )
+        return delivery
+
+    def _on_delivery(
+        self, delivery: asyncio.Future, topic: str, started_at: float
+    ) -> None:
+        self._in_flight.discard(delivery)
+
+        if delivery.cancelled() or delivery.exception() is not None:
+            KAFKA_MESSAGES_SENT_TOTAL.labels(topic=topic, result="error").inc()
+            logger.error(
+                "Failed to deliver message to %s: %r",
+                topic,
+                None if delivery.cancelled() else delivery.exception(),
+            )
+            return
 
-    async def send_to_dlq(self, original_message: str, error: str, retry_count: int):
-        if not self._producer:
-            await self.start()
+        KAFKA_MESSAGES_SENT_TOTAL.labels(topic=topic, result="ok").inc()
+        KAFKA_DELIVERY_DURATION_SECONDS.labels(topic=topic).observe(
+            time.perf_counter() - started_at
+        )
+
+    def _encode_moderation_request(
+        self, task_id: int, item_id: int, timestamp: datetime.datetime
+    ) -> bytes:
+        if self._event_format == "json":
+            message = {
+                "task_id": task_id,
+                "item_id": item_id,
+                "timestamp": timestamp.isoformat(),
+            }
+            return json.dumps(message).encode("utf-8")
+
+        return encode_moderation_request(task_id, item_id, timestamp)
+
+    def _encode_outbox_event(self, topic: str, payload: Dict[str, Any]) -> bytes:
+        if topic == self._moderation_topic:
+            return self._encode_moderation_request(
+                payload["task_id"],
+                payload["item_id"],
+                datetime.datetime.fromisoformat(payload["timestamp"]),
+            )
+
+        return json.dumps(payload).encode("utf-8")
+
+    @traced("kafka.send")
+    async def send_moderation_request(
+        self, task_id: int, item_id: int, timestamp: datetime.datetime
+    ) -> asyncio.Future:
+        data = self._encode_moderation_request(task_id, item_id, timestamp)
+        return await self._send(self._moderation_topic, data, key=item_id)
+
+    @traced("kafka.send_batch")
+    async def send_batch(self, events: Sequence[Dict[str, Any]]) -> None:
+        """
+        Публикует события из outbox: все сообщения сначала попадают
+        в буфер продюсера, где склеиваются в батчи по linger_ms,
+        затем ждем подтверждения всех сразу.
+        """
+        deliveries = [
+            await self._send(
+                event["topic"],
+                self._encode_outbox_event(event["topic"], event["payload"]),
+                key=event["key"],
+            )
+            for event in events
+        ]
+        await asyncio.gather(*deliveries)
 
-        dlq_message = {
-            "original_message": original_message,
-            "error": error,
-            "timestamp": datetime.datetime.now().isoformat(),
-            "retry_count": retry_count,
-        }
-        data = json.dumps(dlq_message).encode("utf-8")
-        await self._producer.send_and_wait(self._dlq_topic, data)
+    @traced("kafka.send_dlq")
+    async def send_to_dlq(
+        self,
+        original_message: str,
+        error: str,
+        retry_count: int,
+        item_id: Optional[int] = None,
+    ) -> asyncio.Future:
+        timestamp = datetime.datetime.now()
+
+        if self._event_format == "json":
+            dlq_message = {
+                "original_message": original_message,
+                "error": error,
+                "timestamp": timestamp.isoformat(),
+                "retry_count": retry_count,
+                "item_id": item_id,
+            }
+            data = json.dumps(dlq_message).encode("utf-8")
+        else:
+            data = encode_dlq_message(
+                original_message, error, retry_count, timestamp, item_id
+            )
+
+        return await self._send(self._dlq_topic, data, key=item_id)
 
 
 class KafkaConsumer:
@@ -91,10 +218,19 @@ class KafkaConsumer:
             await self.consumer.stop()
 
 
+def parse_acks(value: str) -> Union[int, str]:
+    return value if value == "all" else int(value)
+
+
 kafka_producer = KafkaProducer(
     bootstrap_servers=os.getenv("KAFKA_BOOTSTRAP"),
     moderation_topic=os.getenv("MODERATION_TOPIC"),
     dlq_topic=os.getenv("DLQ_TOPIC"),
+    linger_ms=int(os.getenv("KAFKA_LINGER_MS", 0)),
+    compression_type=os.getenv("KAFKA_COMPRESSION_TYPE") or None,
+    max_batch_size=int(os.getenv("KAFKA_MAX_BATCH_SIZE", 16384)),
+    acks=parse_acks(os.getenv("KAFKA_ACKS", "1")),
+    event_format=os.getenv("KAFKA_EVENT_FORMAT", "json"),
 )
 
 
@@ -0,0 +1,113 @@
+"""
+Бинарный формат событий модерации и DLQ в Kafka.
+
+Первый байт сообщения — версия схемы, дальше поля фиксированной
+длины в big-endian:
+- событие модерации v1: task_id, item_id и время создания задачи
+  в микросекундах от эпохи (25 байт против ~80 в JSON);
+- сообщение DLQ v1: время, item_id (-1, если неизвестен), число
+  попыток и длина error (по 4 байта), за ними error и original_message
+  в UTF-8. Длина original_message не хранится: он занимает остаток
+  сообщения, так что в DLQ уходит и неразобранное событие любого размера.
+
+Время хранится как есть, без часового пояса, как в moderation_results.
+
+Сообщения прежнего формата (JSON) начинаются с "{" и тоже читаются,
+пока в топиках остаются события, записанные до перехода.
+
+Событие модерации, которое не удалось разобрать (неизвестная версия,
+обрезанное сообщение, битый JSON), поднимает UnsupportedEventFormatError.
+"""
+
+import datetime
+import json
+import struct
+from typing import Any, Dict, Optional
+
+from app.errors import UnsupportedEventFormatError
+
+SCHEMA_VERSION = 1
+
+_LEGACY_JSON_PREFIX = ord("{")
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+_MODERATION_REQUEST_V1 = struct.Struct(">Bqqq")
+_DLQ_HEADER_V1 = struct.Struct(">BqqII")
+
+
+def _to_micros(timestamp: datetime.datetime) -> int:
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros: int) -> datetime.datetime:
+    return _EPOCH + datetime.timedelta(microseconds=micros)
+
+
+def _check_version(data: bytes) -> None:
+    if not data or data[0] != SCHEMA_VERSION:
+        raise UnsupportedEventFormatError(
+            f"Unsupported event schema version: {data[:1]!r}"
+        )
+
+
+def encode_moderation_request(
+    task_id: int, item_id: int, timestamp: datetime.datetime
+) -> bytes:
+    return _MODERATION_REQUEST_V1.pack(
+        SCHEMA_VERSION, task_id, item_id, _to_micros(timestamp)
+    )
+
+
+def decode_moderation_request(data: bytes) -> Dict[str, Any]:
+    try:
+        if data[:1] == bytes([_LEGACY_JSON_PREFIX]):
+            event = json.loads(data.decode("utf-8"))
+            event["timestamp"] = datetime.datetime.fromisoformat(event["timestamp"])
+            return event
+
+        _check_version(data)
+        _, task_id, item_id, micros = _MODERATION_REQUEST_V1.unpack(data)
+    except (struct.error, ValueError, KeyError, TypeError) as e:
+        raise UnsupportedEventFormatError(
+            f"Malformed moderation event: {e}"
+        ) from e
+
+    return {"task_id": task_id, "item_id": item_id, "timestamp": _from_micros(micros)}
+
+
+def encode_dlq_message(
+    original_message: str,
+    error: str,
+    retry_count: int,
+    timestamp: datetime.datetime,
+    item_id: Optional[int] = None,
+) -> bytes:
+    error_bytes = error.encode("utf-8")
+    header = _DLQ_HEADER_V1.pack(
+        SCHEMA_VERSION,
+        _to_micros(timestamp),
+        item_id if item_id is not None else -1,
+        retry_count,
+        len(error_bytes),
+    )
+    return header + error_bytes + original_message.encode("utf-8")
+
+
+def decode_dlq_message(data: bytes) -> Dict[str, Any]:
+    if data[:1] == bytes([_LEGACY_JSON_PREFIX]):
+        message = json.loads(data.decode("utf-8"))
+        message["timestamp"] = datetime.datetime.fromisoformat(message["timestamp"])
+        message.setdefault("item_id", None)
+        return message
+
+    _check_version(data)
+    _, micros, item_id, retry_count, error_length = _DLQ_HEADER_V1.unpack_from(data)
+    error_end = _DLQ_HEADER_V1.size + error_length
+    return {
+        "original_message": data[error_end:].decode("utf-8"),
+        "error": data[_DLQ_HEADER_V1.size : error_end].decode("utf-8"),
+        "timestamp": _from_micros(micros),
+        "retry_count": retry_count,
+        "item_id": item_id if item_id >= 0 else None,
+    }
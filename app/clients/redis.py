@@ -1,17 +1,13 @@
 import json
 import logging
 import os
-import sys
-from typing import Any, Optional
+from typing import Any, Mapping, Optional, Sequence, Tuple
 
 import redis.asyncio as redis
 from dotenv import load_dotenv
+from redis.asyncio.client import PubSub
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
-)
+from app.observability.metrics import REDIS_PAYLOAD_BYTES, track_redis_command
 
 logger = logging.getLogger("app")
 
@@ -29,40 +25,94 @@ class RedisClient:
     async def start(self) -> None:
         if not self._client:
             self._client = await redis.Redis(host=self.host, port=self.port, db=self.db)
-            msg = f"Redis ping: {await self._client.ping()}"
-            logger.info(msg)
+            logger.info("Redis ping: %s", await self._client.ping())
 
     async def stop(self) -> None:
         if self._client:
             await self._client.aclose()
             self._client = None
 
+    @staticmethod
+    def _serialize(value: Any, command: str = "set") -> str:
+        serialized_value = json.dumps(value, default=str)
+        REDIS_PAYLOAD_BYTES.labels(command=command).observe(len(serialized_value))
+        return serialized_value
+
+    @staticmethod
+    def _deserialize(value: Optional[bytes], command: str) -> Optional[Any]:
+        if not value:
+            return None
+
+        REDIS_PAYLOAD_BYTES.labels(command=command).observe(len(value))
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+
+    @track_redis_command("get")
     async def get(self, key: str) -> Optional[Any]:
         if not self._client:
             await self.start()
 
-        value = await self._client.get(key)
-        if value:
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
-        return None
+        return self._deserialize(await self._client.get(key), "get")
+
+    @track_redis_command("get_ttl")
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[Any], int]:
+        """
+        Значение и оставшийся TTL ключа за один поход в Redis.
+        TTL равен -2, если ключа нет, и -1, если у ключа нет срока жизни.
+        """
+        if not self._client:
+            await self.start()
+
+        async with self._client.pipeline(transaction=False) as pipeline:
+            value, ttl = await pipeline.get(key).ttl(key).execute()
 
+        return self._deserialize(value, "get"), ttl
+
+    @track_redis_command("set")
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         if not self._client:
             await self.start()
 
         ttl = ttl or self.ttl
-        serialized_value = json.dumps(value, default=str)
-        return await self._client.setex(key, ttl, serialized_value)
+        return await self._client.setex(key, ttl, self._serialize(value))
 
+    @track_redis_command("set_many")
+    async def set_many(
+        self, values: Mapping[str, Any], ttl: Optional[int] = None
+    ) -> None:
+        """SETEX для нескольких ключей одним пайплайном."""
+        if not values:
+            return
+
+        if not self._client:
+            await self.start()
+
+        ttl = ttl or self.ttl
+        async with self._client.pipeline(transaction=False) as pipeline:
+            for key, value in values.items():
+                pipeline.setex(key, ttl, self._serialize(value))
+            await pipeline.execute()
+
+    @track_redis_command("delete")
     async def delete(self, key: str) -> bool:
         if not self._client:
             await self.start()
 
         return await self._client.delete(key) > 0
 
+    @track_redis_command("delete")
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """Удаляет ключи одной командой DEL, возвращает число удаленных."""
+        if not keys:
+            return 0
+
+        if not self._client:
+            await self.start()
+
+        return await self._client.delete(*keys)
+
     async def delete_pattern(self, pattern: str) -> int:
         if not self._client:
             await self.start()
@@ -79,6 +129,25 @@ class RedisClient:
 
         return deleted_count
 
+    @track_redis_command("publish")
+    async def publish(self, channel: str, value: Any) -> int:
+        if not self._client:
+            await self.start()
+
+        return await self._client.publish(channel, self._serialize(value, "publish"))
+
+    async def subscribe(self, channel: str) -> PubSub:
+        """
+        Подписка на канал на отдельном соединении. Служебные сообщения
+        о подписке не приходят, закрывать через PubSub.aclose().
+        """
+        if not self._client:
+            await self.start()
+
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        return pubsub
+
     def make_key(self, prefix: str, identifier: int) -> str:
         return f"{prefix}:{identifier}"
 
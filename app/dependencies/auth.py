@@ -38,4 +38,15 @@ async def get_current_active_account(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account is blocked",
         )
-    return current_account
\ No newline at end of file
+    return current_account
+
+
+async def get_current_admin_account(
+    current_account: Account = Depends(get_current_active_account),
+) -> Account:
+    if not current_account.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_account
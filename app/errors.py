@@ -44,3 +44,27 @@ class InvalidCredentialsError(Exception):
     """Ошибка указывает на неверные учетные данные"""
 
     pass
+
+
+class ProfilerBusyError(Exception):
+    """Ошибка указывает на то, что профилирование уже запущено"""
+
+    pass
+
+
+class UnsupportedEventFormatError(Exception):
+    """Ошибка указывает на то, что сообщение Kafka в неизвестном формате"""
+
+    pass
+
+
+class InvalidUpdateFieldError(Exception):
+    """Ошибка указывает на то, что поле нельзя обновлять через update"""
+
+    pass
+
+
+class InvalidIngestionRecordError(Exception):
+    """Ошибка указывает на то, что запись для массовой загрузки некорректна"""
+
+    pass
@@ -0,0 +1,67 @@
+"""
+Массовая загрузка продавцов и объявлений из NDJSON-файла.
+
+Запуск:
+    python -m app.ingest sellers sellers.ndjson
+    python -m app.ingest advertisements ads.ndjson --prescore
+    zcat ads.ndjson.gz | python -m app.ingest advertisements -
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator, BinaryIO
+
+from app.clients.redis import redis_client
+from app.observability.logs import setup_logging, stop_logging
+from app.repositories.model import model_client
+from app.services.ingestion_service import (
+    INGEST_CHUNK_SIZE,
+    get_ingestion_service,
+    parse_ndjson,
+)
+
+READ_SIZE = 1 << 20
+
+
+async def read_blocks(file: BinaryIO) -> AsyncIterator[bytes]:
+    while block := await asyncio.to_thread(file.read, READ_SIZE):
+        yield block
+
+
+async def ingest(table: str, file: BinaryIO, chunk_size: int, prescore: bool) -> None:
+    ingestion_service = get_ingestion_service()
+    records = parse_ndjson(read_blocks(file))
+    if table == "sellers":
+        result = await ingestion_service.ingest_sellers(records, chunk_size)
+    else:
+        if prescore:
+            model_client.initialize_model()
+        result = await ingestion_service.ingest_advertisements(
+            records, chunk_size, prescore
+        )
+    print(result.model_dump_json())
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("table", choices=("sellers", "advertisements"))
+    parser.add_argument("path", help="NDJSON-файл, - для stdin")
+    parser.add_argument("--chunk-size", type=int, default=INGEST_CHUNK_SIZE)
+    parser.add_argument("--prescore", action="store_true")
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        if args.path == "-":
+            await ingest(args.table, sys.stdin.buffer, args.chunk_size, args.prescore)
+        else:
+            with open(args.path, "rb") as file:
+                await ingest(args.table, file, args.chunk_size, args.prescore)
+    finally:
+        await redis_client.stop()
+        stop_logging()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,28 +1,54 @@
 from contextlib import asynccontextmanager
 
-import uvicorn
 from fastapi import APIRouter, Depends, FastAPI, status
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST
 from starlette.responses import Response
 
 from app.clients.kafka import kafka_producer
 from app.clients.redis import redis_client
+from app.observability.logs import setup_logging, stop_logging
+from app.observability.loop_monitor import LoopMonitor
 from app.observability.middleware import PrometheusMiddleware
+from app.observability.multiprocess import generate_metrics
+from app.observability.tracing import setup_tracing, shutdown_tracing
 from app.repositories.model import get_model, model_client
-from app.routes import auth, close, moderation_result, predict
+from app.responses import ORJSONResponse
+from app.routes import (
+    auth,
+    close,
+    ingestion,
+    listing,
+    moderation_result,
+    predict,
+    profiling,
+)
+from app.services.moderation_notifier import moderation_notifier
+from app.workers.outbox_relay import outbox_relay
+
+loop_monitor = LoopMonitor(component="api")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    setup_logging()
+    loop_monitor.start()
+    setup_tracing(service_name="api")
     model_client.initialize_model()
     await kafka_producer.start()
     await redis_client.start()
+    outbox_relay.start()
+    moderation_notifier.start()
     yield
+    await moderation_notifier.stop()
+    await outbox_relay.stop()
     await kafka_producer.stop()
     await redis_client.stop()
+    await loop_monitor.stop()
+    shutdown_tracing()
+    stop_logging()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 router = APIRouter()
 app.add_middleware(PrometheusMiddleware)
 
@@ -39,19 +65,21 @@ def health(model=Depends(get_model)):
 
 @app.get("/metrics")
 async def metrics():
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    return Response(content=generate_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 
 app.include_router(router)
 app.include_router(predict.router)
 app.include_router(moderation_result.router)
 app.include_router(close.router)
+app.include_router(listing.router)
 app.include_router(auth.router, prefix="/auth", tags=["authentication"])
+app.include_router(profiling.router, prefix="/admin", tags=["admin"])
+app.include_router(listing.admin_router, prefix="/admin", tags=["admin"])
+app.include_router(ingestion.router, prefix="/admin", tags=["admin"])
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-    )
+    from app.server import main
+
+    main()
@@ -8,6 +8,14 @@ class Account(BaseModel):
     login: str = Field(min_length=3, max_length=50)
     password: str = Field(min_length=6)
     is_blocked: bool = Field(default=False)
+    is_admin: bool = Field(default=False)
+
+
+class AccountInfo(BaseModel):
+    id: int
+    login: str
+    is_blocked: bool
+    is_admin: bool
 
 
 class AccountCreate(BaseModel):
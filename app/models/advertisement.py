@@ -1,3 +1,5 @@
+from typing import Annotated, List
+
 from pydantic import BaseModel, Field
 
 
@@ -24,3 +26,12 @@ class Advertisement(BaseModel):
 
 class AdvertisementID(BaseModel):
     id: int = Field(ge=0)
+
+
+class AdvertisementIDs(BaseModel):
+    ids: List[Annotated[int, Field(ge=0)]] = Field(min_length=1, max_length=1000)
+
+
+class ClosedAdvertisements(BaseModel):
+    closed: List[Advertisement]
+    not_found: List[int]
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class IngestionResult(BaseModel):
+    table: str
+    rows: int
+    chunks: int
+    scored: int = 0
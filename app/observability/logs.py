@@ -0,0 +1,140 @@
+"""
+Единая настройка логирования для API и воркера.
+
+Все логгеры пишут в QueueHandler, а в stdout записи выводит фоновый поток
+QueueListener, поэтому запись логов не блокирует event loop. Сообщения
+форматируются уже в фоновом потоке: логируйте через аргументы
+(logger.info("item_id=%s", item_id)), а не f-строками.
+
+Переменные окружения:
+- LOG_LEVEL: уровень логирования (INFO по умолчанию)
+- LOG_FORMAT: json (по умолчанию) или text — прежний цветной формат
+- LOG_SAMPLE_RATES: доля сохраняемых записей по логгерам,
+  например "app.cache=0.01" для сообщений о попаданиях в кэш
+"""
+
+import atexit
+import copy
+import datetime
+import logging
+import os
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+import orjson
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TEXT_FORMAT = "\033[92m%(levelname)s\033[0m:  \t  %(message)s"
+
+_listener: Optional[QueueListener] = None
+_sampling_filters: Dict[str, logging.Filter] = {}
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+
+        return orjson.dumps(payload).decode("utf-8")
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает только долю rate записей логгера."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return self.rate >= 1 or random.random() < self.rate
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler, который не форматирует сообщение в вызывающем потоке.
+
+    Стандартный prepare() подставляет аргументы в сообщение до постановки
+    в очередь, то есть на event loop. Здесь в очередь уходит копия записи
+    с исходными msg и args, а форматирует ее обработчик в QueueListener.
+    Трейсбек исключения превращается в текст сразу, пока он актуален.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+
+        record = copy.copy(record)
+        record.exc_info = None
+        return record
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, rate = item.split("=", 1)
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def setup_logging() -> None:
+    global _listener
+
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if os.getenv("LOG_FORMAT", "json") == "text":
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    else:
+        stream_handler.setFormatter(JSONFormatter())
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [LazyQueueHandler(log_queue)]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+    for name, sampling_filter in _sampling_filters.items():
+        logging.getLogger(name).removeFilter(sampling_filter)
+    _sampling_filters.clear()
+
+    for name, rate in parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", "")).items():
+        sampling_filter = SamplingFilter(rate)
+        logging.getLogger(name).addFilter(sampling_filter)
+        _sampling_filters[name] = sampling_filter
+
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """
+    Дописывает накопленные в очереди записи и останавливает фоновый поток.
+    Дальнейшие записи пишутся в stdout синхронно.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        logging.getLogger().handlers = list(_listener.handlers)
+        _listener = None
+
+
+atexit.register(stop_logging)
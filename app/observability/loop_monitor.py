@@ -0,0 +1,122 @@
+"""
+Мониторинг задержек event loop и поиск блокирующих вызовов.
+
+В async-обработчиках есть синхронные вызовы (инференс sklearn, md5_crypt,
+загрузка модели через pickle), которые останавливают весь event loop.
+LoopMonitor измеряет это двумя способами:
+- фоновая задача спит interval секунд и пишет в EVENT_LOOP_LAG_SECONDS,
+  насколько позже она проснулась;
+- сторожевой поток следит за тем, как давно задача последний раз
+  просыпалась, и если loop завис дольше block_threshold, логирует стек,
+  который в этот момент выполняется в потоке event loop.
+
+Переменные окружения:
+- LOOP_MONITOR_ENABLED: включить мониторинг (true по умолчанию)
+- LOOP_MONITOR_INTERVAL: период замера в секундах
+- LOOP_BLOCK_THRESHOLD: порог блокировки в секундах
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from contextlib import suppress
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from app.observability.metrics import EVENT_LOOP_BLOCKS_TOTAL, EVENT_LOOP_LAG_SECONDS
+
+load_dotenv()
+
+logger = logging.getLogger("app.loop")
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        component: str,
+        interval: Optional[float] = None,
+        block_threshold: Optional[float] = None,
+    ):
+        self.component = component
+        self.enabled = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+        self.interval = (
+            interval
+            if interval is not None
+            else float(os.getenv("LOOP_MONITOR_INTERVAL", 0.1))
+        )
+        self.block_threshold = (
+            block_threshold
+            if block_threshold is not None
+            else float(os.getenv("LOOP_BLOCK_THRESHOLD", 0.25))
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._heartbeat = 0.0
+        self._loop_thread_id: Optional[int] = None
+
+    def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stopped.clear()
+
+        self._task = asyncio.get_running_loop().create_task(self._measure_lag())
+        self._watchdog = threading.Thread(
+            target=self._watch, name=f"loop-watchdog-{self.component}", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._stopped.set()
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._watchdog.join(timeout=self.interval * 2)
+
+        self._task = None
+        self._watchdog = None
+
+    async def _measure_lag(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+
+            EVENT_LOOP_LAG_SECONDS.labels(component=self.component).observe(
+                max(now - start - self.interval, 0.0)
+            )
+            self._heartbeat = now
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+
+        while not self._stopped.wait(self.interval):
+            heartbeat = self._heartbeat
+            blocked_for = time.perf_counter() - heartbeat - self.interval
+
+            # Об одной блокировке сообщаем один раз
+            if blocked_for < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+            reported_heartbeat = heartbeat
+
+            EVENT_LOOP_BLOCKS_TOTAL.labels(component=self.component).inc()
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            logger.warning(
+                "Event loop of %s blocked for more than %.3fs, current stack:\n%s",
+                self.component,
+                blocked_for,
+                stack,
+            )
@@ -38,19 +38,108 @@ MODEL_PREDICTION_PROBABILITY = Histogram(
     "Distribution of prediction probabilities",
 )
 
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between scheduled and actual wake-up of the event loop",
+    ["component"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+EVENT_LOOP_BLOCKS_TOTAL = Counter(
+    "event_loop_blocks_total",
+    "Number of times the event loop was blocked longer than the threshold",
+    ["component"],
+)
+
+REQUEST_STAGE_DURATION_SECONDS = Histogram(
+    "request_stage_duration_seconds",
+    "Duration of a request processing stage in seconds",
+    ["endpoint", "stage"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+             0.25, 0.5, 1, 2.5),
+)
+
+CACHE_REQUESTS_TOTAL = Counter(
+    "cache_requests_total",
+    "Cache lookups by result: hit, miss or stale",
+    ["cache", "result"],
+)
+
+CACHE_HIT_TTL_REMAINING_SECONDS = Histogram(
+    "cache_hit_ttl_remaining_seconds",
+    "Remaining TTL of a cache entry at hit time",
+    ["cache"],
+    buckets=(10, 30, 60, 300, 600, 900, 1200, 1800, 2400, 3000, 3600, 7200),
+)
+
+REDIS_COMMAND_DURATION_SECONDS = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command duration in seconds",
+    ["command"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+             0.25, 0.5, 1),
+)
+
+REDIS_PAYLOAD_BYTES = Histogram(
+    "redis_payload_bytes",
+    "Size of values read from and written to Redis",
+    ["command"],
+    buckets=(16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536),
+)
+
+KAFKA_MESSAGES_SENT_TOTAL = Counter(
+    "kafka_messages_sent_total",
+    "Kafka producer deliveries by topic and result: ok or error",
+    ["topic", "result"],
+)
+
+KAFKA_DELIVERY_DURATION_SECONDS = Histogram(
+    "kafka_delivery_duration_seconds",
+    "Time from producer send to broker acknowledgement",
+    ["topic"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+DUPLICATE_EVENTS_TOTAL = Counter(
+    "moderation_duplicate_events_total",
+    "Redelivered moderation events skipped by the worker, by where the "
+    "finished task was found: local dedupe set or db",
+    ["source"],
+)
+
+INGESTED_ROWS_TOTAL = Counter(
+    "ingested_rows_total",
+    "Rows written by bulk ingestion, by table",
+    ["table"],
+)
+
+OUTBOX_EVENTS_PUBLISHED_TOTAL = Counter(
+    "outbox_events_published_total",
+    "Outbox events published to Kafka by the relay",
+)
+
+OUTBOX_RELAY_ERRORS_TOTAL = Counter(
+    "outbox_relay_errors_total",
+    "Failed outbox relay iterations, events stay in the outbox",
+)
+
+OUTBOX_BATCH_SIZE = Histogram(
+    "outbox_batch_size",
+    "Number of outbox events published in one relay iteration",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
 
-def track_db_query(query_type):
+def track_redis_command(command):
     def decorator(func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
-                result = await func(*args, **kwargs)
-                return result
+                return await func(*args, **kwargs)
             finally:
-                duration = time.time() - start_time
-                DB_QUERY_DURATION_SECONDS.labels(query_type=query_type).observe(
-                    duration
+                REDIS_COMMAND_DURATION_SECONDS.labels(command=command).observe(
+                    time.perf_counter() - start_time
                 )
 
         return async_wrapper
@@ -1,33 +1,87 @@
+import os
 import time
+from functools import partial
+from typing import Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from dotenv import load_dotenv
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.observability.metrics import REQUEST_DURATION_SECONDS, REQUESTS_TOTAL
+from app.observability.tracing import request_span, reset_endpoint, set_endpoint
 
+load_dotenv()
 
-class PrometheusMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+UNMATCHED_ENDPOINT = "unmatched"
+OVERFLOW_ENDPOINT = "other"
 
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path == "/metrics":
-            return await call_next(request)
 
-        method = request.method
-        endpoint = request.url.path
+class PrometheusMiddleware:
+    """
+    Чистый ASGI middleware для сбора HTTP-метрик.
 
-        start_time = time.time()
+    В отличие от BaseHTTPMiddleware не создает отдельную задачу и поток
+    для тела ответа на каждый запрос и не ломает стриминговые ответы:
+    статус-код перехватывается из сообщения http.response.start.
+
+    Лейбл endpoint берется из шаблона сматченного роута
+    (/moderation_result/{task_id}), а не из фактического пути,
+    иначе каждый task_id порождает новый временной ряд.
+    Запросы мимо роутов попадают в UNMATCHED_ENDPOINT, а все шаблоны
+    сверх max_endpoints — в OVERFLOW_ENDPOINT. Тот же лейбл получают
+    гистограммы этапов запроса из app.observability.tracing.
+    """
+
+    def __init__(self, app: ASGIApp, max_endpoints: Optional[int] = None):
+        self.app = app
+        self.max_endpoints = (
+            max_endpoints
+            if max_endpoints is not None
+            else int(os.getenv("METRICS_MAX_ENDPOINTS", 100))
+        )
+        self._endpoints: set[str] = set()
+
+    def _endpoint_label(self, scope: Scope) -> str:
+        route = scope.get("route")
+        path = getattr(route, "path", None)
+
+        if path is None:
+            return UNMATCHED_ENDPOINT
+
+        if path not in self._endpoints:
+            if len(self._endpoints) >= self.max_endpoints:
+                return OVERFLOW_ENDPOINT
+            self._endpoints.add(path)
+
+        return path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
         status_code = 500
 
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = set_endpoint(partial(self._endpoint_label, scope))
+        start_time = time.perf_counter()
+
         try:
-            response = await call_next(request)
-            status_code = response.status_code
-            return response
+            with request_span(f"{method} {scope['path']}") as span:
+                await self.app(scope, receive, send_wrapper)
         finally:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
+            endpoint = self._endpoint_label(scope)
+            reset_endpoint(token)
+
+            if span is not None:
+                span.update_name(f"{method} {endpoint}")
+
             REQUEST_DURATION_SECONDS.labels(method=method, endpoint=endpoint).observe(
                 duration
             )
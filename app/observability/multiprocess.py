@@ -0,0 +1,47 @@
+"""
+Поддержка multiprocess-режима prometheus_client.
+
+Когда сервис запущен в несколько воркеров за одним портом, каждый воркер
+держит свои счетчики в памяти, и /metrics отдает данные случайного воркера.
+В multiprocess-режиме воркеры пишут значения в mmap-файлы общей директории
+PROMETHEUS_MULTIPROC_DIR, а при скрейпе они агрегируются.
+
+Переменная PROMETHEUS_MULTIPROC_DIR должна быть выставлена до импорта
+prometheus_client, поэтому ее задает лаунчер, а не .env.
+"""
+
+import glob
+import os
+from typing import Optional
+
+from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+
+
+def get_multiprocess_dir() -> Optional[str]:
+    return os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+
+def prepare_multiprocess_dir(path: Optional[str] = None) -> None:
+    """Создает директорию и удаляет файлы воркеров от прошлого запуска."""
+    path = path or get_multiprocess_dir()
+    if not path:
+        return
+
+    os.makedirs(path, exist_ok=True)
+    for db_file in glob.glob(os.path.join(path, "*.db")):
+        os.remove(db_file)
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Удаляет live-gauge файлы завершившегося воркера."""
+    if get_multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
+
+
+def generate_metrics() -> bytes:
+    if not get_multiprocess_dir():
+        return generate_latest()
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
@@ -0,0 +1,165 @@
+"""
+Семплирующий профайлер для живого процесса API или воркера.
+
+Отдельный поток раз в interval секунд снимает стеки всех потоков процесса
+через sys._current_frames() и считает, сколько раз встретился каждый стек.
+Event loop при этом продолжает обслуживать запросы, поэтому профиль
+отражает реальную нагрузку.
+
+Результат отдается в двух форматах:
+- collapsed: строки "thread;func (file:line);... count", формат flamegraph.pl
+  и speedscope;
+- speedscope: JSON для https://www.speedscope.app.
+
+В воркере профайлинг включается сигналом SIGUSR1 (см. install_signal_handler).
+"""
+
+import asyncio
+import collections
+import logging
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Counter, Dict, Optional, Tuple
+
+import orjson
+from dotenv import load_dotenv
+
+from app.errors import ProfilerBusyError
+
+load_dotenv()
+
+logger = logging.getLogger("app.profiler")
+
+Stack = Tuple[str, ...]
+
+_profile_lock = threading.Lock()
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def _collect_stack(frame, thread_name: str) -> Stack:
+    stack = []
+    while frame is not None:
+        stack.append(_frame_name(frame))
+        frame = frame.f_back
+    stack.append(thread_name)
+    return tuple(reversed(stack))
+
+
+def sample(duration: float, interval: float) -> Counter[Stack]:
+    """Снимает стеки всех потоков, кроме текущего, в течение duration секунд."""
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("Profiling is already in progress")
+
+    try:
+        samples: Counter[Stack] = collections.Counter()
+        own_thread_id = threading.get_ident()
+        deadline = time.perf_counter() + duration
+
+        while time.perf_counter() < deadline:
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id:
+                    continue
+                thread_name = thread_names.get(thread_id, str(thread_id))
+                samples[_collect_stack(frame, thread_name)] += 1
+            time.sleep(interval)
+
+        return samples
+    finally:
+        _profile_lock.release()
+
+
+async def profile(duration: float, interval: float) -> Counter[Stack]:
+    return await asyncio.to_thread(sample, duration, interval)
+
+
+def to_collapsed(samples: Counter[Stack]) -> str:
+    return "\n".join(
+        f"{';'.join(stack)} {count}" for stack, count in samples.most_common()
+    )
+
+
+def to_speedscope(
+    samples: Counter[Stack], interval: float, name: str
+) -> Dict[str, Any]:
+    frames = []
+    frame_index: Dict[str, int] = {}
+    profile_samples = []
+    weights = []
+
+    for stack, count in samples.items():
+        indexes = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                frames.append({"name": frame})
+            indexes.append(frame_index[frame])
+        profile_samples.append(indexes)
+        weights.append(count * interval)
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": profile_samples,
+                "weights": weights,
+            }
+        ],
+        "name": name,
+        "exporter": "backend-avito",
+    }
+
+
+def _profile_to_file(component: str, duration: float, interval: float) -> None:
+    try:
+        samples = sample(duration, interval)
+    except ProfilerBusyError:
+        logger.warning("Profiling of %s is already in progress", component)
+        return
+
+    output_dir = os.getenv("PROFILE_OUTPUT_DIR", tempfile.gettempdir())
+    path = os.path.join(
+        output_dir, f"profile_{component}_{os.getpid()}_{int(time.time())}.json"
+    )
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(to_speedscope(samples, interval, component)))
+
+    logger.info("Profile of %s written to %s", component, path)
+
+
+def install_signal_handler(
+    component: str,
+    duration: Optional[float] = None,
+    interval: Optional[float] = None,
+) -> None:
+    """
+    По SIGUSR1 профилирует процесс duration секунд в отдельном потоке
+    и сохраняет speedscope-файл в PROFILE_OUTPUT_DIR.
+    """
+    duration = duration or float(os.getenv("PROFILE_SIGNAL_SECONDS", 30))
+    interval = interval or float(os.getenv("PROFILE_INTERVAL", 0.005))
+
+    def handler() -> None:
+        logger.info("Received SIGUSR1, profiling %s for %ss", component, duration)
+        threading.Thread(
+            target=_profile_to_file,
+            args=(component, duration, interval),
+            name=f"profiler-{component}",
+            daemon=True,
+        ).start()
+
+    asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, handler)
@@ -0,0 +1,196 @@
+"""
+Разбивка задержки запроса по этапам.
+
+Span("redis.get") измеряет этап и пишет длительность в
+REQUEST_STAGE_DURATION_SECONDS с лейблами endpoint и stage. Endpoint не
+передается через сервисы и репозитории: PrometheusMiddleware кладет его
+в contextvar в начале запроса, а asyncio копирует контекст в дочерние
+задачи и в asyncio.to_thread. Этапы вкладываются друг в друга
+(auth.verify_token включает db.select), длительность у каждого своя.
+
+Если задан OTEL_EXPORTER_OTLP_ENDPOINT и установлены opentelemetry-sdk
+и opentelemetry-exporter-otlp, этапы дополнительно экспортируются
+как OTLP-спаны с корневым спаном на каждый HTTP-запрос.
+
+Переменные окружения:
+- TRACING_ENABLED: писать гистограммы этапов (true по умолчанию)
+- OTEL_EXPORTER_OTLP_ENDPOINT: адрес коллектора, например http://localhost:4318
+- OTEL_SERVICE_NAME: имя сервиса в трейсах
+"""
+
+import inspect
+import logging
+import os
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from functools import wraps
+from typing import Any, Callable, Dict, Tuple, Union
+
+from dotenv import load_dotenv
+
+from app.observability.metrics import (
+    DB_QUERY_DURATION_SECONDS,
+    REQUEST_STAGE_DURATION_SECONDS,
+)
+
+load_dotenv()
+
+logger = logging.getLogger("app")
+
+BACKGROUND_ENDPOINT = "background"
+
+Endpoint = Union[str, Callable[[], str]]
+
+_endpoint: ContextVar[Endpoint] = ContextVar("endpoint", default=BACKGROUND_ENDPOINT)
+
+_enabled = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+# labels() проверяет аргументы и берет блокировку — дороже самого observe()
+_stage_histograms: Dict[Tuple[str, str], Any] = {}
+_tracer = None
+_tracer_provider = None
+
+
+def set_endpoint(endpoint: Endpoint) -> Token:
+    """
+    Задает endpoint для этапов в текущем контексте. Можно передать функцию:
+    middleware передает ее, потому что шаблон роута известен только
+    после роутинга.
+    """
+    return _endpoint.set(endpoint)
+
+
+def reset_endpoint(token: Token) -> None:
+    _endpoint.reset(token)
+
+
+def current_endpoint() -> str:
+    endpoint = _endpoint.get()
+    return endpoint() if callable(endpoint) else endpoint
+
+
+class Span:
+    __slots__ = ("stage", "_start", "_otel_span")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._otel_span = None
+
+    def __enter__(self) -> "Span":
+        if _tracer is not None:
+            self._otel_span = _tracer.start_as_current_span(self.stage)
+            self._otel_span.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration = time.perf_counter() - self._start
+
+        if _enabled:
+            key = (current_endpoint(), self.stage)
+            histogram = _stage_histograms.get(key)
+            if histogram is None:
+                histogram = REQUEST_STAGE_DURATION_SECONDS.labels(*key)
+                _stage_histograms[key] = histogram
+            histogram.observe(duration)
+
+        if self._otel_span is not None:
+            self._otel_span.__exit__(exc_type, exc, tb)
+
+
+def traced(stage: str):
+    """Оборачивает синхронную или асинхронную функцию в Span(stage)."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with Span(stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with Span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def track_db_query(query_type):
+    """
+    Пишет длительность запроса в db_query_duration_seconds и
+    заодно этап db.<query_type>.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start_time = time.time()
+            try:
+                with Span(f"db.{query_type}"):
+                    result = await func(*args, **kwargs)
+                return result
+            finally:
+                duration = time.time() - start_time
+                DB_QUERY_DURATION_SECONDS.labels(query_type=query_type).observe(
+                    duration
+                )
+
+        return async_wrapper
+
+    return decorator
+
+
+def request_span(name: str):
+    """Корневой OTLP-спан запроса; без экспорта ничего не делает."""
+    if _tracer is None:
+        return nullcontext()
+
+    from opentelemetry.trace import SpanKind
+
+    return _tracer.start_as_current_span(name, kind=SpanKind.SERVER)
+
+
+def setup_tracing(service_name: str) -> None:
+    global _tracer, _tracer_provider
+
+    if _tracer is not None or not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return
+
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning(
+            "OTEL_EXPORTER_OTLP_ENDPOINT is set, but opentelemetry-sdk "
+            "or opentelemetry-exporter-otlp is not installed"
+        )
+        return
+
+    resource = Resource.create(
+        {"service.name": os.getenv("OTEL_SERVICE_NAME", service_name)}
+    )
+    _tracer_provider = TracerProvider(resource=resource)
+    _tracer_provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    _tracer = _tracer_provider.get_tracer("app")
+
+    logger.info("OTLP trace export for %s enabled", service_name)
+
+
+def shutdown_tracing() -> None:
+    """Отправляет накопленные спаны и отключает экспорт."""
+    global _tracer, _tracer_provider
+
+    if _tracer_provider is not None:
+        _tracer_provider.shutdown()
+    _tracer = None
+    _tracer_provider = None
@@ -1,12 +1,27 @@
 from dataclasses import dataclass
-from typing import Any, Mapping, Optional, Sequence
+from typing import Any, AsyncIterator, Mapping, Optional, Sequence
 
 from passlib.hash import md5_crypt
 
 from app.clients.postgres import get_pg_connection
 from app.errors import AccountBlockedError, AccountNotFoundError
 from app.models.account import Account
-from app.observability.metrics import track_db_query
+from app.observability.tracing import track_db_query
+from app.repositories.pagination import DB_PAGE_SIZE, iterate_pages
+
+GET_BY_LOGIN_QUERY = """
+    SELECT *
+    FROM accounts
+    WHERE login = $1
+"""
+
+GET_PAGE_QUERY = """
+    SELECT *
+    FROM accounts
+    WHERE id > $1::INTEGER
+    ORDER BY id
+    LIMIT $2
+"""
 
 
 @dataclass(frozen=True)
@@ -39,14 +54,8 @@ class AccountPostgresStorage:
 
     @track_db_query("select")
     async def get_by_login(self, login: str) -> Optional[Mapping[str, Any]]:
-        query = """
-            SELECT *
-            FROM accounts
-            WHERE login = $1
-        """
-
         async with get_pg_connection() as connection:
-            row = await connection.fetchrow(query, login)
+            row = await connection.fetchrow(GET_BY_LOGIN_QUERY, login)
             return dict(row) if row else None
 
     @track_db_query("select")
@@ -90,18 +99,18 @@ class AccountPostgresStorage:
                 return dict(row)
             raise AccountNotFoundError(f"Account with id {id} not found")
 
-    @track_db_query("select_many")
-    async def get_all(self) -> Sequence[Mapping[str, Any]]:
-        query = """
-            SELECT *
-            FROM accounts
-            ORDER BY id
-        """
-
+    @track_db_query("select_page")
+    async def get_page(self, after_id: int, limit: int) -> Sequence[Mapping[str, Any]]:
         async with get_pg_connection() as connection:
-            rows = await connection.fetch(query)
+            rows = await connection.fetch(GET_PAGE_QUERY, after_id, limit)
             return [dict(row) for row in rows]
 
+    def iterate_all(
+        self, page_size: int = DB_PAGE_SIZE
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """Все аккаунты по страницам из page_size строк."""
+        return iterate_pages(self.get_page, page_size)
+
 
 @dataclass(frozen=True)
 class AccountRepository:
@@ -139,5 +148,14 @@ class AccountRepository:
         return Account(**data)
 
     async def get_all(self) -> Sequence[Account]:
-        data_list = await self.storage.get_all()
+        return [account async for account in self.iterate_all()]
+
+    async def get_page(self, after_id: int, limit: int) -> Sequence[Account]:
+        data_list = await self.storage.get_page(after_id, limit)
         return [Account(**data) for data in data_list]
+
+    async def iterate_all(
+        self, page_size: int = DB_PAGE_SIZE
+    ) -> AsyncIterator[Account]:
+        async for data in self.storage.iterate_all(page_size):
+            yield Account(**data)
@@ -1,10 +1,122 @@
 from dataclasses import dataclass
-from typing import Any, Mapping, Sequence
+from typing import Any, AsyncIterator, List, Mapping, Sequence, Tuple
 
 from app.clients.postgres import get_pg_connection
 from app.errors import AdvertisementNotFoundError
 from app.models.advertisement import Advertisement, AdvertisementWithSeller
-from app.observability.metrics import track_db_query
+from app.observability.tracing import track_db_query
+from app.repositories.pagination import DB_PAGE_SIZE, iterate_pages
+from app.repositories.statements import update_statement
+
+
+ADVERTISEMENT_COLUMNS = (
+    "seller_id",
+    "id",
+    "name",
+    "description",
+    "category",
+    "images_qty",
+    "is_closed",
+)
+
+SELECT_QUERY = """
+    SELECT 
+        a.seller_id as seller_id,
+        s.is_verified as is_verified_seller,
+        a.id as item_id,
+        a.name as name,
+        a.description as description,
+        a.category as category,
+        a.images_qty as images_qty,
+        a.is_closed as is_closed
+    FROM advertisements as a
+    JOIN sellers as s ON a.seller_id = s.id 
+        AND a.id = $1::INTEGER
+    LIMIT 1
+"""
+
+SELECT_MANY_BY_IDS_QUERY = """
+    SELECT 
+        a.seller_id as seller_id,
+        s.is_verified as is_verified_seller,
+        a.id as item_id,
+        a.name as name,
+        a.description as description,
+        a.category as category,
+        a.images_qty as images_qty,
+        a.is_closed as is_closed
+    FROM advertisements as a
+    JOIN sellers as s ON a.seller_id = s.id
+    WHERE a.id = ANY($1::INTEGER[])
+    ORDER BY a.id
+"""
+
+SELECT_PAGE_QUERY = """
+    SELECT 
+        a.seller_id as seller_id,
+        s.is_verified as is_verified_seller,
+        a.id as item_id,
+        a.name as name,
+        a.description as description,
+        a.category as category,
+        a.images_qty as images_qty,
+        a.is_closed as is_closed
+    FROM advertisements as a
+    JOIN sellers as s ON a.seller_id = s.id
+    WHERE a.id > $1::INTEGER
+    ORDER BY a.id
+    LIMIT $2
+"""
+
+CREATE_STAGING_QUERY = """
+    CREATE TEMP TABLE advertisements_staging (LIKE advertisements)
+    ON COMMIT DROP
+"""
+
+COPY_UPSERT_QUERY = """
+    INSERT INTO advertisements (
+        seller_id, id, name, description, category, images_qty, is_closed
+    )
+    SELECT seller_id, id, name, description, category, images_qty, is_closed
+    FROM advertisements_staging
+    ON CONFLICT (id) DO UPDATE
+    SET seller_id = EXCLUDED.seller_id,
+        name = EXCLUDED.name,
+        description = EXCLUDED.description,
+        category = EXCLUDED.category,
+        images_qty = EXCLUDED.images_qty
+"""
+
+SELECT_IDS_BY_SELLER_IDS_QUERY = """
+    SELECT id
+    FROM advertisements
+    WHERE seller_id = ANY($1::INTEGER[])
+"""
+
+CLOSE_MANY_QUERY = """
+    WITH closed AS (
+        UPDATE advertisements
+        SET is_closed = TRUE
+        WHERE id = ANY($1::INTEGER[])
+        RETURNING *
+    ), deleted AS (
+        DELETE FROM moderation_results
+        WHERE item_id IN (SELECT id FROM closed)
+        RETURNING id, item_id
+    )
+    SELECT
+        closed.*,
+        COALESCE(
+            (
+                SELECT array_agg(deleted.id)
+                FROM deleted
+                WHERE deleted.item_id = closed.id
+            ),
+            '{}'
+        ) AS moderation_task_ids
+    FROM closed
+    ORDER BY closed.id
+"""
 
 
 @dataclass(frozen=True)
@@ -58,24 +170,8 @@ class AdvertisementPostgresStorage:
 
     @track_db_query("select")
     async def select(self, id: int) -> Mapping[str, Any]:
-        query = """
-            SELECT 
-                a.seller_id as seller_id,
-                s.is_verified as is_verified_seller,
-                a.id as item_id,
-                a.name as name,
-                a.description as description,
-                a.category as category,
-                a.images_qty as images_qty,
-                a.is_closed as is_closed
-            FROM advertisements as a
-            JOIN sellers as s ON a.seller_id = s.id 
-                AND a.id = $1::INTEGER
-            LIMIT 1
-        """
-
         async with get_pg_connection() as connection:
-            row = await connection.fetchrow(query, id)
+            row = await connection.fetchrow(SELECT_QUERY, id)
 
             if row:
                 return dict(row)
@@ -83,41 +179,61 @@ class AdvertisementPostgresStorage:
             raise AdvertisementNotFoundError()
 
     @track_db_query("select_many")
-    async def select_many(self) -> Sequence[Mapping[str, Any]]:
-        query = """
-            SELECT 
-                a.seller_id as seller_id,
-                s.is_verified as is_verified_seller,
-                a.id as item_id,
-                a.name as name,
-                a.description as description,
-                a.category as category,
-                a.images_qty as images_qty,
-                a.is_closed as is_closed
-            FROM advertisements as a
-            JOIN sellers as s ON a.seller_id = s.id
+    async def select_many_by_ids(
+        self, ids: Sequence[int]
+    ) -> Sequence[Mapping[str, Any]]:
+        async with get_pg_connection() as connection:
+            rows = await connection.fetch(SELECT_MANY_BY_IDS_QUERY, list(ids))
+            return [dict(row) for row in rows]
+
+    @track_db_query("copy")
+    async def copy_upsert(self, records: Sequence[Tuple[Any, ...]]) -> int:
         """
+        Вставляет или обновляет пачку записей: COPY во временную таблицу
+        и один INSERT ... ON CONFLICT из нее, все в одной транзакции.
+        Id в пачке должны быть уникальными. Возвращает число строк.
 
+        is_closed берется только для новых объявлений: существующие
+        закрываются через close / close_many, которые заодно удаляют
+        задачи модерации, и загрузка их не переоткрывает.
+        """
         async with get_pg_connection() as connection:
-            rows = await connection.fetch(query)
-            return [dict(row) for row in rows]
+            async with connection.transaction():
+                await connection.execute(CREATE_STAGING_QUERY)
+                await connection.copy_records_to_table(
+                    "advertisements_staging",
+                    records=records,
+                    columns=ADVERTISEMENT_COLUMNS,
+                )
+                status = await connection.execute(COPY_UPSERT_QUERY)
 
-    @track_db_query("update")
-    async def update(self, id: int, **updates: Any) -> Mapping[str, Any]:
-        keys, args = [], []
+        return int(status.split()[-1])
+
+    @track_db_query("select_many")
+    async def select_ids_by_seller_ids(self, seller_ids: Sequence[int]) -> List[int]:
+        async with get_pg_connection() as connection:
+            rows = await connection.fetch(
+                SELECT_IDS_BY_SELLER_IDS_QUERY, list(seller_ids)
+            )
+            return [row["id"] for row in rows]
 
-        for key, value in updates.items():
-            keys.append(key)
-            args.append(value)
+    @track_db_query("select_page")
+    async def select_page(
+        self, after_id: int, limit: int
+    ) -> Sequence[Mapping[str, Any]]:
+        async with get_pg_connection() as connection:
+            rows = await connection.fetch(SELECT_PAGE_QUERY, after_id, limit)
+            return [dict(row) for row in rows]
 
-        fields_str = ", ".join([f"{key} = ${i + 2}" for i, key in enumerate(keys)])
+    def iterate_many(
+        self, page_size: int = DB_PAGE_SIZE
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """Все строки таблицы по страницам из page_size строк."""
+        return iterate_pages(self.select_page, page_size, key="item_id")
 
-        query = f"""
-            UPDATE advertisements
-            SET {fields_str}
-            WHERE id = $1::INTEGER
-            RETURNING *
-        """
+    @track_db_query("update")
+    async def update(self, id: int, **updates: Any) -> Mapping[str, Any]:
+        query, args = update_statement("advertisements", updates)
 
         async with get_pg_connection() as connection:
             row = await connection.fetchrow(query, id, *args)
@@ -127,6 +243,19 @@ class AdvertisementPostgresStorage:
 
             raise AdvertisementNotFoundError()
 
+    @track_db_query("update")
+    async def close_many(self, ids: Sequence[int]) -> Sequence[Mapping[str, Any]]:
+        """
+        Закрывает объявления и удаляет их задачи модерации одним
+        запросом, то есть в одной транзакции. В каждой строке есть
+        поле moderation_task_ids с id удаленных задач. Несуществующих
+        объявлений в ответе нет.
+        """
+        async with get_pg_connection() as connection:
+            rows = await connection.fetch(CLOSE_MANY_QUERY, list(ids))
+
+            return [dict(row) for row in rows]
+
 
 @dataclass(frozen=True)
 class AdvertisementRepository:
@@ -163,8 +292,52 @@ class AdvertisementRepository:
         raw_user = await self.ad_postgres_storage.update(item_id, is_closed=True)
         return Advertisement(**raw_user)
 
+    async def close_many(
+        self, item_ids: Sequence[int]
+    ) -> List[Tuple[Advertisement, List[int]]]:
+        """Закрытые объявления вместе с id удаленных задач модерации."""
+        closed = []
+        for raw_user in await self.ad_postgres_storage.close_many(item_ids):
+            task_ids = list(raw_user.pop("moderation_task_ids"))
+            closed.append((Advertisement(**raw_user), task_ids))
+        return closed
+
     async def get_many(self) -> Sequence[AdvertisementWithSeller]:
+        return [ad async for ad in self.iterate_many()]
+
+    async def bulk_upsert(self, ads: Sequence[Advertisement]) -> int:
+        return await self.ad_postgres_storage.copy_upsert(
+            [
+                tuple(getattr(ad, column) for column in ADVERTISEMENT_COLUMNS)
+                for ad in ads
+            ]
+        )
+
+    async def get_many_by_ids(
+        self, item_ids: Sequence[int]
+    ) -> Sequence[AdvertisementWithSeller]:
         return [
             AdvertisementWithSeller(**raw_user)
-            for raw_user in await self.ad_postgres_storage.select_many()
+            for raw_user in await self.ad_postgres_storage.select_many_by_ids(
+                item_ids
+            )
         ]
+
+    async def get_ids_by_seller_ids(self, seller_ids: Sequence[int]) -> List[int]:
+        return await self.ad_postgres_storage.select_ids_by_seller_ids(seller_ids)
+
+    async def get_page(
+        self, after_id: int, limit: int
+    ) -> Sequence[AdvertisementWithSeller]:
+        return [
+            AdvertisementWithSeller(**raw_user)
+            for raw_user in await self.ad_postgres_storage.select_page(
+                after_id, limit
+            )
+        ]
+
+    async def iterate_many(
+        self, page_size: int = DB_PAGE_SIZE
+    ) -> AsyncIterator[AdvertisementWithSeller]:
+        async for raw_user in self.ad_postgres_storage.iterate_many(page_size):
+            yield AdvertisementWithSeller(**raw_user)
@@ -1,32 +1,70 @@
 import logging
-import sys
+import os
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Hashable, Mapping, Optional, Sequence, Tuple
 
-from app.clients.redis import redis_client
+from dotenv import load_dotenv
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
+from app.clients.redis import redis_client
+from app.models.moderation import ModerationResult
+from app.observability.metrics import (
+    CACHE_HIT_TTL_REMAINING_SECONDS,
+    CACHE_REQUESTS_TOTAL,
 )
+from app.observability.tracing import traced
+
+load_dotenv()
+
+logger = logging.getLogger("app.cache")
+
+CACHE_NAME = "predict"
+
+MODERATION_RESULT_CACHE_NAME = "moderation_result"
+MODERATION_RESULT_LOCAL_CACHE_NAME = "moderation_result_local"
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
 
-logger = logging.getLogger("app")
+
+def is_valid_prediction(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and "is_violation" in value
+        and "probability" in value
+    )
 
 
 @dataclass(frozen=True)
 class PredictionCacheStorage:
+    @traced("redis.get")
     async def get_prediction(self, item_id: int) -> Optional[Dict[str, Any]]:
-        key = redis_client.make_key("predict", item_id)
-        cached = await redis_client.get(key)
+        """
+        Результаты поиска в кэше считаются в CACHE_REQUESTS_TOTAL:
+        - hit: найден предикт;
+        - miss: ключа нет;
+        - stale: значение в неизвестном формате (например, записано прежней
+          версией сервиса), считается промахом и будет перезаписано.
+        """
+        key = redis_client.make_key(CACHE_NAME, item_id)
+        cached, ttl = await redis_client.get_with_ttl(key)
+
+        if cached is None:
+            CACHE_REQUESTS_TOTAL.labels(cache=CACHE_NAME, result="miss").inc()
+            logger.info("Cache miss for item_id=%s", item_id)
+            return None
 
-        if cached:
-            logger.info(f"Cache hit for item_id={item_id}")
-            return cached
+        if not is_valid_prediction(cached):
+            CACHE_REQUESTS_TOTAL.labels(cache=CACHE_NAME, result="stale").inc()
+            logger.info("Stale cache entry for item_id=%s", item_id)
+            return None
 
-        logger.info(f"Cache miss for item_id={item_id}")
-        return None
+        CACHE_REQUESTS_TOTAL.labels(cache=CACHE_NAME, result="hit").inc()
+        if ttl >= 0:
+            CACHE_HIT_TTL_REMAINING_SECONDS.labels(cache=CACHE_NAME).observe(ttl)
+        logger.info("Cache hit for item_id=%s", item_id)
+        return cached
 
+    @traced("redis.set")
     async def set_prediction(self, item_id: int, prediction: Dict[str, Any]) -> None:
         """
         Комментарий о выборе TTL:
@@ -37,19 +75,166 @@ class PredictionCacheStorage:
         - Для объявлений с высоким приоритетом можно задать меньший TTL
         - Кэшируем результаты для снижения нагрузки на БД и модель
         """
-        key = redis_client.make_key("predict", item_id)
+        key = redis_client.make_key(CACHE_NAME, item_id)
         await redis_client.set(key, prediction)
-        logger.info(f"Cached prediction for item_id={item_id}")
+        logger.info("Cached prediction for item_id=%s", item_id)
+
+    @traced("redis.set")
+    async def set_predictions(self, predictions: Mapping[int, Dict[str, Any]]) -> None:
+        await redis_client.set_many(
+            {
+                redis_client.make_key(CACHE_NAME, item_id): prediction
+                for item_id, prediction in predictions.items()
+            }
+        )
+        logger.info("Cached predictions for %s items", len(predictions))
 
+    @traced("redis.delete")
     async def delete_prediction(self, item_id: int) -> None:
-        key = redis_client.make_key("predict", item_id)
+        key = redis_client.make_key(CACHE_NAME, item_id)
+        await redis_client.delete(key)
+        logger.info("Deleted cache for item_id=%s", item_id)
+
+    @traced("redis.delete")
+    async def delete_predictions(self, item_ids: Sequence[int]) -> None:
+        keys = [redis_client.make_key(CACHE_NAME, item_id) for item_id in item_ids]
+        await redis_client.delete_many(keys)
+        logger.info("Deleted cache for %s items", len(keys))
+
+
+class LocalTTLCache:
+    """
+    Кэш в памяти процесса: не больше maxsize записей, каждая живет
+    ttl секунд. При переполнении вытесняется самая старая запись.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._items[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._items[key] = (time.monotonic() + self.ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._items.pop(key, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+moderation_result_local_cache = LocalTTLCache(
+    maxsize=int(os.getenv("MODERATION_RESULT_LOCAL_CACHE_SIZE", 10000)),
+    ttl=float(os.getenv("MODERATION_RESULT_LOCAL_CACHE_TTL", 60)),
+)
+
+
+@dataclass(frozen=True)
+class ModerationResultCacheStorage:
+    """
+    Результаты завершенных задач модерации (completed и failed) больше
+    не меняются, поэтому кэшируются в два уровня: в памяти процесса
+    и в Redis. Задачи в статусе pending не кэшируются — их статус
+    меняет воркер.
+
+    Задача может быть удалена при закрытии объявления. Redis-запись
+    удаляется вместе с ней, а локальные копии в других процессах
+    доживают до конца короткого MODERATION_RESULT_LOCAL_CACHE_TTL.
+    """
+
+    local_cache: LocalTTLCache = moderation_result_local_cache
+
+    @traced("redis.get")
+    async def get_moderation_result(self, task_id: int) -> Optional[ModerationResult]:
+        result = self.local_cache.get(task_id)
+        if result is not None:
+            CACHE_REQUESTS_TOTAL.labels(
+                cache=MODERATION_RESULT_LOCAL_CACHE_NAME, result="hit"
+            ).inc()
+            return result
+        CACHE_REQUESTS_TOTAL.labels(
+            cache=MODERATION_RESULT_LOCAL_CACHE_NAME, result="miss"
+        ).inc()
+
+        key = redis_client.make_key(MODERATION_RESULT_CACHE_NAME, task_id)
+        cached = await redis_client.get(key)
+
+        if cached is None:
+            CACHE_REQUESTS_TOTAL.labels(
+                cache=MODERATION_RESULT_CACHE_NAME, result="miss"
+            ).inc()
+            return None
+
+        if (
+            not isinstance(cached, dict)
+            or cached.get("status") not in TERMINAL_STATUSES
+        ):
+            CACHE_REQUESTS_TOTAL.labels(
+                cache=MODERATION_RESULT_CACHE_NAME, result="stale"
+            ).inc()
+            logger.info("Stale moderation result cache entry for task_id=%s", task_id)
+            return None
+
+        CACHE_REQUESTS_TOTAL.labels(
+            cache=MODERATION_RESULT_CACHE_NAME, result="hit"
+        ).inc()
+        result = ModerationResult(**cached)
+        self.local_cache.set(task_id, result)
+        return result
+
+    @traced("redis.set")
+    async def set_moderation_result(self, result: ModerationResult) -> None:
+        if result.status not in TERMINAL_STATUSES:
+            return
+
+        self.local_cache.set(result.task_id, result)
+        key = redis_client.make_key(MODERATION_RESULT_CACHE_NAME, result.task_id)
+        await redis_client.set(
+            key,
+            result.model_dump(),
+            ttl=int(os.getenv("MODERATION_RESULT_CACHE_TTL", 86400)),
+        )
+        logger.info("Cached moderation result for task_id=%s", result.task_id)
+
+    @traced("redis.delete")
+    async def delete_moderation_result(self, task_id: int) -> None:
+        self.local_cache.delete(task_id)
+        key = redis_client.make_key(MODERATION_RESULT_CACHE_NAME, task_id)
         await redis_client.delete(key)
-        logger.info(f"Deleted cache for item_id={item_id}")
+        logger.info("Deleted moderation result cache for task_id=%s", task_id)
+
+    @traced("redis.delete")
+    async def delete_moderation_results(self, task_ids: Sequence[int]) -> None:
+        for task_id in task_ids:
+            self.local_cache.delete(task_id)
+        keys = [
+            redis_client.make_key(MODERATION_RESULT_CACHE_NAME, task_id)
+            for task_id in task_ids
+        ]
+        await redis_client.delete_many(keys)
+        logger.info("Deleted moderation result cache for %s tasks", len(keys))
 
 
 @dataclass(frozen=True)
 class CacheRepository:
     cache_storage: PredictionCacheStorage = PredictionCacheStorage()
+    moderation_result_storage: ModerationResultCacheStorage = (
+        ModerationResultCacheStorage()
+    )
 
     async def get_prediction(self, item_id: int) -> Optional[Dict[str, Any]]:
         return await self.cache_storage.get_prediction(item_id)
@@ -57,5 +242,23 @@ class CacheRepository:
     async def set_prediction(self, item_id: int, prediction: Dict[str, Any]) -> None:
         await self.cache_storage.set_prediction(item_id, prediction)
 
+    async def set_predictions(self, predictions: Mapping[int, Dict[str, Any]]) -> None:
+        await self.cache_storage.set_predictions(predictions)
+
     async def delete_prediction(self, item_id: int) -> None:
         await self.cache_storage.delete_prediction(item_id)
+
+    async def delete_predictions(self, item_ids: Sequence[int]) -> None:
+        await self.cache_storage.delete_predictions(item_ids)
+
+    async def get_moderation_result(self, task_id: int) -> Optional[ModerationResult]:
+        return await self.moderation_result_storage.get_moderation_result(task_id)
+
+    async def set_moderation_result(self, result: ModerationResult) -> None:
+        await self.moderation_result_storage.set_moderation_result(result)
+
+    async def delete_moderation_result(self, task_id: int) -> None:
+        await self.moderation_result_storage.delete_moderation_result(task_id)
+
+    async def delete_moderation_results(self, task_ids: Sequence[int]) -> None:
+        await self.moderation_result_storage.delete_moderation_results(task_ids)
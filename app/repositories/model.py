@@ -1,5 +1,5 @@
 import pickle
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 from sklearn.linear_model import LogisticRegression
@@ -50,6 +50,11 @@ class ModelSingleton:
             return None
 
     def initialize_model(self) -> LogisticRegression:
+        # Модель могла быть загружена в мастер-процессе до форка воркеров,
+        # повторная загрузка лишит воркеров общей copy-on-write памяти.
+        if self._model is not None:
+            return self._model
+
         model = self.load_model()
         if model is None:
             model = self.train_model()
@@ -69,6 +74,18 @@ class ModelSingleton:
         except (AttributeError, TypeError) as e:
             raise ModelIsNotAvailable("Model is not available in ModelSingleton.")
 
+    def predict_batch(self, features: np.ndarray) -> List[Tuple[bool, float]]:
+        """predict для матрицы признаков: один вызов модели на все строки."""
+        try:
+            probas = self._model.predict_proba(features)[:, 1]
+            predictions = self._model.predict(features)
+            return [
+                (bool(prediction), float(proba))
+                for prediction, proba in zip(predictions, probas)
+            ]
+        except (AttributeError, TypeError) as e:
+            raise ModelIsNotAvailable("Model is not available in ModelSingleton.")
+
 
 model_client = ModelSingleton()
 
@@ -1,11 +1,93 @@
 import datetime
 from dataclasses import dataclass
-from typing import Any, Mapping, Sequence
+from typing import Any, AsyncIterator, List, Mapping, Optional, Sequence, Tuple
 
 from app.clients.postgres import get_pg_connection
 from app.errors import ModerationTaskNotFoundError
 from app.models.moderation import Moderation
-from app.observability.metrics import track_db_query
+from app.observability.tracing import track_db_query
+from app.repositories.pagination import DB_PAGE_SIZE, iterate_pages
+from app.repositories.statements import update_statement
+
+PENDING_CONDITION = " AND status = 'pending'"
+
+SELECT_QUERY = """
+    SELECT *
+    FROM moderation_results
+    WHERE id = $1::INTEGER
+    LIMIT 1
+"""
+
+GET_OR_CREATE_PENDING_QUERY = """
+    WITH existing AS (
+        SELECT *
+        FROM moderation_results
+        WHERE item_id = $1 AND status = 'pending'
+        LIMIT 1
+    ), task AS (
+        INSERT INTO moderation_results (item_id, status, created_at)
+        SELECT $1, 'pending', $2
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+        ON CONFLICT (item_id) WHERE status = 'pending' DO NOTHING
+        RETURNING *
+    ), event AS (
+        INSERT INTO outbox (topic, key, payload)
+        SELECT
+            $3,
+            item_id::TEXT,
+            jsonb_build_object(
+                'task_id', id,
+                'item_id', item_id,
+                'timestamp', created_at
+            )
+        FROM task
+    )
+    SELECT *, TRUE AS created
+    FROM task
+    UNION ALL
+    SELECT *, FALSE AS created
+    FROM existing
+"""
+
+GET_OR_CREATE_COMPLETED_QUERY = """
+    WITH existing AS (
+        SELECT *
+        FROM moderation_results
+        WHERE item_id = $1
+          AND status = 'completed'
+          AND is_violation = $2
+          AND probability = $3
+        ORDER BY id DESC
+        LIMIT 1
+    ), task AS (
+        INSERT INTO moderation_results (
+            item_id, status, is_violation, probability, created_at,
+            processed_at
+        )
+        SELECT $1, 'completed', $2, $3, $4, $4
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+        RETURNING *
+    )
+    SELECT *, TRUE AS created
+    FROM task
+    UNION ALL
+    SELECT *, FALSE AS created
+    FROM existing
+"""
+
+DELETE_BY_ITEM_ID_QUERY = """
+    DELETE FROM moderation_results
+    WHERE item_id = $1::INTEGER
+    RETURNING id
+"""
+
+SELECT_PAGE_QUERY = """
+    SELECT *
+    FROM moderation_results
+    WHERE id > $1::INTEGER
+    ORDER BY id
+    LIMIT $2
+"""
 
 
 @dataclass(frozen=True)
@@ -23,6 +105,61 @@ class ModerationPostgresStorage:
         async with get_pg_connection() as connection:
             return dict(await connection.fetchrow(query, item_id, status, created_at))
 
+    @track_db_query("insert")
+    async def get_or_create_completed(
+        self,
+        item_id: int,
+        created_at: datetime.datetime,
+        is_violation: bool,
+        probability: float,
+    ) -> Mapping[str, Any]:
+        """
+        Возвращает последнюю завершенную задачу объявления с тем же
+        результатом, а если ее нет, создает завершенную задачу. Повторные
+        запросы по объявлению с предиктом в кэше не добавляют строк.
+
+        В строке есть поле created: True, если задача создана сейчас.
+        """
+        async with get_pg_connection() as connection:
+            return dict(
+                await connection.fetchrow(
+                    GET_OR_CREATE_COMPLETED_QUERY,
+                    item_id,
+                    is_violation,
+                    probability,
+                    created_at,
+                )
+            )
+
+    @track_db_query("insert")
+    async def get_or_create_pending(
+        self, item_id: int, created_at: datetime.datetime, topic: str
+    ) -> Mapping[str, Any]:
+        """
+        Возвращает задачу объявления в статусе pending, а если ее нет,
+        создает задачу и событие для Kafka в таблице outbox. Все одним
+        запросом, то есть в одной транзакции: задача не может остаться
+        без события, а событие без задачи. Событие публикует OutboxRelay.
+
+        В строке есть поле created: True, если задача создана сейчас.
+
+        Уникальный частичный индекс по pending-задачам не дает двум
+        параллельным запросам создать две задачи. Проигравший запрос
+        не видит чужую задачу в своем снимке и получает пустой ответ,
+        тогда запрос повторяется и находит уже закоммиченную задачу.
+        """
+        async with get_pg_connection() as connection:
+            for _ in range(3):
+                row = await connection.fetchrow(
+                    GET_OR_CREATE_PENDING_QUERY, item_id, created_at, topic
+                )
+                if row:
+                    return dict(row)
+
+        raise ModerationTaskNotFoundError(
+            f"Failed to create or find a pending task for item {item_id}"
+        )
+
     @track_db_query("delete")
     async def delete(self, id: int) -> Mapping[str, Any]:
         query = """
@@ -39,51 +176,42 @@ class ModerationPostgresStorage:
 
             raise ModerationTaskNotFoundError()
 
+    @track_db_query("delete")
+    async def delete_by_item_id(self, item_id: int) -> Sequence[int]:
+        """Удаляет все задачи объявления, возвращает их id."""
+        async with get_pg_connection() as connection:
+            rows = await connection.fetch(DELETE_BY_ITEM_ID_QUERY, item_id)
+
+            return [row["id"] for row in rows]
+
     @track_db_query("select")
     async def select(self, id: int) -> Mapping[str, Any]:
-        query = """
-            SELECT *
-            FROM moderation_results
-            WHERE id = $1::INTEGER
-            LIMIT 1
-        """
-
         async with get_pg_connection() as connection:
-            row = await connection.fetchrow(query, id)
+            row = await connection.fetchrow(SELECT_QUERY, id)
 
             if row:
                 return dict(row)
 
             raise ModerationTaskNotFoundError()
 
-    @track_db_query("select_many")
-    async def select_many(self) -> Sequence[Mapping[str, Any]]:
-        query = """
-            SELECT *
-            FROM moderation_results
-        """
-
+    @track_db_query("select_page")
+    async def select_page(
+        self, after_id: int, limit: int
+    ) -> Sequence[Mapping[str, Any]]:
         async with get_pg_connection() as connection:
-            rows = await connection.fetch(query)
+            rows = await connection.fetch(SELECT_PAGE_QUERY, after_id, limit)
 
             return [dict(row) for row in rows]
 
+    def iterate_many(
+        self, page_size: int = DB_PAGE_SIZE
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """Все строки таблицы по страницам из page_size строк."""
+        return iterate_pages(self.select_page, page_size)
+
     @track_db_query("update")
     async def update(self, id: int, **updates: Any) -> Mapping[str, Any]:
-        keys, args = [], []
-
-        for key, value in updates.items():
-            keys.append(key)
-            args.append(value)
-
-        fields_str = ", ".join([f"{key} = ${i + 2}" for i, key in enumerate(keys)])
-
-        query = f"""
-            UPDATE moderation_results
-            SET {fields_str}
-            WHERE id = $1::INTEGER
-            RETURNING *
-        """
+        query, args = update_statement("moderation_results", updates)
 
         async with get_pg_connection() as connection:
             row = await connection.fetchrow(query, id, *args)
@@ -93,6 +221,24 @@ class ModerationPostgresStorage:
 
             raise ModerationTaskNotFoundError()
 
+    @track_db_query("update")
+    async def update_if_pending(
+        self, id: int, **updates: Any
+    ) -> Optional[Mapping[str, Any]]:
+        """
+        Обновляет задачу, только пока она в статусе pending. Повторно
+        доставленное событие не перезапишет уже завершенную задачу:
+        вернется None.
+        """
+        query, args = update_statement(
+            "moderation_results", updates, condition=PENDING_CONDITION
+        )
+
+        async with get_pg_connection() as connection:
+            row = await connection.fetchrow(query, id, *args)
+
+            return dict(row) if row else None
+
 
 @dataclass(frozen=True)
 class ModerationRepository:
@@ -106,6 +252,32 @@ class ModerationRepository:
         )
         return Moderation(**raw_user)
 
+    async def get_or_create_completed(
+        self,
+        item_id: int,
+        created_at: datetime.datetime,
+        is_violation: bool,
+        probability: float,
+    ) -> Tuple[Moderation, bool]:
+        raw_user = dict(
+            await self.moderation_postgres_storage.get_or_create_completed(
+                item_id, created_at, is_violation, probability
+            )
+        )
+        created = raw_user.pop("created")
+        return Moderation(**raw_user), created
+
+    async def get_or_create_pending(
+        self, item_id: int, created_at: datetime.datetime, topic: str
+    ) -> Tuple[Moderation, bool]:
+        raw_user = dict(
+            await self.moderation_postgres_storage.get_or_create_pending(
+                item_id, created_at, topic
+            )
+        )
+        created = raw_user.pop("created")
+        return Moderation(**raw_user), created
+
     async def get(self, id: int) -> Moderation:
         raw_user = await self.moderation_postgres_storage.select(id)
         return Moderation(**raw_user)
@@ -114,12 +286,36 @@ class ModerationRepository:
         raw_user = await self.moderation_postgres_storage.delete(id)
         return Moderation(**raw_user)
 
+    async def delete_by_item_id(self, item_id: int) -> List[int]:
+        return list(await self.moderation_postgres_storage.delete_by_item_id(item_id))
+
     async def update(self, id: int, **changes: Mapping[str, Any]) -> Moderation:
         raw_user = await self.moderation_postgres_storage.update(id, **changes)
         return Moderation(**raw_user)
 
+    async def update_if_pending(
+        self, id: int, **changes: Mapping[str, Any]
+    ) -> Optional[Moderation]:
+        raw_user = await self.moderation_postgres_storage.update_if_pending(
+            id, **changes
+        )
+        return Moderation(**raw_user) if raw_user else None
+
     async def get_many(self) -> Sequence[Moderation]:
+        return [task async for task in self.iterate_many()]
+
+    async def get_page(self, after_id: int, limit: int) -> Sequence[Moderation]:
         return [
             Moderation(**raw_user)
-            for raw_user in await self.moderation_postgres_storage.select_many()
+            for raw_user in await self.moderation_postgres_storage.select_page(
+                after_id, limit
+            )
         ]
+
+    async def iterate_many(
+        self, page_size: int = DB_PAGE_SIZE
+    ) -> AsyncIterator[Moderation]:
+        async for raw_user in self.moderation_postgres_storage.iterate_many(
+            page_size
+        ):
+            yield Moderation(**raw_user)
@@ -0,0 +1,64 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.clients.postgres import get_pg_connection
+
+OutboxEvent = Dict[str, Any]
+Publisher = Callable[[List[OutboxEvent]], Awaitable[None]]
+
+SELECT_BATCH_QUERY = """
+    SELECT id, topic, key, payload
+    FROM outbox
+    ORDER BY id
+    LIMIT $1
+    FOR UPDATE SKIP LOCKED
+"""
+
+DELETE_BATCH_QUERY = """
+    DELETE FROM outbox
+    WHERE id = ANY($1::BIGINT[])
+"""
+
+
+@dataclass(frozen=True)
+class OutboxPostgresStorage:
+    async def publish_batch(self, limit: int, publish: Publisher) -> int:
+        """
+        Забирает до limit самых старых событий, передает их в publish
+        и удаляет после успешной публикации. Все в одной транзакции:
+        если publish упал, события остаются в outbox и уйдут в следующий раз.
+
+        FOR UPDATE SKIP LOCKED позволяет нескольким релеям (по одному
+        в каждом процессе API) разбирать outbox параллельно, не публикуя
+        одно событие дважды.
+        """
+        async with get_pg_connection() as connection:
+            async with connection.transaction():
+                rows = await connection.fetch(SELECT_BATCH_QUERY, limit)
+                if not rows:
+                    return 0
+
+                await publish(
+                    [
+                        {
+                            "topic": row["topic"],
+                            "key": row["key"],
+                            "payload": json.loads(row["payload"]),
+                        }
+                        for row in rows
+                    ]
+                )
+                await connection.execute(
+                    DELETE_BATCH_QUERY, [row["id"] for row in rows]
+                )
+
+        return len(rows)
+
+
+@dataclass(frozen=True)
+class OutboxRepository:
+    outbox_storage: OutboxPostgresStorage = OutboxPostgresStorage()
+
+    async def publish_batch(self, limit: int, publish: Publisher) -> int:
+        return await self.outbox_storage.publish_batch(limit, publish)
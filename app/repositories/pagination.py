@@ -0,0 +1,38 @@
+"""
+Постраничное чтение таблиц по ключу (keyset pagination).
+
+Страница — запрос вида WHERE id > $after ORDER BY id LIMIT $limit,
+он идет по первичному ключу и стоит одинаково для любой страницы,
+в отличие от OFFSET. Каждая страница читается на своем коротком
+соединении, так что обход большой таблицы не держит соединение
+и транзакцию открытыми, как серверный курсор, а в памяти лежит
+только одна страница.
+"""
+
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping, Sequence
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DB_PAGE_SIZE = int(os.getenv("DB_PAGE_SIZE", 1000))
+
+# id во всех таблицах неотрицательные, поэтому первая страница — после -1
+FIRST_PAGE_AFTER = -1
+
+FetchPage = Callable[[int, int], Awaitable[Sequence[Mapping[str, Any]]]]
+
+
+async def iterate_pages(
+    fetch_page: FetchPage, page_size: int, key: str = "id"
+) -> AsyncIterator[Mapping[str, Any]]:
+    after = FIRST_PAGE_AFTER
+    while True:
+        rows = await fetch_page(after, page_size)
+        for row in rows:
+            yield row
+
+        if len(rows) < page_size:
+            return
+        after = rows[-1][key]
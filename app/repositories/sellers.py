@@ -1,10 +1,36 @@
 from dataclasses import dataclass
-from typing import Any, Mapping, Sequence
+from typing import Any, AsyncIterator, Mapping, Sequence, Tuple
 
 from app.clients.postgres import get_pg_connection
 from app.errors import SellerNotFoundError
 from app.models.seller import Seller
-from app.observability.metrics import track_db_query
+from app.observability.tracing import track_db_query
+from app.repositories.pagination import DB_PAGE_SIZE, iterate_pages
+from app.repositories.statements import update_statement
+
+
+SELLER_COLUMNS = ("id", "is_verified")
+
+SELECT_PAGE_QUERY = """
+    SELECT *
+    FROM sellers
+    WHERE id > $1::INTEGER
+    ORDER BY id
+    LIMIT $2
+"""
+
+CREATE_STAGING_QUERY = """
+    CREATE TEMP TABLE sellers_staging (LIKE sellers)
+    ON COMMIT DROP
+"""
+
+COPY_UPSERT_QUERY = """
+    INSERT INTO sellers (id, is_verified)
+    SELECT id, is_verified
+    FROM sellers_staging
+    ON CONFLICT (id) DO UPDATE
+    SET is_verified = EXCLUDED.is_verified
+"""
 
 
 @dataclass(frozen=True)
@@ -53,34 +79,41 @@ class SellerPostgresStorage:
 
             raise SellerNotFoundError()
 
-    @track_db_query("select_many")
-    async def select_many(self) -> Sequence[Mapping[str, Any]]:
-        query = """
-            SELECT *
-            FROM sellers
-        """
-
+    @track_db_query("select_page")
+    async def select_page(
+        self, after_id: int, limit: int
+    ) -> Sequence[Mapping[str, Any]]:
         async with get_pg_connection() as connection:
-            rows = await connection.fetch(query)
+            rows = await connection.fetch(SELECT_PAGE_QUERY, after_id, limit)
 
             return [dict(row) for row in rows]
 
-    @track_db_query("update")
-    async def update(self, id: int, **updates: Any) -> Mapping[str, Any]:
-        keys, args = [], []
+    def iterate_many(
+        self, page_size: int = DB_PAGE_SIZE
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """Все строки таблицы по страницам из page_size строк."""
+        return iterate_pages(self.select_page, page_size)
 
-        for key, value in updates.items():
-            keys.append(key)
-            args.append(value)
+    @track_db_query("copy")
+    async def copy_upsert(self, records: Sequence[Tuple[int, bool]]) -> int:
+        """
+        Вставляет или обновляет пачку записей: COPY во временную таблицу
+        и один INSERT ... ON CONFLICT из нее, все в одной транзакции.
+        Id в пачке должны быть уникальными. Возвращает число строк.
+        """
+        async with get_pg_connection() as connection:
+            async with connection.transaction():
+                await connection.execute(CREATE_STAGING_QUERY)
+                await connection.copy_records_to_table(
+                    "sellers_staging", records=records, columns=SELLER_COLUMNS
+                )
+                status = await connection.execute(COPY_UPSERT_QUERY)
 
-        fields_str = ", ".join([f"{key} = ${i + 2}" for i, key in enumerate(keys)])
+        return int(status.split()[-1])
 
-        query = f"""
-            UPDATE sellers
-            SET {fields_str}
-            WHERE id = $1::INTEGER
-            RETURNING *
-        """
+    @track_db_query("update")
+    async def update(self, id: int, **updates: Any) -> Mapping[str, Any]:
+        query, args = update_statement("sellers", updates)
 
         async with get_pg_connection() as connection:
             row = await connection.fetchrow(query, id, *args)
@@ -112,7 +145,23 @@ class SellerRepository:
         return Seller(**raw_user)
 
     async def get_many(self) -> Sequence[Seller]:
+        return [seller async for seller in self.iterate_many()]
+
+    async def bulk_upsert(self, sellers: Sequence[Seller]) -> int:
+        return await self.seller_postgres_storage.copy_upsert(
+            [(seller.id, seller.is_verified) for seller in sellers]
+        )
+
+    async def get_page(self, after_id: int, limit: int) -> Sequence[Seller]:
         return [
             Seller(**raw_user)
-            for raw_user in await self.seller_postgres_storage.select_many()
+            for raw_user in await self.seller_postgres_storage.select_page(
+                after_id, limit
+            )
         ]
+
+    async def iterate_many(
+        self, page_size: int = DB_PAGE_SIZE
+    ) -> AsyncIterator[Seller]:
+        async for raw_user in self.seller_postgres_storage.iterate_many(page_size):
+            yield Seller(**raw_user)
@@ -0,0 +1,58 @@
+"""
+Запросы UPDATE для хранилищ.
+
+Текст запроса строится один раз на набор полей и дальше берется из
+кэша. Поля сортируются, поэтому одному набору полей всегда
+соответствует один и тот же текст: asyncpg кэширует подготовленные
+запросы на соединении по тексту (statement_cache_size), и стабильный
+текст — условие, чтобы этот кэш попадал. Имена колонок не
+подставляются как есть, а сверяются с белым списком таблицы.
+"""
+
+from functools import lru_cache
+from typing import Any, List, Mapping, Tuple
+
+from app.errors import InvalidUpdateFieldError
+
+UPDATABLE_COLUMNS = {
+    "advertisements": frozenset(
+        {"seller_id", "name", "description", "category", "images_qty", "is_closed"}
+    ),
+    "sellers": frozenset({"is_verified"}),
+    "moderation_results": frozenset(
+        {"status", "is_violation", "probability", "error_message", "processed_at"}
+    ),
+}
+
+
+@lru_cache(maxsize=256)
+def _build_update(table: str, columns: Tuple[str, ...], condition: str) -> str:
+    unknown = set(columns) - UPDATABLE_COLUMNS[table]
+    if unknown:
+        raise InvalidUpdateFieldError(
+            f"Fields {sorted(unknown)} can not be updated in {table}"
+        )
+
+    fields_str = ", ".join(f"{column} = ${i + 2}" for i, column in enumerate(columns))
+    return f"""
+            UPDATE {table}
+            SET {fields_str}
+            WHERE id = $1::INTEGER{condition}
+            RETURNING *
+        """
+
+
+def update_statement(
+    table: str, updates: Mapping[str, Any], condition: str = ""
+) -> Tuple[str, List[Any]]:
+    """
+    Запрос UPDATE ... WHERE id = $1 и значения полей для $2, $3, ...
+    condition — дополнительное условие из кода хранилища,
+    например " AND status = 'pending'".
+    """
+    if not updates:
+        raise InvalidUpdateFieldError(f"No fields to update in {table}")
+
+    columns = tuple(sorted(updates))
+    query = _build_update(table, columns, condition)
+    return query, [updates[column] for column in columns]
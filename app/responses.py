@@ -0,0 +1,11 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON-ответ, сериализуемый через orjson вместо стандартного json."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
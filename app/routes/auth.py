@@ -1,5 +1,4 @@
 import logging
-import sys
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
@@ -8,12 +7,6 @@ from app.errors import AccountBlockedError, InvalidCredentialsError
 from app.models.account import TokenResponse
 from app.services.auth_service import AuthService, get_auth_service
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
-)
-
 logger = logging.getLogger("app")
 router = APIRouter()
 
@@ -40,7 +33,7 @@ async def login(
             secure=False,
         )
 
-        logger.info(f"User {account.login} logged in successfully")
+        logger.info("User %s logged in successfully", account.login)
 
         return TokenResponse(access_token=token)
 
@@ -1,19 +1,17 @@
 import logging
-import sys
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.dependencies.auth import get_current_active_account
 from app.errors import AdvertisementNotFoundError
 from app.models.account import Account
-from app.models.advertisement import Advertisement, AdvertisementID
-from app.services.close_service import CloseService, get_close_service
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
+from app.models.advertisement import (
+    Advertisement,
+    AdvertisementID,
+    AdvertisementIDs,
+    ClosedAdvertisements,
 )
+from app.services.close_service import CloseService, get_close_service
 
 logger = logging.getLogger("app")
 router = APIRouter(dependencies=[Depends(get_current_active_account)])
@@ -26,7 +24,9 @@ async def close_advertisement_endpoint(
     current_account: Account = Depends(get_current_active_account),
 ):
     logger.info(
-        f"User {current_account.login} requested to close advertisement {request.id}"
+        "User %s requested to close advertisement %s",
+        current_account.login,
+        request.id,
     )
     try:
         closed_ad = await close_service.close_advertisement(request.id)
@@ -37,8 +37,29 @@ async def close_advertisement_endpoint(
             detail=f"Advertisement with id {request.id} not found",
         )
     except Exception as e:
-        logger.error(f"Error closing advertisement {request.id}: {str(e)}")
+        logger.error("Error closing advertisement %s: %s", request.id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error closing advertisement",
         )
+
+
+@router.post("/close_many", response_model=ClosedAdvertisements)
+async def close_advertisements_endpoint(
+    request: AdvertisementIDs,
+    close_service: CloseService = Depends(get_close_service),
+    current_account: Account = Depends(get_current_active_account),
+):
+    logger.info(
+        "User %s requested to close %s advertisements",
+        current_account.login,
+        len(request.ids),
+    )
+    try:
+        return await close_service.close_advertisements(request.ids)
+    except Exception as e:
+        logger.error("Error closing advertisements %s: %s", request.ids, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error closing advertisements",
+        )
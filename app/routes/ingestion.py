@@ -0,0 +1,64 @@
+import logging
+import os
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+
+from app.dependencies.auth import get_current_admin_account
+from app.errors import InvalidIngestionRecordError
+from app.models.account import Account
+from app.models.ingestion import IngestionResult
+from app.services.ingestion_service import (
+    INGEST_CHUNK_SIZE,
+    IngestionService,
+    get_ingestion_service,
+    parse_ndjson,
+)
+
+load_dotenv()
+
+logger = logging.getLogger("app")
+router = APIRouter(dependencies=[Depends(get_current_admin_account)])
+
+INGEST_MAX_CHUNK_SIZE = int(os.getenv("INGEST_MAX_CHUNK_SIZE", 50000))
+
+ChunkSizeQuery = Query(INGEST_CHUNK_SIZE, ge=1, le=INGEST_MAX_CHUNK_SIZE)
+
+
+@router.post("/ingest/sellers", response_model=IngestionResult)
+async def ingest_sellers_endpoint(
+    request: Request,
+    chunk_size: int = ChunkSizeQuery,
+    ingestion_service: IngestionService = Depends(get_ingestion_service),
+    current_account: Account = Depends(get_current_admin_account),
+):
+    """Тело запроса — NDJSON: {"id": 1, "is_verified": true} на строку."""
+    logger.info("User %s started sellers ingestion", current_account.login)
+    try:
+        return await ingestion_service.ingest_sellers(
+            parse_ndjson(request.stream()), chunk_size
+        )
+    except InvalidIngestionRecordError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+
+
+@router.post("/ingest/advertisements", response_model=IngestionResult)
+async def ingest_advertisements_endpoint(
+    request: Request,
+    chunk_size: int = ChunkSizeQuery,
+    prescore: bool = Query(False, description="Сразу посчитать предикты в кэш"),
+    ingestion_service: IngestionService = Depends(get_ingestion_service),
+    current_account: Account = Depends(get_current_admin_account),
+):
+    """Тело запроса — NDJSON, по объекту Advertisement на строку."""
+    logger.info("User %s started advertisements ingestion", current_account.login)
+    try:
+        return await ingestion_service.ingest_advertisements(
+            parse_ndjson(request.stream()), chunk_size, prescore
+        )
+    except InvalidIngestionRecordError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
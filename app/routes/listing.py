@@ -0,0 +1,68 @@
+import logging
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, Query
+
+from app.dependencies.auth import (
+    get_current_active_account,
+    get_current_admin_account,
+)
+from app.models.account import Account, AccountInfo
+from app.models.advertisement import AdvertisementWithSeller
+from app.models.moderation import Moderation
+from app.models.pagination import Page
+from app.models.seller import Seller
+from app.services.listing_service import ListingService, get_listing_service
+
+load_dotenv()
+
+logger = logging.getLogger("app")
+router = APIRouter(dependencies=[Depends(get_current_active_account)])
+admin_router = APIRouter(dependencies=[Depends(get_current_admin_account)])
+
+LIST_MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", 1000))
+
+AfterQuery = Query(
+    None, ge=0, description="next_after из предыдущей страницы, без него — первая"
+)
+LimitQuery = Query(100, ge=1, le=LIST_MAX_LIMIT)
+
+
+@router.get("/advertisements", response_model=Page[AdvertisementWithSeller])
+async def list_advertisements_endpoint(
+    after: Optional[int] = AfterQuery,
+    limit: int = LimitQuery,
+    listing_service: ListingService = Depends(get_listing_service),
+):
+    return await listing_service.list_advertisements(after, limit)
+
+
+@router.get("/sellers", response_model=Page[Seller])
+async def list_sellers_endpoint(
+    after: Optional[int] = AfterQuery,
+    limit: int = LimitQuery,
+    listing_service: ListingService = Depends(get_listing_service),
+):
+    return await listing_service.list_sellers(after, limit)
+
+
+@router.get("/moderation_results", response_model=Page[Moderation])
+async def list_moderation_tasks_endpoint(
+    after: Optional[int] = AfterQuery,
+    limit: int = LimitQuery,
+    listing_service: ListingService = Depends(get_listing_service),
+):
+    return await listing_service.list_moderation_tasks(after, limit)
+
+
+@admin_router.get("/accounts", response_model=Page[AccountInfo])
+async def list_accounts_endpoint(
+    after: Optional[int] = AfterQuery,
+    limit: int = LimitQuery,
+    listing_service: ListingService = Depends(get_listing_service),
+    current_account: Account = Depends(get_current_admin_account),
+):
+    logger.info("User %s requested accounts list", current_account.login)
+    return await listing_service.list_accounts(after, limit)
@@ -1,7 +1,11 @@
 import logging
-import sys
+import os
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from starlette.responses import StreamingResponse
 
 from app.dependencies.auth import get_current_active_account
 from app.errors import ErrorInPrediction, ModerationTaskNotFoundError
@@ -9,27 +13,52 @@ from app.models.account import Account
 from app.models.moderation import ModerationResult
 from app.services.moderation_service import ModerationService, get_moder_service
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
-)
+load_dotenv()
 
 logger = logging.getLogger("app")
 router = APIRouter(dependencies=[Depends(get_current_active_account)])
 
+# Ожидание в long-poll и длительность SSE-потока ограничены сверху,
+# чтобы запросы не висели дольше таймаутов балансировщика
+MAX_WAIT_SECONDS = float(os.getenv("MODERATION_RESULT_MAX_WAIT", 30))
+SSE_TIMEOUT_SECONDS = float(os.getenv("MODERATION_RESULT_SSE_TIMEOUT", 300))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("MODERATION_RESULT_SSE_KEEPALIVE", 15))
+
+
+def parse_wait(wait: Optional[str]) -> float:
+    """"30" и "30s" означают 30 секунд."""
+    if wait is None:
+        return 0.0
+    return min(float(wait.removesuffix("s")), MAX_WAIT_SECONDS)
+
+
+def format_event(result: Optional[ModerationResult]) -> bytes:
+    # Комментарий SSE не дает прокси закрыть соединение по простою
+    if result is None:
+        return b": keepalive\n\n"
+    return b"event: result\ndata: " + orjson.dumps(result.model_dump()) + b"\n\n"
+
 
 @router.get("/moderation_result/{task_id}", response_model=ModerationResult)
 async def moderation_result_endpoint(
     task_id: int,
+    wait: Optional[str] = Query(
+        None,
+        pattern=r"^\d+(\.\d+)?s?$",
+        description="Ждать завершения задачи до указанного числа секунд, например 30s",
+    ),
     moder_service_client: ModerationService = Depends(get_moder_service),
     current_account: Account = Depends(get_current_active_account),
 ):
     logger.info(
-        f"User {current_account.login} requested moderation result for task {task_id}"
+        "User %s requested moderation result for task %s",
+        current_account.login,
+        task_id,
     )
     try:
-        moderation_result = await moder_service_client.get_moderation_result(task_id)
+        moderation_result = await moder_service_client.wait_moderation_result(
+            task_id, timeout=parse_wait(wait)
+        )
     except ErrorInPrediction:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -42,3 +71,50 @@ async def moderation_result_endpoint(
         )
 
     return moderation_result
+
+
+@router.get("/moderation_result/{task_id}/events")
+async def moderation_result_events_endpoint(
+    task_id: int,
+    moder_service_client: ModerationService = Depends(get_moder_service),
+    current_account: Account = Depends(get_current_active_account),
+):
+    """
+    Server-sent events: сразу текущий результат задачи, затем итоговый,
+    когда воркер ее завершит, после чего поток закрывается.
+    """
+    logger.info(
+        "User %s subscribed to moderation result for task %s",
+        current_account.login,
+        task_id,
+    )
+    updates = moder_service_client.watch_moderation_result(
+        task_id, timeout=SSE_TIMEOUT_SECONDS, keepalive=SSE_KEEPALIVE_SECONDS
+    )
+    try:
+        # Ошибки первого чтения отдаем статусом ответа, а не в потоке
+        first = await anext(updates)
+    except ErrorInPrediction:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error in prediction.",
+        )
+    except ModerationTaskNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No task with id = {task_id}",
+        )
+
+    async def stream() -> AsyncIterator[bytes]:
+        try:
+            yield format_event(first)
+            async for update in updates:
+                yield format_event(update)
+        finally:
+            await updates.aclose()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
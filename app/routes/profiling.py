@@ -0,0 +1,37 @@
+import logging
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from starlette.responses import PlainTextResponse
+
+from app.dependencies.auth import get_current_admin_account
+from app.errors import ProfilerBusyError
+from app.models.account import Account
+from app.observability.profiler import profile, to_collapsed, to_speedscope
+from app.responses import ORJSONResponse
+
+logger = logging.getLogger("app")
+router = APIRouter(dependencies=[Depends(get_current_admin_account)])
+
+
+@router.get("/profile")
+async def profile_endpoint(
+    seconds: float = Query(default=10, gt=0, le=60),
+    interval: float = Query(default=0.005, ge=0.001, le=1),
+    format: Literal["collapsed", "speedscope"] = "collapsed",
+    current_account: Account = Depends(get_current_admin_account),
+):
+    logger.info(
+        "User %s requested %ss %s profile", current_account.login, seconds, format
+    )
+    try:
+        samples = await profile(seconds, interval)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    if format == "speedscope":
+        return ORJSONResponse(
+            to_speedscope(samples, interval, "api"),
+            headers={"Content-Disposition": 'attachment; filename="profile.json"'},
+        )
+    return PlainTextResponse(to_collapsed(samples))
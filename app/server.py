@@ -0,0 +1,150 @@
+"""
+Лаунчер сервиса.
+
+Запуск:
+    python -m app.server
+
+Все параметры берутся из переменных окружения (см. .env.example):
+- SERVER_MODE: uvicorn (по умолчанию) или gunicorn с uvicorn-воркерами
+- WEB_CONCURRENCY: число воркеров
+- SERVER_LOOP / SERVER_HTTP: реализация event loop и HTTP-парсера,
+  auto выбирает uvloop и httptools, если они установлены
+- SERVER_KEEPALIVE / SERVER_BACKLOG: тайм-аут keep-alive и очередь accept
+- SERVER_PRELOAD_MODEL: в режиме gunicorn загружает модель в мастере
+  до форка, чтобы воркеры делили ее память
+
+Модуль не импортирует приложение и prometheus_client на верхнем уровне:
+PROMETHEUS_MULTIPROC_DIR должна быть выставлена до их импорта.
+"""
+
+import gc
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+from uvicorn_worker import UvicornWorker as BaseUvicornWorker
+
+load_dotenv()
+
+APP_PATH = "app.main:app"
+GUNICORN_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gunicorn.conf.py"
+)
+
+
+def _getenv_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    host: str = "0.0.0.0"
+    port: int = 8000
+    mode: str = "uvicorn"
+    workers: int = 1
+    loop: str = "auto"
+    http: str = "auto"
+    keepalive: int = 5
+    backlog: int = 2048
+    access_log: bool = True
+    lifespan: str = "on"
+    preload_model: bool = True
+
+    @classmethod
+    def from_env(cls) -> "ServerSettings":
+        return cls(
+            host=os.getenv("HOST", cls.host),
+            port=int(os.getenv("PORT", cls.port)),
+            mode=os.getenv("SERVER_MODE", cls.mode),
+            workers=int(os.getenv("WEB_CONCURRENCY", cls.workers)),
+            loop=os.getenv("SERVER_LOOP", cls.loop),
+            http=os.getenv("SERVER_HTTP", cls.http),
+            keepalive=int(os.getenv("SERVER_KEEPALIVE", cls.keepalive)),
+            backlog=int(os.getenv("SERVER_BACKLOG", cls.backlog)),
+            access_log=_getenv_bool("SERVER_ACCESS_LOG", cls.access_log),
+            lifespan=os.getenv("SERVER_LIFESPAN", cls.lifespan),
+            preload_model=_getenv_bool("SERVER_PRELOAD_MODEL", cls.preload_model),
+        )
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """Uvicorn-воркер для gunicorn с loop/http из настроек сервиса."""
+
+    _settings = ServerSettings.from_env()
+    CONFIG_KWARGS = {
+        "loop": _settings.loop,
+        "http": _settings.http,
+        "lifespan": _settings.lifespan,
+        "access_log": _settings.access_log,
+    }
+
+
+def setup_multiprocess_metrics() -> None:
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR",
+        os.path.join(tempfile.gettempdir(), "backend_avito_prometheus"),
+    )
+
+    from app.observability.multiprocess import prepare_multiprocess_dir
+
+    prepare_multiprocess_dir()
+
+
+def preload_model() -> None:
+    """
+    Загружает модель в текущем (мастер) процессе.
+
+    После gc.freeze() сборщик мусора не трогает уже созданные объекты,
+    и страницы с моделью остаются общими для форкнутых воркеров.
+    """
+    from app.repositories.model import model_client
+
+    model_client.initialize_model()
+    gc.freeze()
+
+
+def run_uvicorn(settings: ServerSettings) -> None:
+    import uvicorn
+
+    if settings.workers > 1:
+        setup_multiprocess_metrics()
+
+    uvicorn.run(
+        APP_PATH,
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        loop=settings.loop,
+        http=settings.http,
+        timeout_keep_alive=settings.keepalive,
+        backlog=settings.backlog,
+        access_log=settings.access_log,
+        lifespan=settings.lifespan,
+    )
+
+
+def run_gunicorn() -> None:
+    from gunicorn.app.wsgiapp import WSGIApplication
+
+    sys.argv = ["gunicorn", "-c", GUNICORN_CONFIG_PATH, APP_PATH]
+    WSGIApplication("%(prog)s [OPTIONS] [APP_MODULE]").run()
+
+
+def main() -> None:
+    settings = ServerSettings.from_env()
+
+    if settings.mode == "gunicorn":
+        run_gunicorn()
+    elif settings.mode == "uvicorn":
+        run_uvicorn(settings)
+    else:
+        raise ValueError(f"Unknown SERVER_MODE: {settings.mode}")
+
+
+if __name__ == "__main__":
+    main()
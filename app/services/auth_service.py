@@ -1,7 +1,6 @@
 import datetime
 import logging
 import os
-import sys
 
 import jwt
 from dotenv import load_dotenv
@@ -12,14 +11,9 @@ from app.errors import (
     InvalidCredentialsError,
 )
 from app.models.account import Account
+from app.observability.tracing import traced
 from app.repositories.accounts import AccountRepository
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
-)
-
 logger = logging.getLogger("app")
 load_dotenv()
 
@@ -54,21 +48,25 @@ class AuthService:
 
         return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
 
+    @traced("auth.authenticate")
     async def authenticate(self, login: str, password: str) -> Account:
-        logger.info(f"Authenticating user: {login}")
+        logger.info("Authenticating user: %s", login)
         
         account = await self.account_repo.authenticate(login, password)
         if not account:
-            logger.warning(f"Failed authentication attempt for user: {login}")
+            logger.warning("Failed authentication attempt for user: %s", login)
             raise InvalidCredentialsError("Invalid login or password")
         
         if account.is_blocked:
-            logger.warning(f"Blocked user attempted login: {login}")
+            logger.warning("Blocked user attempted login: %s", login)
             raise AccountBlockedError("Account is blocked")
         
-        logger.info(f"User authenticated successfully: {login} (id: {account.id})")
+        logger.info(
+            "User authenticated successfully: %s (id: %s)", login, account.id
+        )
         return account
 
+    @traced("auth.verify_token")
     async def verify_token(self, token: str) -> Account:
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
@@ -1,18 +1,12 @@
 import logging
-import sys
+from typing import Sequence
 
 from app.errors import AdvertisementNotFoundError
-from app.models.advertisement import Advertisement
+from app.models.advertisement import Advertisement, ClosedAdvertisements
 from app.repositories.advertisements import AdvertisementRepository
 from app.repositories.cache import CacheRepository
 from app.repositories.moderation import ModerationRepository
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
-)
-
 logger = logging.getLogger("app")
 
 
@@ -30,35 +24,62 @@ class CloseService:
         return cls._instance
 
     async def close_advertisement(self, item_id: int) -> Advertisement:
-        logger.info(f"Closing advertisement item_id={item_id}")
+        logger.info("Closing advertisement item_id=%s", item_id)
 
         try:
             ad_data = await self.ad_repo.get(item_id)
         except AdvertisementNotFoundError:
-            logger.error(f"Advertisement {item_id} not found")
+            logger.error("Advertisement %s not found", item_id)
             raise
 
         closed_ad = await self.ad_repo.close(item_id)
-        logger.info(f"Marked advertisement {item_id} as closed in PostgreSQL")
+        logger.info("Marked advertisement %s as closed in PostgreSQL", item_id)
 
         try:
-            moderations = await self.moder_repo.get_many()
-            for mod in moderations:
-                if mod.item_id == item_id:
-                    await self.moder_repo.delete(mod.id)
-                    logger.info(
-                        f"Deleted moderation task {mod.id} for item_id={item_id}"
-                    )
+            task_ids = await self.moder_repo.delete_by_item_id(item_id)
+            logger.info(
+                "Deleted moderation tasks %s for item_id=%s", task_ids, item_id
+            )
+            await self.cache_repo.delete_moderation_results(task_ids)
         except Exception as e:
             logger.warning(
-                f"Error deleting moderation tasks for item_id={item_id}: {str(e)}"
+                "Error deleting moderation tasks for item_id=%s: %s", item_id, e
             )
 
         await self.cache_repo.delete_prediction(item_id)
-        logger.info(f"Deleted cache data for item_id={item_id}")
+        logger.info("Deleted cache data for item_id=%s", item_id)
 
         return closed_ad
 
+    async def close_advertisements(
+        self, item_ids: Sequence[int]
+    ) -> ClosedAdvertisements:
+        """
+        Закрывает объявления и удаляет их задачи модерации в одной
+        транзакции: либо закрываются все найденные объявления, либо
+        ни одно. Несуществующие id возвращаются в not_found.
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        logger.info("Closing %s advertisements", len(item_ids))
+
+        closed = await self.ad_repo.close_many(item_ids)
+        closed_ads = [ad for ad, _ in closed]
+        closed_ids = {ad.id for ad in closed_ads}
+        task_ids = [task_id for _, ad_task_ids in closed for task_id in ad_task_ids]
+        logger.info(
+            "Closed %s advertisements, deleted %s moderation tasks",
+            len(closed_ads),
+            len(task_ids),
+        )
+
+        await self.cache_repo.delete_predictions(sorted(closed_ids))
+        await self.cache_repo.delete_moderation_results(task_ids)
+
+        return ClosedAdvertisements(
+            closed=closed_ads,
+            not_found=[item_id for item_id in item_ids if item_id not in closed_ids],
+        )
+
     def get_close_service(self):
         return self
 
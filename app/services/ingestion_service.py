@@ -0,0 +1,188 @@
+"""
+Массовая загрузка продавцов и объявлений.
+
+Записи приходят потоком (NDJSON из тела запроса или файла), режутся
+на пачки по chunk_size и пишутся через COPY во временную таблицу
+с последующим upsert, по транзакции на пачку. В памяти лежит одна
+пачка. Если запись в пачке некорректна, уже записанные пачки
+остаются в БД: повторная загрузка того же файла безопасна, так как
+это upsert.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, AsyncIterable, AsyncIterator, List, Sequence, Type, TypeVar
+
+import asyncpg
+import orjson
+from dotenv import load_dotenv
+from pydantic import BaseModel, ValidationError
+
+from app.errors import InvalidIngestionRecordError
+from app.models.advertisement import Advertisement
+from app.models.ingestion import IngestionResult
+from app.models.seller import Seller
+from app.observability.metrics import INGESTED_ROWS_TOTAL
+from app.repositories.advertisements import AdvertisementRepository
+from app.repositories.cache import CacheRepository
+from app.repositories.sellers import SellerRepository
+from app.services.ml_service import get_ml_service
+
+load_dotenv()
+
+logger = logging.getLogger("app")
+
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", 5000))
+
+T = TypeVar("T", bound=BaseModel)
+
+
+async def parse_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """JSON-объекты по одному на строку из потока байтов."""
+    line_number = 0
+    buffer = b""
+
+    def parse(line: bytes) -> Any:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            raise InvalidIngestionRecordError(f"Line {line_number}: {e}")
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield parse(line)
+
+    if buffer.strip():
+        line_number += 1
+        yield parse(buffer)
+
+
+async def validated_chunks(
+    records: AsyncIterable[Any], model: Type[T], chunk_size: int
+) -> AsyncIterator[List[T]]:
+    """
+    Пачки моделей по chunk_size записей. Повторы id внутри пачки
+    схлопываются, побеждает последняя запись: upsert не может обновить
+    одну строку дважды в одном запросе.
+    """
+    chunk = {}
+    record_number = 0
+    async for record in records:
+        record_number += 1
+        try:
+            item = model.model_validate(record)
+        except ValidationError as e:
+            raise InvalidIngestionRecordError(f"Record {record_number}: {e}")
+
+        chunk[item.id] = item
+        if len(chunk) >= chunk_size:
+            yield list(chunk.values())
+            chunk = {}
+
+    if chunk:
+        yield list(chunk.values())
+
+
+class IngestionService:
+    _instance = None
+
+    def __init__(self):
+        self.seller_repo = SellerRepository()
+        self.ad_repo = AdvertisementRepository()
+        self.cache_repo = CacheRepository()
+        self.ml_service = get_ml_service()
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    async def ingest_sellers(
+        self, records: AsyncIterable[Any], chunk_size: int = INGEST_CHUNK_SIZE
+    ) -> IngestionResult:
+        """
+        is_verified продавца — признак модели, поэтому предикты его
+        объявлений удаляются из кэша.
+        """
+        result = IngestionResult(table="sellers", rows=0, chunks=0)
+        async for sellers in validated_chunks(records, Seller, chunk_size):
+            await self._write(result, self.seller_repo.bulk_upsert, sellers)
+
+            await self.cache_repo.delete_predictions(
+                await self.ad_repo.get_ids_by_seller_ids(
+                    [seller.id for seller in sellers]
+                )
+            )
+        return result
+
+    async def ingest_advertisements(
+        self,
+        records: AsyncIterable[Any],
+        chunk_size: int = INGEST_CHUNK_SIZE,
+        prescore: bool = False,
+    ) -> IngestionResult:
+        """
+        С prescore предикты для загруженных открытых объявлений
+        считаются пачкой и кладутся в кэш, и первый /simple_predict
+        не пойдет в модель. Без prescore старые предикты обновленных
+        объявлений удаляются из кэша.
+        """
+        result = IngestionResult(table="advertisements", rows=0, chunks=0)
+        async for ads in validated_chunks(records, Advertisement, chunk_size):
+            await self._write(result, self.ad_repo.bulk_upsert, ads)
+
+            item_ids = [ad.id for ad in ads]
+            scored = await self._prescore(item_ids) if prescore else set()
+            result.scored += len(scored)
+            await self.cache_repo.delete_predictions(
+                [item_id for item_id in item_ids if item_id not in scored]
+            )
+        return result
+
+    async def _write(
+        self, result: IngestionResult, bulk_upsert, items: Sequence[BaseModel]
+    ) -> None:
+        try:
+            rows = await bulk_upsert(items)
+        except asyncpg.IntegrityConstraintViolationError as e:
+            # Например, объявление ссылается на несуществующего продавца
+            raise InvalidIngestionRecordError(
+                f"Chunk {result.chunks + 1} of {result.table} was rejected: {e}. "
+                f"{result.rows} rows were written before it"
+            )
+
+        result.rows += rows
+        result.chunks += 1
+        INGESTED_ROWS_TOTAL.labels(table=result.table).inc(rows)
+        logger.info(
+            "Ingested chunk %s into %s: %s rows", result.chunks, result.table, rows
+        )
+
+    async def _prescore(self, item_ids: Sequence[int]) -> set:
+        ads = [
+            ad
+            for ad in await self.ad_repo.get_many_by_ids(item_ids)
+            if not ad.is_closed
+        ]
+        # Пачка бывает до INGEST_MAX_CHUNK_SIZE строк, и синхронный
+        # инференс надолго занял бы event loop API
+        predictions = await asyncio.to_thread(self.ml_service.predict_batch, ads)
+        await self.cache_repo.set_predictions(
+            {ad.item_id: prediction for ad, prediction in zip(ads, predictions)}
+        )
+        return {ad.item_id for ad in ads}
+
+    def get_ingestion_service(self):
+        return self
+
+
+ingestion_service_client = IngestionService()
+
+
+def get_ingestion_service():
+    return ingestion_service_client.get_ingestion_service()
@@ -0,0 +1,88 @@
+import logging
+from typing import Callable, Optional, Sequence, TypeVar
+
+from app.models.account import AccountInfo
+from app.models.advertisement import AdvertisementWithSeller
+from app.models.moderation import Moderation
+from app.models.pagination import Page
+from app.models.seller import Seller
+from app.repositories.accounts import AccountRepository
+from app.repositories.advertisements import AdvertisementRepository
+from app.repositories.moderation import ModerationRepository
+from app.repositories.pagination import FIRST_PAGE_AFTER
+from app.repositories.sellers import SellerRepository
+
+logger = logging.getLogger("app")
+
+T = TypeVar("T")
+
+
+def make_page(items: Sequence[T], limit: int, key: Callable[[T], int]) -> Page[T]:
+    # Неполная страница — последняя, за следующей идти не нужно
+    next_after = key(items[-1]) if len(items) == limit else None
+    return Page[T](items=list(items), next_after=next_after)
+
+
+class ListingService:
+    """
+    Постраничные списки для API. Страница задается id последнего
+    элемента предыдущей страницы (after), а не номером страницы.
+    """
+
+    _instance = None
+
+    def __init__(self):
+        self.ad_repo = AdvertisementRepository()
+        self.seller_repo = SellerRepository()
+        self.moder_repo = ModerationRepository()
+        self.account_repo = AccountRepository()
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    async def list_advertisements(
+        self, after: Optional[int], limit: int
+    ) -> Page[AdvertisementWithSeller]:
+        logger.info("Listing advertisements after=%s limit=%s", after, limit)
+        ads = await self.ad_repo.get_page(self._after(after), limit)
+        return make_page(ads, limit, key=lambda ad: ad.item_id)
+
+    async def list_sellers(self, after: Optional[int], limit: int) -> Page[Seller]:
+        logger.info("Listing sellers after=%s limit=%s", after, limit)
+        sellers = await self.seller_repo.get_page(self._after(after), limit)
+        return make_page(sellers, limit, key=lambda seller: seller.id)
+
+    async def list_moderation_tasks(
+        self, after: Optional[int], limit: int
+    ) -> Page[Moderation]:
+        logger.info("Listing moderation tasks after=%s limit=%s", after, limit)
+        tasks = await self.moder_repo.get_page(self._after(after), limit)
+        return make_page(tasks, limit, key=lambda task: task.id)
+
+    async def list_accounts(
+        self, after: Optional[int], limit: int
+    ) -> Page[AccountInfo]:
+        logger.info("Listing accounts after=%s limit=%s", after, limit)
+        accounts = await self.account_repo.get_page(self._after(after), limit)
+        # Хэши паролей наружу не отдаются
+        return make_page(
+            [AccountInfo(**account.model_dump()) for account in accounts],
+            limit,
+            key=lambda account: account.id,
+        )
+
+    @staticmethod
+    def _after(after: Optional[int]) -> int:
+        return FIRST_PAGE_AFTER if after is None else after
+
+    def get_listing_service(self):
+        return self
+
+
+listing_service_client = ListingService()
+
+
+def get_listing_service():
+    return listing_service_client.get_listing_service()
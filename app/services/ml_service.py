@@ -1,7 +1,6 @@
 import logging
-import sys
 import time
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence
 
 import numpy as np
 
@@ -17,16 +16,11 @@ from app.observability.metrics import (
     PREDICTION_ERRORS_TOTAL,
     PREDICTIONS_TOTAL,
 )
+from app.observability.tracing import Span, traced
 from app.repositories.advertisements import AdvertisementRepository
 from app.repositories.cache import CacheRepository
 from app.repositories.model import model_client
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
-)
-
 logger = logging.getLogger("app")
 
 
@@ -42,7 +36,8 @@ class MLService:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def _prepare_features(self, ad_data: AdvertisementWithSeller) -> np.ndarray:
+    @staticmethod
+    def _feature_row(ad_data: AdvertisementWithSeller) -> List[float]:
         is_verified = int(ad_data.is_verified_seller)
 
         images_normalized = min(ad_data.images_qty / 10, 1)
@@ -51,16 +46,16 @@ class MLService:
 
         category_normalized = min(ad_data.category / 100, 1)
 
-        return np.array(
-            [
-                [
-                    is_verified,
-                    images_normalized,
-                    description_length_normalized,
-                    category_normalized,
-                ]
-            ]
-        )
+        return [
+            is_verified,
+            images_normalized,
+            description_length_normalized,
+            category_normalized,
+        ]
+
+    @traced("ml.features")
+    def _prepare_features(self, ad_data: AdvertisementWithSeller) -> np.ndarray:
+        return np.array([self._feature_row(ad_data)])
 
     def predict(self, ad_data: AdvertisementWithSeller) -> Dict[str, Any]:
         logger.info(
@@ -73,7 +68,8 @@ class MLService:
             features = self._prepare_features(ad_data)
 
             start_time = time.time()
-            is_violation, probability = self.model_client.predict(features)
+            with Span("ml.inference"):
+                is_violation, probability = self.model_client.predict(features)
             inference_duration = time.time() - start_time
 
             result_label = "violation" if is_violation else "no_violation"
@@ -99,14 +95,38 @@ class MLService:
             PREDICTION_ERRORS_TOTAL.labels(error_type="prediction_error").inc()
             raise ErrorInPrediction("Error in prediction in MLService.")
 
+    def predict_batch(
+        self, ads: Sequence[AdvertisementWithSeller]
+    ) -> List[Dict[str, Any]]:
+        """
+        Предикты для пачки объявлений одним вызовом модели. Используется
+        для предварительной оценки при массовой загрузке, поэтому
+        в PREDICTIONS_TOTAL не считается.
+        """
+        if not ads:
+            return []
+
+        features = np.array([self._feature_row(ad) for ad in ads])
+        start_time = time.time()
+        with Span("ml.inference"):
+            predictions = self.model_client.predict_batch(features)
+        PREDICTION_DURATION_SECONDS.labels(prediction_type="batch").observe(
+            time.time() - start_time
+        )
+
+        return [
+            {"is_violation": is_violation, "probability": probability}
+            for is_violation, probability in predictions
+        ]
+
     async def simple_predict(self, item_id: int) -> Dict[str, Any]:
         try:
             cached_result = await self.cache_repo.get_prediction(item_id)
             if cached_result:
-                logger.info(f"Returning cached prediction for item_id={item_id}")
+                logger.info("Returning cached prediction for item_id=%s", item_id)
                 return cached_result
 
-            logger.info(f"Cache miss, fetching from DB for item_id={item_id}")
+            logger.info("Cache miss, fetching from DB for item_id=%s", item_id)
 
             ad_repo = AdvertisementRepository()
             ad_data = await ad_repo.get(item_id)
@@ -133,7 +153,7 @@ class MLService:
 
     async def invalidate_cache(self, item_id: int) -> None:
         await self.cache_repo.delete_prediction(item_id)
-        logger.info(f"Invalidated cache for item_id={item_id}")
+        logger.info("Invalidated cache for item_id=%s", item_id)
 
     def get_ml_service(self):
         return self
@@ -0,0 +1,98 @@
+"""
+Уведомления о завершении задач модерации через Redis pub/sub.
+
+Воркер после завершения задачи публикует результат в канал
+MODERATION_RESULTS_CHANNEL. Каждый процесс API держит одну подписку
+на канал и будит запросы, которые ждут эту задачу (long-poll и SSE
+в /moderation_result). Ожидающий запрос читает задачу из БД один раз,
+а итоговый результат получает из уведомления.
+
+Если Redis недоступен, уведомление теряется и ожидание заканчивается
+по таймауту: клиент получит pending и повторит запрос.
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import contextmanager, suppress
+from typing import Any, Dict, Iterator, Optional, Set
+
+from app.clients.redis import redis_client
+from app.models.moderation import ModerationResult
+
+logger = logging.getLogger("app")
+
+MODERATION_RESULTS_CHANNEL = "moderation_results"
+RESUBSCRIBE_DELAY = 1.0
+
+
+class ModerationResultNotifier:
+    def __init__(self):
+        self._waiters: Dict[int, Set[asyncio.Future]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+
+        self._task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def publish(self, result: ModerationResult) -> None:
+        try:
+            await redis_client.publish(MODERATION_RESULTS_CHANNEL, result.model_dump())
+        except Exception:
+            logger.exception(
+                "Failed to publish moderation result for task %s", result.task_id
+            )
+
+    @contextmanager
+    def waiter(self, task_id: int) -> Iterator[asyncio.Future]:
+        """
+        Future, который получит результат задачи из уведомления.
+        Регистрировать нужно до чтения задачи из БД, иначе можно
+        пропустить уведомление между чтением и подпиской.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[task_id].add(future)
+        try:
+            yield future
+        finally:
+            waiters = self._waiters.get(task_id)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[task_id]
+
+    def dispatch(self, data: Any) -> None:
+        result = json.loads(data)
+        for future in self._waiters.pop(result["task_id"], ()):
+            if not future.done():
+                future.set_result(result)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = await redis_client.subscribe(MODERATION_RESULTS_CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        self.dispatch(message["data"])
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Moderation results subscription failed")
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+
+moderation_notifier = ModerationResultNotifier()
@@ -1,7 +1,7 @@
+import asyncio
 import datetime
 import logging
-import sys
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Optional
 
 import numpy as np
 
@@ -12,15 +12,12 @@ from app.errors import (
     ModelIsNotAvailable,
     ModerationTaskNotFoundError,
 )
-from app.models.moderation import ModerationResult
+from app.models.moderation import Moderation, ModerationResult
 from app.repositories.advertisements import AdvertisementRepository
+from app.repositories.cache import CacheRepository
 from app.repositories.moderation import ModerationRepository
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
-)
+from app.services.moderation_notifier import moderation_notifier
+from app.workers.outbox_relay import outbox_relay
 
 logger = logging.getLogger("app")
 
@@ -31,13 +28,21 @@ class ModerationService:
     def __init__(self):
         self.ad_repo = AdvertisementRepository()
         self.moder_repo = ModerationRepository()
+        self.cache_repo = CacheRepository()
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    async def async_predict(self, item_id: int) -> int:
+    async def async_predict(self, item_id: int) -> Moderation:
+        """
+        Повторные запросы по одному объявлению не множат работу воркера:
+        - если предикт есть в кэше, возвращается завершенная задача
+          с тем же результатом, а если ее нет, она создается, без Kafka;
+        - если у объявления уже есть задача в статусе pending,
+          возвращается она.
+        """
         try:
 
             logger.info(
@@ -45,25 +50,50 @@ class ModerationService:
                 item_id,
             )
 
-            ad_data = await self.ad_repo.get(item_id)
-
             timestamp_now = datetime.datetime.now()
 
-            moderation_task = await self.moder_repo.create(
-                item_id, "pending", timestamp_now
-            )
+            cached_result = await self._get_cached_prediction(item_id)
+            if cached_result:
+                logger.info("Completing task from cache: {item_id=%s}", item_id)
+                moderation_task, created = (
+                    await self.moder_repo.get_or_create_completed(
+                        item_id,
+                        timestamp_now,
+                        bool(cached_result["is_violation"]),
+                        cached_result["probability"],
+                    )
+                )
+                if created:
+                    await self._cache_result(self._to_result(moderation_task))
+                return moderation_task
 
-            await kafka_producer.send_moderation_request(
-                moderation_task.id, item_id, timestamp_now
-            )
+            ad_data = await self.ad_repo.get(item_id)
 
-            return moderation_task.id
+            # Событие для воркера пишется в outbox в той же транзакции,
+            # в Kafka его отправит OutboxRelay
+            moderation_task, created = await self.moder_repo.get_or_create_pending(
+                item_id, timestamp_now, kafka_producer.moderation_topic
+            )
+            if created:
+                outbox_relay.wake()
+            else:
+                logger.info(
+                    "Reusing pending task: {item_id=%s, task_id=%s}",
+                    item_id,
+                    moderation_task.id,
+                )
+
+            return moderation_task
         except AdvertisementNotFoundError as e:
             raise ErrorInPrediction("Advertisement Not Found In DB.")
         except Exception as e:
             raise ErrorInPrediction("Error in async prediction in MLService.")
 
     async def get_moderation_result(self, task_id: int) -> ModerationResult:
+        """
+        Завершенные задачи отдаются из кэша (память процесса, затем Redis),
+        в Postgres идут только промахи и задачи в статусе pending.
+        """
         try:
 
             logger.info(
@@ -71,34 +101,143 @@ class ModerationService:
                 task_id,
             )
 
+            cached_result = await self._get_cached_result(task_id)
+            if cached_result is not None:
+                return cached_result
+
             moderation_task = await self.moder_repo.get(task_id)
 
-            return ModerationResult(
-                task_id=moderation_task.id,
-                status=moderation_task.status,
-                is_violation=moderation_task.is_violation,
-                probability=moderation_task.probability,
-            )
+            result = self._to_result(moderation_task)
+            await self._cache_result(result)
+            return result
         except ModerationTaskNotFoundError as e:
             raise ModerationTaskNotFoundError("Moderation Task Not Found In DB.")
         except Exception as e:
             raise ErrorInPrediction("Error in async prediction in MLService.")
 
-    async def complete_moderation_task(self, task_id: int, prediction_res: dict):
-        await self.moder_repo.update(
+    async def watch_moderation_result(
+        self, task_id: int, timeout: float, keepalive: float
+    ) -> AsyncIterator[Optional[ModerationResult]]:
+        """
+        Текущий результат задачи, а если она в статусе pending, то еще
+        и итоговый, как только воркер ее завершит. Пока задача не
+        завершена, раз в keepalive секунд отдает None. Через timeout
+        секунд ожидание прекращается. В БД ходит один раз.
+        """
+        loop = asyncio.get_running_loop()
+
+        with moderation_notifier.waiter(task_id) as completed:
+            result = await self.get_moderation_result(task_id)
+            yield result
+
+            deadline = loop.time() + timeout
+            while result.status == "pending":
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+
+                done, _ = await asyncio.wait(
+                    {completed}, timeout=min(keepalive, remaining)
+                )
+                if done:
+                    result = ModerationResult(**completed.result())
+                    yield result
+                else:
+                    yield None
+
+    async def wait_moderation_result(
+        self, task_id: int, timeout: float
+    ) -> ModerationResult:
+        """Результат задачи, ожидая ее завершения не дольше timeout секунд."""
+        result = None
+        async for update in self.watch_moderation_result(
+            task_id, timeout, keepalive=timeout
+        ):
+            if update is not None:
+                result = update
+        return result
+
+    async def is_task_finished(self, task_id: int) -> bool:
+        """Задача уже завершена или удалена, повторно обрабатывать не нужно."""
+        if await self._get_cached_result(task_id) is not None:
+            return True
+
+        try:
+            moderation_task = await self.moder_repo.get(task_id)
+        except ModerationTaskNotFoundError:
+            return True
+
+        return moderation_task.status != "pending"
+
+    async def complete_moderation_task(
+        self, task_id: int, prediction_res: dict
+    ) -> bool:
+        return await self._finish_task(
             task_id,
             status="completed",
             is_violation=prediction_res["is_violation"],
             probability=prediction_res["probability"],
-            processed_at=datetime.datetime.now(),
         )
 
-    async def fail_moderation_task(self, task_id: int, error_message: str):
-        await self.moder_repo.update(
-            task_id,
-            status="failed",
-            error_message=error_message,
-            processed_at=datetime.datetime.now(),
+    async def fail_moderation_task(self, task_id: int, error_message: str) -> bool:
+        return await self._finish_task(
+            task_id, status="failed", error_message=error_message
+        )
+
+    async def _finish_task(self, task_id: int, **changes: Any) -> bool:
+        moderation_task = await self.moder_repo.update_if_pending(
+            task_id, processed_at=datetime.datetime.now(), **changes
+        )
+        if moderation_task is None:
+            logger.info("Moderation task %s is already finished", task_id)
+            return False
+
+        result = self._to_result(moderation_task)
+        await self._cache_result(result)
+        await moderation_notifier.publish(result)
+        return True
+
+    async def _get_cached_prediction(self, item_id: int) -> Optional[Dict[str, Any]]:
+        # Без Redis задача идет обычным путем через воркер
+        try:
+            return await self.cache_repo.get_prediction(item_id)
+        except Exception:
+            logger.warning(
+                "Failed to read cached prediction for item %s",
+                item_id,
+                exc_info=True,
+            )
+            return None
+
+    async def _get_cached_result(self, task_id: int) -> Optional[ModerationResult]:
+        # Кэш только ускоряет чтение: при недоступном Redis идем в БД
+        try:
+            return await self.cache_repo.get_moderation_result(task_id)
+        except Exception:
+            logger.warning(
+                "Failed to read cached moderation result for task %s",
+                task_id,
+                exc_info=True,
+            )
+            return None
+
+    async def _cache_result(self, result: ModerationResult) -> None:
+        try:
+            await self.cache_repo.set_moderation_result(result)
+        except Exception:
+            logger.warning(
+                "Failed to cache moderation result for task %s",
+                result.task_id,
+                exc_info=True,
+            )
+
+    @staticmethod
+    def _to_result(moderation_task: Moderation) -> ModerationResult:
+        return ModerationResult(
+            task_id=moderation_task.id,
+            status=moderation_task.status,
+            is_violation=moderation_task.is_violation,
+            probability=moderation_task.probability,
         )
 
     def get_moder_service(self):
@@ -1,10 +1,11 @@
 import asyncio
-import json
 import logging
-import sys
+import os
+from collections import OrderedDict
 from typing import Optional
 
 from aiokafka import ConsumerRecord
+from dotenv import load_dotenv
 
 from app.clients.kafka import (
     KafkaConsumer,
@@ -12,23 +13,31 @@ from app.clients.kafka import (
     get_kafka_consumer,
     get_kafka_producer,
 )
+from app.clients.kafka_codec import decode_moderation_request
 from app.errors import (
     AdvertisementNotFoundError,
     ErrorInPrediction,
     ModelIsNotAvailable,
+    UnsupportedEventFormatError,
+)
+from app.observability.logs import setup_logging, stop_logging
+from app.observability.loop_monitor import LoopMonitor
+from app.observability.metrics import DUPLICATE_EVENTS_TOTAL
+from app.observability.profiler import install_signal_handler
+from app.observability.tracing import (
+    Span,
+    set_endpoint,
+    setup_tracing,
+    shutdown_tracing,
 )
 from app.repositories.model import model_client
 from app.services.ml_service import MLService, get_ml_service
 from app.services.moderation_service import ModerationService, get_moder_service
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="\033[92m%(levelname)s\033[0m:  \t  %(message)s",
-    stream=sys.stdout,
-)
-
 logger = logging.getLogger("app")
 
+load_dotenv()
+
 
 class ModerationWorker:
     def __init__(
@@ -39,8 +48,21 @@ class ModerationWorker:
         self.ml_service_client: Optional[MLService] = None
         self.moder_service_client: Optional[ModerationService] = None
         self.n_retries = 3
+        # Паузы после предикта и между повторами, секунды
+        self.processing_delay = float(os.getenv("WORKER_PROCESSING_DELAY", 10))
+        self.retry_delay = float(os.getenv("WORKER_RETRY_DELAY", 5))
+        # Недавно завершенные задачи: повторная доставка после рестарта
+        # или ребаланса пропускается без похода в БД
+        self.dedupe_size = int(os.getenv("WORKER_DEDUPE_SIZE", 10000))
+        self._finished_tasks: OrderedDict[int, None] = OrderedDict()
+        self.loop_monitor = LoopMonitor(component="worker")
 
     async def start(self):
+        setup_logging()
+        self.loop_monitor.start()
+        install_signal_handler(component="worker")
+        setup_tracing(service_name="worker")
+        set_endpoint("worker")
         model_client.initialize_model()
         self.consumer = await get_kafka_consumer()
         self.producer = await get_kafka_producer()
@@ -48,8 +70,36 @@ class ModerationWorker:
         self.moder_service_client = get_moder_service()
 
     async def stop(self):
-        self.consumer.stop()
-        self.producer.stop()
+        await self.consumer.stop()
+        # stop() дожидается неподтвержденных сообщений в DLQ
+        await self.producer.stop()
+        await self.loop_monitor.stop()
+        shutdown_tracing()
+        stop_logging()
+
+    def _remember_finished(self, task_id: int) -> None:
+        self._finished_tasks[task_id] = None
+        self._finished_tasks.move_to_end(task_id)
+        if len(self._finished_tasks) > self.dedupe_size:
+            self._finished_tasks.popitem(last=False)
+
+    async def is_duplicate(self, task_id: int) -> bool:
+        if task_id in self._finished_tasks:
+            DUPLICATE_EVENTS_TOTAL.labels(source="local").inc()
+            return True
+
+        try:
+            finished = await self.moder_service_client.is_task_finished(task_id)
+        except Exception:
+            # Без проверки обрабатываем как обычно: завершенную задачу
+            # все равно не перезапишет условный UPDATE
+            logger.exception("Failed to check status of task %s", task_id)
+            return False
+
+        if finished:
+            DUPLICATE_EVENTS_TOTAL.labels(source="db").inc()
+            self._remember_finished(task_id)
+        return finished
 
     async def retry(self, task_id: int, item_id: int):
         retry_count = 1
@@ -58,9 +108,9 @@ class ModerationWorker:
         while retry_count < self.n_retries:
             try:
                 pred = await self.ml_service_client.simple_predict(item_id)
-                await asyncio.sleep(10)
+                await asyncio.sleep(self.processing_delay)
                 await self.moder_service_client.complete_moderation_task(task_id, pred)
-                await asyncio.sleep(5)
+                return
             except (
                 ModelIsNotAvailable,
                 AdvertisementNotFoundError,
@@ -73,12 +123,32 @@ class ModerationWorker:
                 original_message = str(e)
 
             retry_count += 1
+            if retry_count < self.n_retries:
+                await asyncio.sleep(self.retry_delay)
 
-        await self.producer.send_to_dlq(original_message, error, retry_count)
+        await self.producer.send_to_dlq(
+            original_message, error, retry_count, item_id=item_id
+        )
         await self.moder_service_client.fail_moderation_task(task_id, original_message)
 
     async def process_moderation_request(self, message: ConsumerRecord):
-        event = json.loads(message.value.decode("utf-8"))
+        try:
+            event = decode_moderation_request(message.value)
+        except UnsupportedEventFormatError as e:
+            # Повторная обработка не поможет: событие уходит в DLQ как есть,
+            # чтение топика продолжается
+            logger.error(
+                "Undecodable moderation event at offset %s: %s", message.offset, e
+            )
+            await self.producer.send_to_dlq(
+                message.value.hex(), e.__class__.__name__, 0
+            )
+            return
+
+        if await self.is_duplicate(event["task_id"]):
+            logger.info("Skip already finished task: task_id=%s", event["task_id"])
+            return
+
         logger.info(
             "Process task:\n" "\ttask_id: %s" "\titem_id: %s" "\ttimestamp: %s",
             event["task_id"],
@@ -88,18 +158,21 @@ class ModerationWorker:
 
         try:
             pred = await self.ml_service_client.simple_predict(event["item_id"])
-            await asyncio.sleep(10)
+            await asyncio.sleep(self.processing_delay)
             await self.moder_service_client.complete_moderation_task(
                 event["task_id"], pred
             )
         except Exception as e:
             await self.retry(event["task_id"], event["item_id"])
 
+        self._remember_finished(event["task_id"])
+
     async def run(self):
         await self.start()
         try:
             async for msg in self.consumer.consumer:
-                await self.process_moderation_request(msg)
+                with Span("worker.process"):
+                    await self.process_moderation_request(msg)
                 await self.consumer.consumer.commit()
 
         finally:
@@ -0,0 +1,133 @@
+"""
+Публикация событий из таблицы outbox в Kafka.
+
+/async_predict пишет задачу и событие в outbox одной транзакцией
+и не ждет брокера. OutboxRelay в фоне забирает события пачками
+(до OUTBOX_BATCH_SIZE), отправляет их через KafkaProducer.send_batch
+и удаляет из outbox после подтверждения. Если процесс упал между
+записью и публикацией, событие останется в outbox и уйдет позже.
+
+Релей просыпается сразу после записи события в этом процессе (wake)
+и выжидает OUTBOX_LINGER секунд, чтобы собрать пачку побольше, а
+события других процессов подбирает опросом раз в OUTBOX_POLL_INTERVAL.
+
+Переменные окружения:
+- OUTBOX_RELAY_ENABLED: запускать релей в процессе API (true по умолчанию)
+- OUTBOX_BATCH_SIZE: максимум событий за одну итерацию
+- OUTBOX_POLL_INTERVAL: период опроса outbox в секундах
+- OUTBOX_LINGER: ожидание перед публикацией после wake в секундах
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import suppress
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from app.clients.kafka import kafka_producer
+from app.observability.logs import setup_logging, stop_logging
+from app.observability.metrics import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_EVENTS_PUBLISHED_TOTAL,
+    OUTBOX_RELAY_ERRORS_TOTAL,
+)
+from app.repositories.outbox import OutboxRepository
+
+logger = logging.getLogger("app.outbox")
+
+load_dotenv()
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        linger: Optional[float] = None,
+    ):
+        self.enabled = os.getenv("OUTBOX_RELAY_ENABLED", "true").lower() == "true"
+        self.batch_size = (
+            batch_size
+            if batch_size is not None
+            else int(os.getenv("OUTBOX_BATCH_SIZE", 500))
+        )
+        self.poll_interval = (
+            poll_interval
+            if poll_interval is not None
+            else float(os.getenv("OUTBOX_POLL_INTERVAL", 1))
+        )
+        self.linger = (
+            linger if linger is not None else float(os.getenv("OUTBOX_LINGER", 0.005))
+        )
+        self.outbox_repo = OutboxRepository()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def wake(self) -> None:
+        """Сообщает релею, что в outbox появилось событие."""
+        self._wakeup.set()
+
+    async def _publish(self, events: List[Dict[str, Any]]) -> None:
+        await kafka_producer.send_batch(events)
+
+    async def publish_once(self) -> int:
+        published = await self.outbox_repo.publish_batch(
+            self.batch_size, self._publish
+        )
+        if published:
+            OUTBOX_EVENTS_PUBLISHED_TOTAL.inc(published)
+            OUTBOX_BATCH_SIZE.observe(published)
+        return published
+
+    async def run(self) -> None:
+        while True:
+            try:
+                published = await self.publish_once()
+            except Exception:
+                OUTBOX_RELAY_ERRORS_TOTAL.inc()
+                logger.exception("Failed to publish outbox events")
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            # Полная пачка: в outbox, скорее всего, есть еще события
+            if published >= self.batch_size:
+                continue
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            self._wakeup.clear()
+            await asyncio.sleep(self.linger)
+
+
+outbox_relay = OutboxRelay()
+
+
+async def main():
+    setup_logging()
+    await kafka_producer.start()
+    try:
+        await outbox_relay.run()
+    finally:
+        await kafka_producer.stop()
+        stop_logging()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,243 @@
+"""
+Нагрузочный тест /predict, /simple_predict и /async_predict.
+
+Запуск:
+    make bench
+    python -m benchmarks.load_bench --rate 200 --duration 10 --mode uvicorn \\
+        --db-latency 0.002 --redis-latency 0.0005 --output bench.json
+
+Postgres, Redis и Kafka заменены локальными заменителями из
+benchmarks.stand_ins, остальной путь запроса настоящий: middleware,
+авторизация по JWT, роуты, сервисы, кэш и модель.
+
+Нагрузка открытая: запросы отправляются по расписанию с заданной
+частотой независимо от того, успели ли ответить предыдущие, а задержка
+считается от запланированного момента отправки. Так очередь перед
+перегруженным сервисом попадает в перцентили, а не прячется.
+
+Результат — JSON с пропускной способностью, p50/p95/p99 и долей ошибок
+по каждому эндпоинту, чтобы сравнивать прогоны между коммитами.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from benchmarks import stand_ins
+
+ENDPOINTS = ("/predict", "/simple_predict", "/async_predict")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(q / 100 * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def make_bodies(installed: stand_ins.StandIns, seed: int) -> Dict[str, Callable]:
+    rng = random.Random(seed)
+    ads = list(installed.advertisements.rows.values())
+
+    return {
+        "/predict": lambda: rng.choice(ads),
+        "/simple_predict": lambda: {"id": rng.choice(ads)["item_id"]},
+        "/async_predict": lambda: {"id": rng.choice(ads)["item_id"]},
+    }
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient,
+    path: str,
+    make_body: Callable[[], Dict[str, Any]],
+    rate: float,
+    duration: float,
+    arrival: str,
+    seed: int,
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+
+    async def send(scheduled_at: float, body: Dict[str, Any]) -> None:
+        nonlocal errors
+        try:
+            response = await client.post(path, json=body)
+            if response.status_code >= 400:
+                errors += 1
+        except httpx.HTTPError:
+            errors += 1
+        latencies.append(time.perf_counter() - scheduled_at)
+
+    tasks = []
+    start = time.perf_counter()
+    scheduled_at = start
+
+    while scheduled_at - start < duration:
+        delay = scheduled_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(scheduled_at, make_body())))
+
+        if arrival == "poisson":
+            scheduled_at += rng.expovariate(rate)
+        else:
+            scheduled_at += 1 / rate
+
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    return {
+        "requests": len(tasks),
+        "errors": errors,
+        "error_rate": errors / len(tasks) if tasks else 0.0,
+        "throughput": (len(tasks) - errors) / elapsed,
+        "latency_ms": {
+            name: round(percentile(latencies, q) * 1000, 3)
+            for name, q in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))
+        },
+    }
+
+
+async def run_all(
+    client: httpx.AsyncClient,
+    installed: stand_ins.StandIns,
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    client.headers["Authorization"] = f"Bearer {stand_ins.make_token(installed)}"
+    bodies = make_bodies(installed, args.seed)
+
+    results = {}
+    for path in args.endpoints:
+        # Прогрев: загрузка модели в кэш процессора, первые попадания в кэш
+        await run_endpoint(
+            client, path, bodies[path], args.rate, args.warmup, args.arrival, args.seed
+        )
+        results[path] = await run_endpoint(
+            client,
+            path,
+            bodies[path],
+            args.rate,
+            args.duration,
+            args.arrival,
+            args.seed,
+        )
+    return results
+
+
+async def run_in_process(
+    installed: stand_ins.StandIns, args: argparse.Namespace
+) -> Dict[str, Any]:
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=args.timeout
+        ) as client:
+            return await run_all(client, installed, args)
+
+
+async def run_uvicorn(
+    installed: stand_ins.StandIns, args: argparse.Namespace
+) -> Dict[str, Any]:
+    import uvicorn
+
+    from app.main import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    try:
+        while not server.started:
+            await asyncio.sleep(0.05)
+
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}",
+            timeout=args.timeout,
+            limits=httpx.Limits(max_connections=args.connections),
+        ) as client:
+            return await run_all(client, installed, args)
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def main(args: argparse.Namespace) -> Dict[str, Any]:
+    # Логи запросов иначе перемешиваются с JSON-отчетом в stdout
+    os.environ["LOG_LEVEL"] = args.log_level
+
+    installed = stand_ins.install(
+        db_latency=args.db_latency,
+        redis_latency=args.redis_latency,
+        kafka_latency=args.kafka_latency,
+        advertisements=args.advertisements,
+    )
+    runner = run_uvicorn if args.mode == "uvicorn" else run_in_process
+    results = asyncio.run(runner(installed, args))
+
+    return {
+        "commit": git_commit(),
+        "mode": args.mode,
+        "rate": args.rate,
+        "duration": args.duration,
+        "arrival": args.arrival,
+        "stand_ins": {
+            "db_latency": args.db_latency,
+            "redis_latency": args.redis_latency,
+            "kafka_latency": args.kafka_latency,
+            "advertisements": args.advertisements,
+        },
+        "endpoints": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--rate", type=float, default=100, help="requests per second")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=1)
+    parser.add_argument("--arrival", choices=("constant", "poisson"), default="constant")
+    parser.add_argument("--timeout", type=float, default=5)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db-latency", type=float, default=0.001)
+    parser.add_argument("--redis-latency", type=float, default=0.0002)
+    parser.add_argument("--kafka-latency", type=float, default=0.002)
+    parser.add_argument("--advertisements", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", help="write JSON report to this file")
+    args = parser.parse_args()
+
+    report = json.dumps(main(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    print(report)
@@ -0,0 +1,123 @@
+"""
+Сравнение накладных расходов PrometheusMiddleware на пустом эндпоинте.
+
+Запуск:
+    python -m benchmarks.middleware_bench --requests 20000
+
+Запросы отправляются напрямую в ASGI-приложение, без сети и сервера,
+поэтому разница во времени — это стоимость самого middleware.
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.observability.metrics import REQUEST_DURATION_SECONDS, REQUESTS_TOTAL
+from app.observability.middleware import PrometheusMiddleware
+
+
+class LegacyPrometheusMiddleware(BaseHTTPMiddleware):
+    """Прежняя реализация на BaseHTTPMiddleware, оставлена для сравнения."""
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path == "/metrics":
+            return await call_next(request)
+
+        method = request.method
+        endpoint = request.url.path
+
+        start_time = time.time()
+        status_code = 500
+
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            duration = time.time() - start_time
+            REQUEST_DURATION_SECONDS.labels(method=method, endpoint=endpoint).observe(
+                duration
+            )
+            REQUESTS_TOTAL.labels(
+                method=method, endpoint=endpoint, status=status_code
+            ).inc()
+
+
+def build_app(middleware_class=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/empty")
+    async def empty():
+        return None
+
+    if middleware_class is not None:
+        app.add_middleware(middleware_class)
+
+    return app
+
+
+async def call(app, path: str = "/empty") -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 12345),
+        "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, n_requests: int) -> float:
+    for _ in range(min(n_requests, 500)):
+        await call(app)
+
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        await call(app)
+    return time.perf_counter() - start
+
+
+async def main(n_requests: int) -> None:
+    variants = {
+        "no_middleware": build_app(),
+        "base_http_middleware": build_app(LegacyPrometheusMiddleware),
+        "pure_asgi_middleware": build_app(PrometheusMiddleware),
+    }
+
+    baseline = None
+    for name, app in variants.items():
+        elapsed = await measure(app, n_requests)
+        per_request_us = elapsed / n_requests * 1e6
+        if baseline is None:
+            baseline = per_request_us
+        print(
+            f"{name:<22} {n_requests / elapsed:>10.0f} req/s "
+            f"{per_request_us:>8.1f} us/req "
+            f"(+{per_request_us - baseline:.1f} us)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests))
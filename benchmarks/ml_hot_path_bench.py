@@ -0,0 +1,94 @@
+"""
+Микробенчмарки CPU-затрат на запрос предикта.
+
+Запуск:
+    make bench-micro           # сравнение с baseline, падает при регрессии
+    make bench-micro-baseline  # сохранить новый baseline
+
+Покрывают MLService._prepare_features, ModelSingleton.predict, создание
+AdvertisementWithSeller из строки БД и JSON-кодирование значения в
+RedisClient туда и обратно. Каждый бенчмарк обрабатывает пачку из 1, 32
+и 1024 объявлений по одному, как это делает сервис.
+
+Baseline хранится в benchmarks/baselines, отдельно для каждой платформы
+и версии Python. Сравнивать имеет смысл прогоны на одной машине:
+после смены машины или CI-раннера baseline нужно пересохранить.
+"""
+
+import pytest
+
+from app.clients.redis import RedisClient
+from app.models.advertisement import AdvertisementWithSeller
+from app.repositories.model import model_client
+from app.services.ml_service import MLService
+from benchmarks.stand_ins import make_advertisements
+
+BATCH_SIZES = (1, 32, 1024)
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return list(make_advertisements(max(BATCH_SIZES)).values())
+
+
+@pytest.fixture(scope="module")
+def ads(rows):
+    return [AdvertisementWithSeller(**row) for row in rows]
+
+
+@pytest.fixture(scope="module")
+def ml_service():
+    model_client.initialize_model()
+    return MLService()
+
+
+@pytest.fixture(scope="module")
+def features(ml_service, ads):
+    return [ml_service._prepare_features(ad) for ad in ads]
+
+
+@pytest.fixture(scope="module")
+def predictions(ml_service, features):
+    return [
+        dict(zip(("is_violation", "probability"), model_client.predict(item)))
+        for item in features
+    ]
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_prepare_features(benchmark, ml_service, ads, batch_size):
+    benchmark.group = "prepare_features"
+    batch = ads[:batch_size]
+
+    benchmark(lambda: [ml_service._prepare_features(ad) for ad in batch])
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_model_predict(benchmark, features, batch_size):
+    benchmark.group = "model_predict"
+    batch = features[:batch_size]
+
+    benchmark(lambda: [model_client.predict(item) for item in batch])
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_advertisement_model(benchmark, rows, batch_size):
+    benchmark.group = "advertisement_model"
+    batch = rows[:batch_size]
+
+    benchmark(lambda: [AdvertisementWithSeller(**row) for row in batch])
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_redis_json_round_trip(benchmark, predictions, batch_size):
+    benchmark.group = "redis_json_round_trip"
+    batch = predictions[:batch_size]
+
+    def round_trip():
+        return [
+            RedisClient._deserialize(RedisClient._serialize(item).encode(), "get")
+            for item in batch
+        ]
+
+    assert round_trip() == batch
+    benchmark(round_trip)
@@ -0,0 +1,98 @@
+"""
+Стоимость скрейпа /metrics в multiprocess-режиме prometheus_client.
+
+Запуск:
+    python -m benchmarks.multiprocess_scrape_bench --workers 16
+
+Поднимает N процессов-воркеров, каждый из которых пишет HTTP-метрики
+по набору эндпоинтов в общую директорию, и замеряет время генерации
+ответа /metrics по сравнению с однопроцессным реестром.
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+ENDPOINTS = [
+    "/",
+    "/predict",
+    "/simple_predict",
+    "/async_predict",
+    "/moderation_result/{task_id}",
+    "/close",
+    "/auth/login",
+]
+STATUSES = [200, 401, 404, 422, 500]
+
+
+def fill_metrics(n_requests: int) -> None:
+    from app.observability.metrics import REQUEST_DURATION_SECONDS, REQUESTS_TOTAL
+
+    for i in range(n_requests):
+        endpoint = ENDPOINTS[i % len(ENDPOINTS)]
+        status = STATUSES[i % len(STATUSES)]
+        REQUEST_DURATION_SECONDS.labels(method="POST", endpoint=endpoint).observe(
+            (i % 100) / 1000
+        )
+        REQUESTS_TOTAL.labels(method="POST", endpoint=endpoint, status=status).inc()
+
+
+def worker(n_requests: int) -> None:
+    fill_metrics(n_requests)
+
+
+def measure(n_scrapes: int) -> float:
+    from app.observability.multiprocess import generate_metrics
+
+    generate_metrics()
+    start = time.perf_counter()
+    for _ in range(n_scrapes):
+        generate_metrics()
+    return (time.perf_counter() - start) / n_scrapes
+
+
+def main(n_workers: int, n_requests: int, n_scrapes: int) -> None:
+    with tempfile.TemporaryDirectory() as multiproc_dir:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = multiproc_dir
+
+        from app.observability.multiprocess import prepare_multiprocess_dir
+
+        prepare_multiprocess_dir()
+
+        ctx = multiprocessing.get_context("spawn")
+        processes = [
+            ctx.Process(target=worker, args=(n_requests,)) for _ in range(n_workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        scrape_time = measure(n_scrapes)
+        n_files = len(os.listdir(multiproc_dir))
+        print(
+            f"multiprocess ({n_workers} workers, {n_files} files): "
+            f"{scrape_time * 1000:.2f} ms/scrape"
+        )
+
+
+def main_single(n_requests: int, n_scrapes: int) -> None:
+    fill_metrics(n_requests)
+    scrape_time = measure(n_scrapes)
+    print(f"single process: {scrape_time * 1000:.2f} ms/scrape")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--scrapes", type=int, default=50)
+    parser.add_argument("--single", action="store_true")
+    args = parser.parse_args()
+
+    if args.single:
+        main_single(args.requests, args.scrapes)
+    else:
+        main(args.workers, args.requests, args.scrapes)
@@ -0,0 +1,133 @@
+"""
+Микробенчмарк сериализации ответов /predict и /simple_predict.
+
+Запуск:
+    python -m benchmarks.serialization_bench --iterations 50000
+
+Сравнивает прежний путь (PredictResponse + валидация response_model +
+сериализация) с ответом через prediction_response, а также время
+полного вызова эндпоинтов в процессе с замоканными сервисами.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import timeit
+
+from fastapi import FastAPI
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+from app.dependencies.auth import get_current_active_account
+from app.models.account import Account
+from app.models.response_predict import PredictResponse
+from app.routes import predict
+from app.routes.predict import prediction_response
+from app.services.ml_service import get_ml_service
+
+# /predict отдает результат модели, /simple_predict чаще всего — кэш из Redis
+PAYLOADS = {
+    "/predict": {"is_violation": True, "probability": 0.8512345},
+    "/simple_predict": {"is_violation": 1, "probability": 0.8512345},
+}
+
+AD_BODY = (
+    b'{"seller_id": 1, "is_verified_seller": true, "item_id": 1, "name": "Item",'
+    b' "description": "Description", "category": 5, "images_qty": 3}'
+)
+BODIES = {"/predict": AD_BODY, "/simple_predict": b'{"id": 1}'}
+
+predict_response_adapter = TypeAdapter(PredictResponse)
+
+
+def response_model_path(prediction: dict) -> Response:
+    value = predict_response_adapter.validate_python(PredictResponse(**prediction))
+    return Response(
+        content=predict_response_adapter.dump_json(value),
+        media_type="application/json",
+    )
+
+
+class FakeMLService:
+    def predict(self, ad):
+        return PAYLOADS["/predict"]
+
+    async def simple_predict(self, item_id):
+        return PAYLOADS["/simple_predict"]
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(predict.router)
+    app.dependency_overrides[get_ml_service] = FakeMLService
+    app.dependency_overrides[get_current_active_account] = lambda: Account(
+        id=1, login="bench", password="password"
+    )
+    return app
+
+
+async def call(app: FastAPI, path: str) -> None:
+    body = BODIES[path]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 12345),
+        "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure_endpoint(app: FastAPI, path: str, iterations: int) -> float:
+    for _ in range(min(iterations, 500)):
+        await call(app, path)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await call(app, path)
+    return (time.perf_counter() - start) / iterations
+
+
+def main(iterations: int) -> None:
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    for path, prediction in PAYLOADS.items():
+        for name, func in (
+            ("response_model", response_model_path),
+            ("prediction_response", prediction_response),
+        ):
+            elapsed = min(
+                timeit.repeat(lambda: func(prediction), number=iterations, repeat=3)
+            )
+            print(f"{path:<16} {name:<20} {elapsed / iterations * 1e6:>6.2f} us")
+
+    app = build_app()
+    for path in PAYLOADS:
+        elapsed = asyncio.run(measure_endpoint(app, path, iterations // 10))
+        print(f"{path:<16} {'endpoint':<20} {elapsed * 1e6:>6.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    main(args.iterations)
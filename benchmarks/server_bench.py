@@ -0,0 +1,178 @@
+"""
+Сравнение пропускной способности конфигураций лаунчера app.server.
+
+Запуск:
+    python -m benchmarks.server_bench --duration 10 --connections 64
+
+Для каждой конфигурации поднимается отдельный процесс сервера, после чего
+несколько процессов-клиентов шлют keep-alive GET / по сырым сокетам.
+Lifespan отключен, чтобы сервер стартовал без Kafka и Redis: меряется
+стоимость сервера, event loop и HTTP-парсера, а не внешних зависимостей.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+HOST = "127.0.0.1"
+
+CONFIGS = {
+    # То, что раньше запускал make run: один процесс, asyncio и h11
+    "make_run_baseline": {
+        "SERVER_MODE": "uvicorn",
+        "WEB_CONCURRENCY": "1",
+        "SERVER_LOOP": "asyncio",
+        "SERVER_HTTP": "h11",
+    },
+    "uvloop_httptools": {
+        "SERVER_MODE": "uvicorn",
+        "WEB_CONCURRENCY": "1",
+        "SERVER_LOOP": "uvloop",
+        "SERVER_HTTP": "httptools",
+    },
+    "uvicorn_workers": {
+        "SERVER_MODE": "uvicorn",
+        "SERVER_LOOP": "uvloop",
+        "SERVER_HTTP": "httptools",
+    },
+    "gunicorn_workers": {
+        "SERVER_MODE": "gunicorn",
+        "SERVER_LOOP": "uvloop",
+        "SERVER_HTTP": "httptools",
+    },
+}
+
+REQUEST = f"GET / HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode()
+
+
+async def read_response(reader: asyncio.StreamReader) -> None:
+    headers = await reader.readuntil(b"\r\n\r\n")
+    content_length = 0
+    for line in headers.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            content_length = int(line.split(b":", 1)[1])
+    await reader.readexactly(content_length)
+
+
+async def connection_loop(port: int, deadline: float) -> int:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    n_requests = 0
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(REQUEST)
+            await read_response(reader)
+            n_requests += 1
+    finally:
+        writer.close()
+    return n_requests
+
+
+async def client(port: int, connections: int, duration: float) -> int:
+    deadline = time.perf_counter() + duration
+    results = await asyncio.gather(
+        *(connection_loop(port, deadline) for _ in range(connections))
+    )
+    return sum(results)
+
+
+def client_process(port: int, connections: int, duration: float, queue) -> None:
+    queue.put(asyncio.run(client(port, connections, duration)))
+
+
+def wait_for_server(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((HOST, port), timeout=1) as sock:
+                sock.sendall(REQUEST)
+                if sock.recv(12).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"Server on port {port} did not start")
+
+
+def run_config(
+    env_overrides: dict,
+    port: int,
+    workers: int,
+    clients: int,
+    connections: int,
+    duration: float,
+    warmup: float,
+) -> float:
+    env = {
+        **os.environ,
+        "HOST": HOST,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+        "SERVER_ACCESS_LOG": "false",
+        "SERVER_LIFESPAN": "off",
+        "SERVER_PRELOAD_MODEL": "false",
+        **env_overrides,
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_server(port)
+        # Остальные воркеры могут еще импортировать приложение
+        time.sleep(warmup)
+
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        processes = [
+            ctx.Process(
+                target=client_process,
+                args=(port, connections // clients, duration, queue),
+            )
+            for _ in range(clients)
+        ]
+        for process in processes:
+            process.start()
+        total = sum(queue.get() for _ in processes)
+        for process in processes:
+            process.join()
+
+        return total / duration
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(args: argparse.Namespace) -> None:
+    for i, (name, env_overrides) in enumerate(CONFIGS.items()):
+        if args.only and name not in args.only:
+            continue
+        rps = run_config(
+            env_overrides,
+            port=args.port + i,
+            workers=args.workers,
+            clients=args.clients,
+            connections=args.connections,
+            duration=args.duration,
+            warmup=args.warmup,
+        )
+        print(f"{name:<20} {rps:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--port", type=int, default=18000)
+    parser.add_argument("--only", nargs="*")
+
+    main(parser.parse_args())
@@ -0,0 +1,506 @@
+"""
+Локальные заменители Postgres, Redis и Kafka для бенчмарков.
+
+Заменители подключаются на нижнем уровне, поэтому запрос проходит
+настоящие роуты, сервисы, репозитории, кэш и клиенты:
+- Redis: FakeRedis вместо redis.asyncio.Redis внутри RedisClient;
+- Kafka: InMemoryKafka вместо AIOKafkaProducer внутри KafkaProducer
+  и InMemoryConsumer вместо AIOKafkaConsumer внутри KafkaConsumer;
+- Postgres: in-memory storage вместо *PostgresStorage в репозиториях,
+  включая outbox, который разбирает настоящий OutboxRelay.
+
+У каждого заменителя есть задержка на поход (в секундах), чтобы
+имитировать сеть до настоящего сервиса.
+"""
+
+import asyncio
+import datetime
+import fnmatch
+import functools
+import itertools
+import os
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from aiokafka import ConsumerRecord
+from passlib.hash import md5_crypt
+
+from app.clients.kafka import kafka_consumer, kafka_producer
+from app.clients.redis import redis_client
+from app.errors import (
+    AccountNotFoundError,
+    AdvertisementNotFoundError,
+    ModerationTaskNotFoundError,
+)
+from app.models.account import Account
+from app.repositories.accounts import AccountRepository
+from app.repositories.advertisements import AdvertisementRepository
+from app.repositories.moderation import ModerationRepository
+from app.repositories.outbox import OutboxRepository
+from app.services import ml_service
+from app.services.auth_service import get_auth_service
+from app.services.moderation_service import get_moder_service
+from app.workers.outbox_relay import outbox_relay
+
+
+async def simulate_latency(latency: float) -> None:
+    # Даже при нулевой задержке отдаем управление, как настоящий сетевой вызов
+    await asyncio.sleep(latency)
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+        self._commands = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._commands.clear()
+
+    def get(self, key: str) -> "FakePipeline":
+        self._commands.append((self._redis._get, key))
+        return self
+
+    def ttl(self, key: str) -> "FakePipeline":
+        self._commands.append((self._redis._ttl, key))
+        return self
+
+    async def execute(self) -> List[Any]:
+        await simulate_latency(self._redis.latency)
+        return [command(key) for command, key in self._commands]
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self._channels: List[str] = []
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self._redis._subscribers[channel].add(self._messages)
+            self._channels.append(channel)
+
+    async def listen(self):
+        while True:
+            channel, data = await self._messages.get()
+            yield {"type": "message", "channel": channel, "data": data}
+
+    async def aclose(self) -> None:
+        for channel in self._channels:
+            self._redis._subscribers[channel].discard(self._messages)
+
+
+class FakeRedis:
+    """Подмножество redis.asyncio.Redis, которое использует RedisClient."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._values: Dict[str, bytes] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._subscribers: Dict[str, set] = defaultdict(set)
+
+    def _expire(self, key: str) -> None:
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._values.pop(key, None)
+            self._expires_at.pop(key, None)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        self._expire(key)
+        return self._values.get(key)
+
+    def _ttl(self, key: str) -> int:
+        self._expire(key)
+        if key not in self._values:
+            return -2
+        if key not in self._expires_at:
+            return -1
+        return int(self._expires_at[key] - time.monotonic())
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self) -> None:
+        pass
+
+    async def get(self, key: str) -> Optional[bytes]:
+        await simulate_latency(self.latency)
+        return self._get(key)
+
+    async def ttl(self, key: str) -> int:
+        await simulate_latency(self.latency)
+        return self._ttl(key)
+
+    async def setex(self, key: str, ttl: int, value: str) -> bool:
+        await simulate_latency(self.latency)
+        self._values[key] = value.encode("utf-8") if isinstance(value, str) else value
+        self._expires_at[key] = time.monotonic() + int(ttl)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        await simulate_latency(self.latency)
+        deleted = 0
+        for key in keys:
+            self._expires_at.pop(key, None)
+            deleted += self._values.pop(key, None) is not None
+        return deleted
+
+    async def scan(self, cursor: int, match: str = "*", count: int = 100):
+        await simulate_latency(self.latency)
+        return 0, [key for key in list(self._values) if fnmatch.fnmatch(key, match)]
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def publish(self, channel: str, value: str) -> int:
+        await simulate_latency(self.latency)
+        data = value.encode("utf-8") if isinstance(value, str) else value
+        for messages in self._subscribers[channel]:
+            messages.put_nowait((channel, data))
+        return len(self._subscribers[channel])
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> FakePubSub:
+        return FakePubSub(self)
+
+
+class InMemoryKafka:
+    """AIOKafkaProducer, который складывает сообщения в очереди по топикам."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.topics: Dict[str, asyncio.Queue] = defaultdict(asyncio.Queue)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, topic: str, value: bytes, key=None) -> asyncio.Future:
+        """Как у AIOKafkaProducer: подтверждение приходит через latency."""
+        await self.topics[topic].put(value)
+        delivery = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_later(
+            self.latency, delivery.set_result, None
+        )
+        return delivery
+
+    async def flush(self) -> None:
+        pass
+
+    def close(self, topic: str) -> None:
+        """После закрытия консьюмер топика завершит итерацию."""
+        self.topics[topic].put_nowait(None)
+
+
+class InMemoryConsumer:
+    """
+    AIOKafkaConsumer над очередью InMemoryKafka. Хранит закоммиченный
+    оффсет, чтобы бенчмарк мог считать отставание коммитов.
+    """
+
+    def __init__(self, kafka: InMemoryKafka, topic: str):
+        self._queue = kafka.topics[topic]
+        self._topic = topic
+        self._latency = kafka.latency
+        self.delivered = 0
+        self.committed = 0
+
+    async def stop(self) -> None:
+        pass
+
+    def __aiter__(self) -> "InMemoryConsumer":
+        return self
+
+    async def __anext__(self) -> ConsumerRecord:
+        value = await self._queue.get()
+        if value is None:
+            raise StopAsyncIteration
+
+        record = ConsumerRecord(
+            topic=self._topic,
+            partition=0,
+            offset=self.delivered,
+            timestamp=int(time.time() * 1000),
+            timestamp_type=0,
+            key=None,
+            value=value,
+            checksum=None,
+            serialized_key_size=-1,
+            serialized_value_size=len(value),
+            headers=[],
+        )
+        self.delivered += 1
+        return record
+
+    async def commit(self) -> None:
+        await simulate_latency(self._latency)
+        self.committed = self.delivered
+
+
+@dataclass
+class InMemoryAdvertisementStorage:
+    latency: float = 0.0
+    rows: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    async def select(self, id: int) -> Mapping[str, Any]:
+        await simulate_latency(self.latency)
+        if id not in self.rows:
+            raise AdvertisementNotFoundError()
+        return dict(self.rows[id])
+
+    async def select_many(self) -> Sequence[Mapping[str, Any]]:
+        await simulate_latency(self.latency)
+        return [dict(row) for row in self.rows.values()]
+
+    async def update(self, id: int, **updates: Any) -> Mapping[str, Any]:
+        await simulate_latency(self.latency)
+        if id not in self.rows:
+            raise AdvertisementNotFoundError()
+        self.rows[id].update(updates)
+        row = dict(self.rows[id])
+        row["id"] = row.pop("item_id")
+        return row
+
+
+@dataclass
+class InMemoryOutboxStorage:
+    latency: float = 0.0
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+    async def publish_batch(self, limit: int, publish) -> int:
+        await simulate_latency(self.latency)
+        batch = self.events[:limit]
+        if not batch:
+            return 0
+
+        await publish(batch)
+        del self.events[: len(batch)]
+        return len(batch)
+
+
+@dataclass
+class InMemoryModerationStorage:
+    latency: float = 0.0
+    rows: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    outbox: InMemoryOutboxStorage = field(default_factory=InMemoryOutboxStorage)
+    _ids: Any = field(default_factory=lambda: itertools.count(1))
+
+    async def create(
+        self, item_id: int, status: str, created_at: datetime.datetime
+    ) -> Mapping[str, Any]:
+        await simulate_latency(self.latency)
+        id = next(self._ids)
+        self.rows[id] = {
+            "id": id,
+            "item_id": item_id,
+            "status": status,
+            "is_violation": None,
+            "probability": None,
+            "error_message": None,
+            "created_at": created_at,
+            "processed_at": None,
+        }
+        return dict(self.rows[id])
+
+    async def get_or_create_completed(
+        self,
+        item_id: int,
+        created_at: datetime.datetime,
+        is_violation: bool,
+        probability: float,
+    ) -> Mapping[str, Any]:
+        for row in reversed(list(self.rows.values())):
+            if (
+                row["item_id"] == item_id
+                and row["status"] == "completed"
+                and row["is_violation"] == is_violation
+                and row["probability"] == probability
+            ):
+                await simulate_latency(self.latency)
+                return {**row, "created": False}
+
+        row = await self.create(item_id, "completed", created_at)
+        self.rows[row["id"]].update(
+            is_violation=is_violation,
+            probability=probability,
+            processed_at=created_at,
+        )
+        return {**self.rows[row["id"]], "created": True}
+
+    async def get_or_create_pending(
+        self, item_id: int, created_at: datetime.datetime, topic: str
+    ) -> Mapping[str, Any]:
+        for row in self.rows.values():
+            if row["item_id"] == item_id and row["status"] == "pending":
+                await simulate_latency(self.latency)
+                return {**row, "created": False}
+
+        row = await self.create(item_id, "pending", created_at)
+        self.outbox.events.append(
+            {
+                "topic": topic,
+                "key": str(item_id),
+                "payload": {
+                    "task_id": row["id"],
+                    "item_id": item_id,
+                    "timestamp": created_at.isoformat(),
+                },
+            }
+        )
+        return {**row, "created": True}
+
+    async def select(self, id: int) -> Mapping[str, Any]:
+        await simulate_latency(self.latency)
+        if id not in self.rows:
+            raise ModerationTaskNotFoundError()
+        return dict(self.rows[id])
+
+    async def select_many(self) -> Sequence[Mapping[str, Any]]:
+        await simulate_latency(self.latency)
+        return [dict(row) for row in self.rows.values()]
+
+    async def update(self, id: int, **updates: Any) -> Mapping[str, Any]:
+        await simulate_latency(self.latency)
+        if id not in self.rows:
+            raise ModerationTaskNotFoundError()
+        self.rows[id].update(updates)
+        return dict(self.rows[id])
+
+    async def update_if_pending(
+        self, id: int, **updates: Any
+    ) -> Optional[Mapping[str, Any]]:
+        await simulate_latency(self.latency)
+        if self.rows.get(id, {}).get("status") != "pending":
+            return None
+        self.rows[id].update(updates)
+        return dict(self.rows[id])
+
+    async def delete(self, id: int) -> Mapping[str, Any]:
+        await simulate_latency(self.latency)
+        if id not in self.rows:
+            raise ModerationTaskNotFoundError()
+        return self.rows.pop(id)
+
+    async def delete_by_item_id(self, item_id: int) -> Sequence[int]:
+        await simulate_latency(self.latency)
+        ids = [id for id, row in self.rows.items() if row["item_id"] == item_id]
+        for id in ids:
+            del self.rows[id]
+        return ids
+
+
+@dataclass
+class InMemoryAccountStorage:
+    latency: float = 0.0
+    rows: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    async def get_by_id(self, id: int) -> Mapping[str, Any]:
+        await simulate_latency(self.latency)
+        if id not in self.rows:
+            raise AccountNotFoundError(f"Account with id {id} not found")
+        return dict(self.rows[id])
+
+    async def get_by_login(self, login: str) -> Optional[Mapping[str, Any]]:
+        await simulate_latency(self.latency)
+        for row in self.rows.values():
+            if row["login"] == login:
+                return dict(row)
+        return None
+
+    async def get_by_login_and_password(
+        self, login: str, password: str
+    ) -> Optional[Mapping[str, Any]]:
+        account = await self.get_by_login(login)
+        if account and md5_crypt.verify(password, account["password"]):
+            return account
+        return None
+
+
+def make_advertisements(count: int, seed: int = 0) -> Dict[int, Dict[str, Any]]:
+    rng = random.Random(seed)
+    return {
+        item_id: {
+            "seller_id": rng.randint(1, 1000),
+            "is_verified_seller": rng.random() < 0.5,
+            "item_id": item_id,
+            "name": f"Item {item_id}",
+            "description": "x" * rng.randint(10, 2000),
+            "category": rng.randint(0, 100),
+            "images_qty": rng.randint(0, 10),
+            "is_closed": False,
+        }
+        for item_id in range(1, count + 1)
+    }
+
+
+@dataclass
+class StandIns:
+    redis: FakeRedis
+    kafka: InMemoryKafka
+    consumer: InMemoryConsumer
+    advertisements: InMemoryAdvertisementStorage
+    moderation: InMemoryModerationStorage
+    outbox: InMemoryOutboxStorage
+    accounts: InMemoryAccountStorage
+
+
+def install(
+    db_latency: float = 0.0,
+    redis_latency: float = 0.0,
+    kafka_latency: float = 0.0,
+    advertisements: int = 1000,
+) -> StandIns:
+    """Подменяет Postgres, Redis и Kafka в текущем процессе."""
+    kafka = InMemoryKafka(kafka_latency)
+    outbox = InMemoryOutboxStorage(db_latency)
+    stand_ins = StandIns(
+        redis=FakeRedis(redis_latency),
+        kafka=kafka,
+        consumer=InMemoryConsumer(kafka, os.getenv("MODERATION_TOPIC")),
+        advertisements=InMemoryAdvertisementStorage(
+            db_latency, make_advertisements(advertisements)
+        ),
+        moderation=InMemoryModerationStorage(db_latency, outbox=outbox),
+        outbox=outbox,
+        accounts=InMemoryAccountStorage(
+            db_latency,
+            {
+                1: {
+                    "id": 1,
+                    "login": "bench",
+                    "password": md5_crypt.hash("password"),
+                    "is_blocked": False,
+                }
+            },
+        ),
+    )
+
+    redis_client._client = stand_ins.redis
+    kafka_producer._producer = stand_ins.kafka
+    kafka_consumer.consumer = stand_ins.consumer
+
+    ad_repo = AdvertisementRepository(ad_postgres_storage=stand_ins.advertisements)
+    moder_repo = ModerationRepository(moderation_postgres_storage=stand_ins.moderation)
+
+    ml_service.AdvertisementRepository = functools.partial(
+        AdvertisementRepository, ad_postgres_storage=stand_ins.advertisements
+    )
+    moder_service = get_moder_service()
+    moder_service.ad_repo = ad_repo
+    moder_service.moder_repo = moder_repo
+    get_auth_service().account_repo = AccountRepository(storage=stand_ins.accounts)
+    outbox_relay.outbox_repo = OutboxRepository(outbox_storage=stand_ins.outbox)
+
+    return stand_ins
+
+
+def make_token(stand_ins: StandIns, account_id: int = 1) -> str:
+    account = Account(**stand_ins.accounts.rows[account_id])
+    return get_auth_service().create_access_token(account)
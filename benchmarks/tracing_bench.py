@@ -0,0 +1,146 @@
+"""
+Накладные расходы поэтапных спанов на /simple_predict.
+
+Запуск:
+    python -m benchmarks.tracing_bench --iterations 5000
+
+Запрос проходит через PrometheusMiddleware и настоящий MLService
+(промах кэша: redis.get, ml.features, ml.inference, redis.set),
+Redis и репозиторий объявлений заменены заглушками без задержки.
+Поэтому процент накладных расходов здесь завышен: в проде к времени
+запроса добавляются сетевые походы в Redis и Postgres.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+
+from app.dependencies.auth import get_current_active_account
+from app.models.account import Account
+from app.models.advertisement import AdvertisementWithSeller
+from app.observability import tracing
+from app.observability.middleware import PrometheusMiddleware
+from app.repositories import cache
+from app.repositories.model import model_client
+from app.routes import predict
+from app.services import ml_service
+from app.services.ml_service import MLService
+
+AD = AdvertisementWithSeller(
+    seller_id=1,
+    is_verified_seller=True,
+    item_id=1,
+    name="Item",
+    description="Description",
+    category=5,
+    images_qty=3,
+)
+
+
+class FakeRedis:
+    def make_key(self, prefix, id):
+        return f"{prefix}:{id}"
+
+    async def get(self, key):
+        return None
+
+    async def set(self, key, value):
+        pass
+
+
+class FakeAdvertisementRepository:
+    async def get(self, item_id):
+        return AD
+
+
+def build_app() -> FastAPI:
+    cache.redis_client = FakeRedis()
+    ml_service.AdvertisementRepository = FakeAdvertisementRepository
+    model_client.initialize_model()
+
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+    app.include_router(predict.router)
+    app.dependency_overrides[get_current_active_account] = lambda: Account(
+        id=1, login="bench", password="password"
+    )
+    return app
+
+
+async def call(app: FastAPI) -> None:
+    body = b'{"id": 1}'
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/simple_predict",
+        "raw_path": b"/simple_predict",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 12345),
+        "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await call(app)
+    return (time.perf_counter() - start) / iterations
+
+
+def measure_span(iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with tracing.Span("bench"):
+            pass
+    return (time.perf_counter() - start) / iterations
+
+
+def main(iterations: int, rounds: int) -> None:
+    logging.getLogger("app").setLevel(logging.WARNING)
+    app = build_app()
+    assert isinstance(predict.get_ml_service(), MLService)
+
+    asyncio.run(measure(app, min(iterations, 500)))
+
+    results = {True: [], False: []}
+    for _ in range(rounds):
+        for enabled in (False, True):
+            tracing._enabled = enabled
+            results[enabled].append(asyncio.run(measure(app, iterations)))
+
+    without_spans = min(results[False])
+    with_spans = min(results[True])
+    tracing._enabled = True
+
+    print(f"{'without spans':<16} {without_spans * 1e6:>8.2f} us/request")
+    print(f"{'with spans':<16} {with_spans * 1e6:>8.2f} us/request")
+    print(f"{'overhead':<16} {(with_spans / without_spans - 1) * 100:>8.2f} %")
+    print(f"{'one span':<16} {measure_span(iterations * 10) * 1e6:>8.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    main(args.iterations, args.rounds)
@@ -0,0 +1,140 @@
+"""
+Бенчмарк запросов UPDATE в хранилищах.
+
+Запуск:
+    python -m benchmarks.update_statement_bench --iterations 100000
+    python -m benchmarks.update_statement_bench --postgres --queries 200
+
+Без --postgres сравнивает построение текста запроса: прежнее
+(f-строка на каждый вызов) и update_statement с кэшем по набору полей.
+
+С --postgres (нужна БД из .env) измеряет на задаче, которой нет
+(id = -1, строки не меняются), запрос завершения задачи воркером:
+- Planning Time из EXPLAIN ANALYZE: запрос без подготовки планируется
+  на каждый вызов, подготовленный после прогрева использует общий план;
+- время запроса на новом соединении (как сейчас в get_pg_connection)
+  и на одном соединении, где запрос берется из кэша asyncpg.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import statistics
+import time
+import timeit
+from typing import Any, Dict, List
+
+from app.repositories.statements import update_statement
+
+UPDATES = {
+    "status": "completed",
+    "is_violation": True,
+    "probability": 0.9,
+    "processed_at": datetime.datetime(2026, 5, 10, 12),
+}
+PENDING_CONDITION = " AND status = 'pending'"
+MISSING_TASK_ID = -1
+
+
+def inline_update_statement(updates: Dict[str, Any]):
+    keys, args = [], []
+
+    for key, value in updates.items():
+        keys.append(key)
+        args.append(value)
+
+    fields_str = ", ".join([f"{key} = ${i + 2}" for i, key in enumerate(keys)])
+
+    query = f"""
+            UPDATE moderation_results
+            SET {fields_str}
+            WHERE id = $1::INTEGER AND status = 'pending'
+            RETURNING *
+        """
+    return query, args
+
+
+def bench_build(iterations: int) -> Dict[str, float]:
+    results = {}
+    for name, build in {
+        "inline": lambda: inline_update_statement(UPDATES),
+        "memoized": lambda: update_statement(
+            "moderation_results", UPDATES, condition=PENDING_CONDITION
+        ),
+    }.items():
+        seconds = min(timeit.repeat(build, number=iterations, repeat=5))
+        results[f"build_{name}_us"] = round(seconds / iterations * 1e6, 3)
+    return results
+
+
+def planning_ms(plan: str) -> float:
+    return json.loads(plan)[0]["Planning Time"]
+
+
+async def bench_postgres(queries: int) -> Dict[str, float]:
+    from app.clients.postgres import get_pg_connection
+
+    query, args = update_statement(
+        "moderation_results", UPDATES, condition=PENDING_CONDITION
+    )
+    results = {}
+
+    async with get_pg_connection() as connection:
+        unprepared: List[float] = []
+        for _ in range(queries):
+            plan = await connection.fetchval(
+                f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", MISSING_TASK_ID, *args
+            )
+            unprepared.append(planning_ms(plan))
+
+        await connection.execute(f"PREPARE finish_task AS {query}")
+        params = ", ".join(f"${i + 1}" for i in range(len(args) + 1))
+        explain_execute = (
+            f"EXPLAIN (ANALYZE, FORMAT JSON) EXECUTE finish_task({params})"
+        )
+        prepared: List[float] = []
+        for _ in range(queries):
+            plan = await connection.fetchval(explain_execute, MISSING_TASK_ID, *args)
+            prepared.append(planning_ms(plan))
+        await connection.execute("DEALLOCATE finish_task")
+
+    # Первые выполнения подготовленного запроса планируются заново,
+    # общий план появляется после прогрева
+    results["planning_unprepared_ms"] = round(statistics.median(unprepared), 4)
+    results["planning_prepared_ms"] = round(statistics.median(prepared[10:]), 4)
+
+    start = time.perf_counter()
+    for _ in range(queries):
+        async with get_pg_connection() as connection:
+            await connection.fetchrow(query, MISSING_TASK_ID, *args)
+    results["query_new_connection_ms"] = round(
+        (time.perf_counter() - start) / queries * 1e3, 3
+    )
+
+    async with get_pg_connection() as connection:
+        start = time.perf_counter()
+        for _ in range(queries):
+            await connection.fetchrow(query, MISSING_TASK_ID, *args)
+        results["query_cached_statement_ms"] = round(
+            (time.perf_counter() - start) / queries * 1e3, 3
+        )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--postgres", action="store_true")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    results = bench_build(args.iterations)
+    if args.postgres:
+        results.update(asyncio.run(bench_postgres(args.queries)))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
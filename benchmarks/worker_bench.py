@@ -0,0 +1,157 @@
+"""
+Пропускная способность ModerationWorker на in-memory топике.
+
+Запуск:
+    python -m benchmarks.worker_bench --events 2000 --db-latency 0.002
+    python -m benchmarks.worker_bench --events 500 --rate 100 --processing-delay 0.01
+
+События публикуются настоящим KafkaProducer.send_moderation_request
+в InMemoryKafka, а ModerationWorker.run() читает их через InMemoryConsumer
+и проходит настоящий путь: предикт с кэшем, обновление задачи, коммит.
+Postgres и Redis заменены заменителями из benchmarks.stand_ins.
+
+--rate 0 публикует все события сразу (разбор накопленного бэклога),
+иначе события идут с заданной частотой. --replay доставляет каждое
+событие второй раз, как после рестарта воркера до коммита. --processing-delay задает
+паузу воркера после предикта (WORKER_PROCESSING_DELAY, в проде 10 секунд).
+
+Отчет в JSON:
+- messages_per_second: обработанные события в секунду;
+- commit_lag: сколько опубликованных событий еще не закоммичено
+  (замеры раз в --sample-interval секунд);
+- task_latency_ms: от создания задачи до processed_at.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List
+
+from app.clients.kafka import kafka_producer
+from app.workers.moderation_worker import ModerationWorker
+from benchmarks import stand_ins
+from benchmarks.load_bench import git_commit, percentile
+
+
+async def publish(
+    installed: stand_ins.StandIns, events: int, rate: float, replay: bool
+) -> None:
+    item_ids = list(installed.advertisements.rows)
+    published = []
+    start = time.perf_counter()
+
+    for i in range(events):
+        if rate > 0:
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        item_id = item_ids[i % len(item_ids)]
+        created_at = datetime.datetime.now()
+        task = await installed.moderation.create(item_id, "pending", created_at)
+        await kafka_producer.send_moderation_request(task["id"], item_id, created_at)
+        published.append((task["id"], item_id, created_at))
+
+    # Повторная доставка тех же событий, как после рестарта воркера
+    if replay:
+        for task_id, item_id, created_at in published:
+            await kafka_producer.send_moderation_request(task_id, item_id, created_at)
+
+    installed.kafka.close(os.getenv("MODERATION_TOPIC"))
+
+
+async def sample_commit_lag(
+    installed: stand_ins.StandIns, interval: float, samples: List[int]
+) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        queued = installed.kafka.topics[os.getenv("MODERATION_TOPIC")].qsize()
+        consumer = installed.consumer
+        samples.append(queued + consumer.delivered - consumer.committed)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    installed = stand_ins.install(
+        db_latency=args.db_latency,
+        redis_latency=args.redis_latency,
+        kafka_latency=args.kafka_latency,
+        advertisements=args.advertisements,
+    )
+    worker = ModerationWorker()
+    worker.processing_delay = args.processing_delay
+
+    lag_samples: List[int] = []
+    sampler = asyncio.create_task(
+        sample_commit_lag(installed, args.sample_interval, lag_samples)
+    )
+
+    start = time.perf_counter()
+    await asyncio.gather(publish(installed, args.events, args.rate, args.replay), worker.run())
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+
+    rows = installed.moderation.rows.values()
+    latencies = sorted(
+        (row["processed_at"] - row["created_at"]).total_seconds()
+        for row in rows
+        if row["processed_at"] is not None
+    )
+    statuses: Dict[str, int] = {}
+    for row in rows:
+        statuses[row["status"]] = statuses.get(row["status"], 0) + 1
+
+    return {
+        "commit": git_commit(),
+        "events": args.events,
+        "rate": args.rate,
+        "replay": args.replay,
+        "stand_ins": {
+            "db_latency": args.db_latency,
+            "redis_latency": args.redis_latency,
+            "kafka_latency": args.kafka_latency,
+            "processing_delay": args.processing_delay,
+            "advertisements": args.advertisements,
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "messages_per_second": installed.consumer.committed / elapsed,
+        "statuses": statuses,
+        "commit_lag": {
+            "mean": sum(lag_samples) / len(lag_samples) if lag_samples else 0,
+            "max": max(lag_samples, default=0),
+        },
+        "task_latency_ms": {
+            name: round(percentile(latencies, q) * 1000, 3)
+            for name, q in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=0, help="events per second")
+    parser.add_argument("--processing-delay", type=float, default=0)
+    parser.add_argument(
+        "--replay", action="store_true", help="deliver every event a second time"
+    )
+    parser.add_argument("--db-latency", type=float, default=0.001)
+    parser.add_argument("--redis-latency", type=float, default=0.0002)
+    parser.add_argument("--kafka-latency", type=float, default=0.002)
+    parser.add_argument("--advertisements", type=int, default=1000)
+    parser.add_argument("--sample-interval", type=float, default=0.05)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", help="write JSON report to this file")
+    args = parser.parse_args()
+
+    os.environ["LOG_LEVEL"] = args.log_level
+    logging.getLogger().setLevel(args.log_level)
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    print(report)
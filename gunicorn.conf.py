@@ -0,0 +1,46 @@
+"""
+Конфиг gunicorn для запуска сервиса в несколько uvicorn-воркеров.
+
+Запуск:
+    make run-workers
+
+Параметры берутся из тех же переменных окружения, что и у app.server.
+
+Метрики собираются в multiprocess-режиме prometheus_client: директория
+PROMETHEUS_MULTIPROC_DIR выставляется здесь, до импорта приложения,
+и очищается от файлов прошлого запуска при старте мастера.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "backend_avito_prometheus"),
+)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from app.observability.multiprocess import (  # noqa: E402
+    mark_worker_dead,
+    prepare_multiprocess_dir,
+)
+from app.server import ServerSettings, preload_model  # noqa: E402
+
+settings = ServerSettings.from_env()
+
+bind = f"{settings.host}:{settings.port}"
+workers = settings.workers
+worker_class = "app.server.UvicornWorker"
+keepalive = settings.keepalive
+backlog = settings.backlog
+preload_app = settings.preload_model
+
+
+def on_starting(server):
+    prepare_multiprocess_dir()
+    if settings.preload_model:
+        preload_model()
+
+
+def child_exit(server, worker):
+    mark_worker_dead(worker.pid)
@@ -0,0 +1,22 @@
+-- +goose Up
+-- Оставляет одну pending-задачу на объявление, чтобы следующая миграция
+-- смогла построить уникальный индекс moderation_results_pending_item_id_key
+-- +goose StatementBegin
+UPDATE moderation_results AS duplicate
+SET status = 'failed',
+    error_message = 'Superseded by an earlier pending task',
+    processed_at = CURRENT_TIMESTAMP
+WHERE duplicate.status = 'pending'
+  AND EXISTS (
+      SELECT 1
+      FROM moderation_results AS earlier
+      WHERE earlier.item_id = duplicate.item_id
+        AND earlier.status = 'pending'
+        AND earlier.id < duplicate.id
+  );
+-- +goose StatementEnd
+
+-- +goose Down
+-- +goose StatementBegin
+SELECT 'down SQL query';
+-- +goose StatementEnd
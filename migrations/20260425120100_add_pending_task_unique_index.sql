@@ -0,0 +1,15 @@
+-- +goose NO TRANSACTION
+-- +goose Up
+-- Если между миграциями появились новые дубли, построение упадет и оставит
+-- индекс в состоянии INVALID: его нужно удалить и повторить миграцию
+-- после 20260425120000_fail_duplicate_pending_tasks
+-- +goose StatementBegin
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS moderation_results_pending_item_id_key
+ON moderation_results (item_id)
+WHERE status = 'pending';
+-- +goose StatementEnd
+
+-- +goose Down
+-- +goose StatementBegin
+DROP INDEX CONCURRENTLY IF EXISTS moderation_results_pending_item_id_key;
+-- +goose StatementEnd
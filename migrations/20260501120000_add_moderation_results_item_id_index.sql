@@ -0,0 +1,11 @@
+-- +goose NO TRANSACTION
+-- +goose Up
+-- +goose StatementBegin
+CREATE INDEX CONCURRENTLY IF NOT EXISTS moderation_results_item_id_idx
+ON moderation_results (item_id);
+-- +goose StatementEnd
+
+-- +goose Down
+-- +goose StatementBegin
+DROP INDEX CONCURRENTLY IF EXISTS moderation_results_item_id_idx;
+-- +goose StatementEnd
@@ -0,0 +1,11 @@
+-- +goose NO TRANSACTION
+-- +goose Up
+-- +goose StatementBegin
+CREATE INDEX CONCURRENTLY IF NOT EXISTS advertisements_seller_id_idx
+ON advertisements (seller_id);
+-- +goose StatementEnd
+
+-- +goose Down
+-- +goose StatementBegin
+DROP INDEX CONCURRENTLY IF EXISTS advertisements_seller_id_idx;
+-- +goose StatementEnd
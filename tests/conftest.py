@@ -3,7 +3,7 @@ from unittest.mock import AsyncMock, Mock
 
 import pytest
 
-from app.dependencies.auth import get_current_active_account
+from app.dependencies.auth import get_current_account, get_current_active_account
 from app.main import app
 from app.models.account import Account
 
@@ -21,6 +21,7 @@ def mock_redis_for_unit_tests(request):
         with pytest.MonkeyPatch.context() as mp:
             mock_redis = Mock()
             mock_redis.get = AsyncMock()
+            mock_redis.get_with_ttl = AsyncMock(return_value=(None, -2))
             mock_redis.set = AsyncMock()
             mock_redis.delete = AsyncMock()
             mock_redis.delete_pattern = AsyncMock()
@@ -50,3 +51,11 @@ def auth_override(test_account):
     app.dependency_overrides[get_current_active_account] = lambda: test_account
     yield
     app.dependency_overrides.pop(get_current_active_account, None)
+
+
+@pytest.fixture
+def admin_override():
+    account = Account(id=1, login="admin", password="hashed", is_admin=True)
+    app.dependency_overrides[get_current_account] = lambda: account
+    yield
+    app.dependency_overrides.pop(get_current_account, None)
@@ -2,9 +2,17 @@ from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from prometheus_client import REGISTRY
 
+from app.errors import AdvertisementNotFoundError, ErrorInPrediction
 from app.models.advertisement import AdvertisementWithSeller
-from app.repositories.cache import CacheRepository, PredictionCacheStorage
+from app.models.moderation import ModerationResult
+from app.repositories.cache import (
+    CacheRepository,
+    LocalTTLCache,
+    ModerationResultCacheStorage,
+    PredictionCacheStorage,
+)
 from app.services.ml_service import MLService
 
 
@@ -12,13 +20,22 @@ from app.services.ml_service import MLService
 def mock_redis_client():
     with patch("app.repositories.cache.redis_client") as mock:
         mock.get = AsyncMock()
+        mock.get_with_ttl = AsyncMock()
         mock.set = AsyncMock()
         mock.delete = AsyncMock()
+        mock.delete_many = AsyncMock()
         mock.delete_pattern = AsyncMock()
         mock.make_key = MagicMock(side_effect=lambda prefix, id: f"{prefix}:{id}")
         yield mock
 
 
+def get_cache_requests(result: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "cache_requests_total", {"cache": "predict", "result": result}
+    )
+    return value or 0.0
+
+
 @pytest.fixture
 def cache_storage(mock_redis_client):
     with patch("app.repositories.cache.redis_client", mock_redis_client):
@@ -58,22 +75,45 @@ class TestCacheStorageUnit:
     async def test_get_prediction_cache_hit(self, cache_storage, mock_redis_client):
         item_id = 123
         expected_result = {"is_violation": 1, "probability": 0.85}
-        mock_redis_client.get.return_value = expected_result
+        mock_redis_client.get_with_ttl.return_value = (expected_result, 1800)
+        hits = get_cache_requests("hit")
+        ttl_count = REGISTRY.get_sample_value(
+            "cache_hit_ttl_remaining_seconds_count", {"cache": "predict"}
+        ) or 0.0
 
         result = await cache_storage.get_prediction(item_id)
 
         assert result == expected_result
-        mock_redis_client.get.assert_called_once_with(f"predict:{item_id}")
+        mock_redis_client.get_with_ttl.assert_called_once_with(f"predict:{item_id}")
+        assert get_cache_requests("hit") == hits + 1
+        assert (
+            REGISTRY.get_sample_value(
+                "cache_hit_ttl_remaining_seconds_count", {"cache": "predict"}
+            )
+            == ttl_count + 1
+        )
 
     @pytest.mark.asyncio
     async def test_get_prediction_cache_miss(self, cache_storage, mock_redis_client):
         item_id = 123
-        mock_redis_client.get.return_value = None
+        mock_redis_client.get_with_ttl.return_value = (None, -2)
+        misses = get_cache_requests("miss")
 
         result = await cache_storage.get_prediction(item_id)
 
         assert result is None
-        mock_redis_client.get.assert_called_once_with(f"predict:{item_id}")
+        mock_redis_client.get_with_ttl.assert_called_once_with(f"predict:{item_id}")
+        assert get_cache_requests("miss") == misses + 1
+
+    @pytest.mark.asyncio
+    async def test_get_prediction_stale_entry(self, cache_storage, mock_redis_client):
+        mock_redis_client.get_with_ttl.return_value = (b"0.85", 100)
+        stale = get_cache_requests("stale")
+
+        result = await cache_storage.get_prediction(123)
+
+        assert result is None
+        assert get_cache_requests("stale") == stale + 1
 
     @pytest.mark.asyncio
     async def test_set_prediction(self, cache_storage, mock_redis_client):
@@ -94,6 +134,91 @@ class TestCacheStorageUnit:
 
         mock_redis_client.delete.assert_called_once_with(f"predict:{item_id}")
 
+    @pytest.mark.asyncio
+    async def test_delete_predictions(self, cache_storage, mock_redis_client):
+        await cache_storage.delete_predictions([1, 2])
+
+        mock_redis_client.delete_many.assert_called_once_with(
+            ["predict:1", "predict:2"]
+        )
+
+
+class TestModerationResultCacheStorage:
+    COMPLETED = ModerationResult(
+        task_id=1, status="completed", is_violation=True, probability=0.9
+    )
+
+    @pytest.fixture
+    def result_storage(self, mock_redis_client):
+        return ModerationResultCacheStorage(
+            local_cache=LocalTTLCache(maxsize=10, ttl=60)
+        )
+
+    @pytest.mark.asyncio
+    async def test_set_writes_both_tiers(self, result_storage, mock_redis_client):
+        await result_storage.set_moderation_result(self.COMPLETED)
+
+        assert await result_storage.get_moderation_result(1) == self.COMPLETED
+        mock_redis_client.set.assert_called_once_with(
+            "moderation_result:1", self.COMPLETED.model_dump(), ttl=86400
+        )
+        mock_redis_client.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_pending_result_is_not_cached(
+        self, result_storage, mock_redis_client
+    ):
+        await result_storage.set_moderation_result(
+            ModerationResult(task_id=1, status="pending")
+        )
+
+        mock_redis_client.set.assert_not_called()
+        assert result_storage.local_cache.get(1) is None
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_fills_local_tier(self, result_storage, mock_redis_client):
+        mock_redis_client.get.return_value = self.COMPLETED.model_dump()
+
+        assert await result_storage.get_moderation_result(1) == self.COMPLETED
+        assert await result_storage.get_moderation_result(1) == self.COMPLETED
+        mock_redis_client.get.assert_called_once_with("moderation_result:1")
+
+    @pytest.mark.asyncio
+    async def test_pending_entry_in_redis_is_ignored(
+        self, result_storage, mock_redis_client
+    ):
+        mock_redis_client.get.return_value = {"task_id": 1, "status": "pending"}
+
+        assert await result_storage.get_moderation_result(1) is None
+
+    @pytest.mark.asyncio
+    async def test_delete_clears_both_tiers(self, result_storage, mock_redis_client):
+        await result_storage.set_moderation_result(self.COMPLETED)
+        mock_redis_client.get.return_value = None
+
+        await result_storage.delete_moderation_result(1)
+
+        assert await result_storage.get_moderation_result(1) is None
+        mock_redis_client.delete.assert_called_once_with("moderation_result:1")
+
+
+class TestLocalTTLCache:
+    def test_evicts_oldest_entry(self):
+        cache = LocalTTLCache(maxsize=2, ttl=60)
+        cache.set(1, "a")
+        cache.set(2, "b")
+        cache.set(3, "c")
+
+        assert cache.get(1) is None
+        assert (cache.get(2), cache.get(3)) == ("b", "c")
+
+    def test_entry_expires(self):
+        cache = LocalTTLCache(maxsize=2, ttl=60)
+        cache.set(1, "a")
+
+        with patch("app.repositories.cache.time.monotonic", return_value=1e12):
+            assert cache.get(1) is None
+
 
 class TestCacheRepository:
     @pytest.mark.asyncio
@@ -182,6 +307,23 @@ class TestMLServiceWithCache:
             )
             mock_ad_repo.get.assert_called_once_with(item_id)
 
+    @pytest.mark.asyncio
+    async def test_simple_predict_does_not_cache_not_found(self, ml_service):
+        item_id = 123
+        ml_service.cache_repo.get_prediction.return_value = None
+
+        with patch(
+            "app.services.ml_service.AdvertisementRepository"
+        ) as mock_ad_repo_class:
+            mock_ad_repo = AsyncMock()
+            mock_ad_repo.get.side_effect = AdvertisementNotFoundError("not found")
+            mock_ad_repo_class.return_value = mock_ad_repo
+
+            with pytest.raises(ErrorInPrediction):
+                await ml_service.simple_predict(item_id)
+
+        ml_service.cache_repo.set_prediction.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_invalidate_cache(self, ml_service):
         item_id = 123
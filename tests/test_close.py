@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -91,11 +91,7 @@ class TestCloseServiceUnit:
         close_service.ad_repo.get.return_value = sample_ad
         close_service.ad_repo.close.return_value = closed_ad
 
-        close_service.moder_repo.get_many.return_value = [
-            MagicMock(id=1, item_id=item_id),
-            MagicMock(id=2, item_id=item_id),
-            MagicMock(id=3, item_id=456),
-        ]
+        close_service.moder_repo.delete_by_item_id.return_value = [1, 2]
 
         result = await close_service.close_advertisement(item_id)
 
@@ -105,9 +101,11 @@ class TestCloseServiceUnit:
         close_service.ad_repo.get.assert_called_once_with(item_id)
         close_service.ad_repo.close.assert_called_once_with(item_id)
 
-        assert close_service.moder_repo.delete.call_count == 2
-        close_service.moder_repo.delete.assert_any_call(1)
-        close_service.moder_repo.delete.assert_any_call(2)
+        close_service.moder_repo.delete_by_item_id.assert_called_once_with(item_id)
+        close_service.moder_repo.get_many.assert_not_called()
+        close_service.cache_repo.delete_moderation_results.assert_called_once_with(
+            [1, 2]
+        )
 
         close_service.cache_repo.delete_prediction.assert_called_once_with(item_id)
 
@@ -120,7 +118,7 @@ class TestCloseServiceUnit:
             await close_service.close_advertisement(item_id)
 
         close_service.ad_repo.close.assert_not_called()
-        close_service.moder_repo.delete.assert_not_called()
+        close_service.moder_repo.delete_by_item_id.assert_not_called()
         close_service.cache_repo.delete_prediction.assert_not_called()
 
     @pytest.mark.asyncio
@@ -133,12 +131,12 @@ class TestCloseServiceUnit:
 
         close_service.ad_repo.get.return_value = sample_ad
         close_service.ad_repo.close.return_value = closed_ad
-        close_service.moder_repo.get_many.return_value = []
+        close_service.moder_repo.delete_by_item_id.return_value = []
 
         result = await close_service.close_advertisement(item_id)
 
         assert result.is_closed == True
-        close_service.moder_repo.delete.assert_not_called()
+        close_service.cache_repo.delete_moderation_results.assert_called_once_with([])
         close_service.cache_repo.delete_prediction.assert_called_once_with(item_id)
 
     @pytest.mark.asyncio
@@ -151,17 +149,28 @@ class TestCloseServiceUnit:
 
         close_service.ad_repo.get.return_value = sample_ad
         close_service.ad_repo.close.return_value = closed_ad
-        close_service.moder_repo.get_many.return_value = [
-            MagicMock(id=1, item_id=item_id),
-        ]
-        close_service.moder_repo.delete.side_effect = Exception("DB Error")
+        close_service.moder_repo.delete_by_item_id.side_effect = Exception("DB Error")
 
         result = await close_service.close_advertisement(item_id)
 
         assert result.is_closed == True
-        close_service.moder_repo.delete.assert_called_once_with(1)
         close_service.cache_repo.delete_prediction.assert_called_once_with(item_id)
 
+    @pytest.mark.asyncio
+    async def test_close_advertisements(self, close_service, sample_ad):
+        closed_ad = sample_ad.model_copy(update={"is_closed": True})
+        close_service.ad_repo.close_many.return_value = [(closed_ad, [7, 8])]
+
+        result = await close_service.close_advertisements([123, 999, 123])
+
+        close_service.ad_repo.close_many.assert_called_once_with([123, 999])
+        assert result.closed == [closed_ad]
+        assert result.not_found == [999]
+        close_service.cache_repo.delete_predictions.assert_called_once_with([123])
+        close_service.cache_repo.delete_moderation_results.assert_called_once_with(
+            [7, 8]
+        )
+
 
 @pytest.mark.integration
 class TestCloseIntegration:
@@ -184,8 +193,9 @@ class TestCloseIntegration:
         assert ad_before.is_closed == False
         assert ad_before.item_id == test_item_id
 
-        moderations = await moder_repo.get_many()
-        moder_for_item = [m for m in moderations if m.item_id == test_item_id]
+        moder_for_item = [
+            m async for m in moder_repo.iterate_many() if m.item_id == test_item_id
+        ]
         assert len(moder_for_item) > 0
 
         result = await service.close_advertisement(test_item_id)
@@ -196,12 +206,33 @@ class TestCloseIntegration:
         ad_after = await ad_repo.get(test_item_id)
         assert ad_after.is_closed == True
 
-        moderations_after = await moder_repo.get_many()
         moder_for_item_after = [
-            m for m in moderations_after if m.item_id == test_item_id
+            m async for m in moder_repo.iterate_many() if m.item_id == test_item_id
         ]
         assert len(moder_for_item_after) == 0
 
         cached = await cache_repo.get_prediction(test_item_id)
         assert cached is None
         await teardown_database()
+
+    @pytest.mark.asyncio
+    async def test_close_advertisements_in_one_transaction(self):
+        from app.repositories.advertisements import AdvertisementRepository
+
+        await setup_database()
+        ad_repo = AdvertisementRepository()
+
+        closed = await ad_repo.close_many([1001, 1002, 9999])
+
+        assert [(ad.id, ad.is_closed) for ad, _ in closed] == [
+            (1001, True),
+            (1002, True),
+        ]
+        assert all(len(task_ids) == 1 for _, task_ids in closed)
+        async with get_pg_connection() as conn:
+            remaining = await conn.fetchval(
+                "SELECT COUNT(*) FROM moderation_results "
+                "WHERE item_id IN (1001, 1002)"
+            )
+        assert remaining == 0
+        await teardown_database()
@@ -5,7 +5,7 @@ from fastapi.testclient import TestClient
 
 from app.errors import AdvertisementNotFoundError
 from app.main import app
-from app.models.advertisement import Advertisement
+from app.models.advertisement import Advertisement, ClosedAdvertisements
 from app.services.close_service import close_service_client
 
 
@@ -28,6 +28,27 @@ def sample_ad():
 
 
 class TestCloseAPI:
+    def test_close_advertisements(self, client, sample_ad, auth_override):
+        with patch.object(
+            close_service_client, "close_advertisements", new_callable=AsyncMock
+        ) as mock_close:
+            mock_close.return_value = ClosedAdvertisements(
+                closed=[sample_ad], not_found=[456]
+            )
+
+            response = client.post("/close_many", json={"ids": [123, 456]})
+
+            assert response.status_code == 200
+            data = response.json()
+            assert [ad["id"] for ad in data["closed"]] == [123]
+            assert data["not_found"] == [456]
+            mock_close.assert_called_once_with([123, 456])
+
+    def test_close_advertisements_empty(self, client, auth_override):
+        response = client.post("/close_many", json={"ids": []})
+
+        assert response.status_code == 422
+
     def test_close_advertisement_success(self, client, sample_ad, auth_override):
         with patch.object(
             close_service_client, "close_advertisement", new_callable=AsyncMock
@@ -0,0 +1,214 @@
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.errors import InvalidIngestionRecordError
+from app.main import app
+from app.models.advertisement import AdvertisementWithSeller
+from app.models.seller import Seller
+from app.repositories.model import model_client
+from app.services.ingestion_service import (
+    get_ingestion_service,
+    parse_ndjson,
+    validated_chunks,
+)
+from app.services.ml_service import get_ml_service
+
+
+def make_ad(item_id: int, is_closed: bool = False) -> AdvertisementWithSeller:
+    return AdvertisementWithSeller(
+        seller_id=1,
+        is_verified_seller=item_id % 2 == 0,
+        item_id=item_id,
+        name="Item",
+        description="Description" * item_id,
+        category=item_id,
+        images_qty=item_id % 10,
+        is_closed=is_closed,
+    )
+
+
+def ad_record(item_id: int) -> dict:
+    return {
+        "seller_id": 1,
+        "id": item_id,
+        "name": "Item",
+        "description": "Description",
+        "category": 5,
+        "images_qty": 3,
+    }
+
+
+async def stream(*items):
+    for item in items:
+        yield item
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+@pytest.fixture
+def ingestion_service(monkeypatch):
+    service = get_ingestion_service()
+    monkeypatch.setattr(service, "seller_repo", AsyncMock())
+    monkeypatch.setattr(service, "ad_repo", AsyncMock())
+    monkeypatch.setattr(service, "cache_repo", AsyncMock())
+    monkeypatch.setattr(service, "ml_service", Mock())
+    service.seller_repo.bulk_upsert.side_effect = lambda sellers: len(sellers)
+    service.ad_repo.bulk_upsert.side_effect = lambda ads: len(ads)
+    return service
+
+
+class TestParsing:
+    @pytest.mark.asyncio
+    async def test_lines_split_across_chunks(self):
+        records = await collect(
+            parse_ndjson(stream(b'{"id": 1}\n{"i', b'd": 2}\n\n', b'{"id": 3}'))
+        )
+
+        assert records == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_reports_line(self):
+        with pytest.raises(InvalidIngestionRecordError, match="Line 2"):
+            await collect(parse_ndjson(stream(b'{"id": 1}\n{oops}\n')))
+
+    @pytest.mark.asyncio
+    async def test_chunks_keep_last_duplicate(self):
+        records = [
+            {"id": 1, "is_verified": False},
+            {"id": 2, "is_verified": False},
+            {"id": 1, "is_verified": True},
+            {"id": 3, "is_verified": True},
+        ]
+
+        chunks = await collect(validated_chunks(stream(*records), Seller, 3))
+
+        assert chunks == [
+            [
+                Seller(id=1, is_verified=True),
+                Seller(id=2, is_verified=False),
+                Seller(id=3, is_verified=True),
+            ]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_record(self):
+        records = stream({"id": 1, "is_verified": True}, {"id": -1})
+
+        with pytest.raises(InvalidIngestionRecordError, match="Record 2"):
+            await collect(validated_chunks(records, Seller, 10))
+
+
+class TestIngestionService:
+    @pytest.mark.asyncio
+    async def test_ingest_sellers(self, ingestion_service):
+        records = stream(*({"id": id, "is_verified": True} for id in range(5)))
+
+        result = await ingestion_service.ingest_sellers(records, chunk_size=2)
+
+        assert (result.rows, result.chunks) == (5, 3)
+        assert ingestion_service.seller_repo.bulk_upsert.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_ingest_sellers_drops_stale_predictions(self, ingestion_service):
+        ingestion_service.ad_repo.get_ids_by_seller_ids.return_value = [10, 11]
+
+        await ingestion_service.ingest_sellers(
+            stream({"id": 1, "is_verified": False}, {"id": 2, "is_verified": True})
+        )
+
+        ingestion_service.ad_repo.get_ids_by_seller_ids.assert_called_once_with(
+            [1, 2]
+        )
+        ingestion_service.cache_repo.delete_predictions.assert_called_once_with(
+            [10, 11]
+        )
+
+    @pytest.mark.asyncio
+    async def test_prescore_caches_open_ads(self, ingestion_service):
+        ingestion_service.ad_repo.get_many_by_ids.return_value = [
+            make_ad(1),
+            make_ad(2, is_closed=True),
+        ]
+        ingestion_service.ml_service.predict_batch.return_value = [
+            {"is_violation": False, "probability": 0.1}
+        ]
+
+        result = await ingestion_service.ingest_advertisements(
+            stream(ad_record(1), ad_record(2)), prescore=True
+        )
+
+        assert (result.rows, result.scored) == (2, 1)
+        ingestion_service.cache_repo.set_predictions.assert_called_once_with(
+            {1: {"is_violation": False, "probability": 0.1}}
+        )
+        ingestion_service.cache_repo.delete_predictions.assert_called_once_with([2])
+
+    @pytest.mark.asyncio
+    async def test_prescore_runs_model_off_event_loop(self, ingestion_service):
+        ingestion_service.ad_repo.get_many_by_ids.return_value = [make_ad(1)]
+        threads = []
+        ingestion_service.ml_service.predict_batch.side_effect = lambda ads: (
+            threads.append(threading.get_ident())
+            or [{"is_violation": False, "probability": 0.1}]
+        )
+
+        await ingestion_service.ingest_advertisements(
+            stream(ad_record(1)), prescore=True
+        )
+
+        assert threads and threads[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_without_prescore_drops_stale_predictions(self, ingestion_service):
+        await ingestion_service.ingest_advertisements(stream(ad_record(1)))
+
+        ingestion_service.ad_repo.get_many_by_ids.assert_not_called()
+        ingestion_service.cache_repo.delete_predictions.assert_called_once_with([1])
+
+
+class TestPredictBatch:
+    def test_matches_single_predictions(self, monkeypatch):
+        ml_service = get_ml_service()
+        monkeypatch.setattr(model_client, "_model", model_client.train_model())
+        monkeypatch.setattr(ml_service, "model_client", model_client)
+        ads = [make_ad(item_id) for item_id in range(1, 6)]
+
+        batch = ml_service.predict_batch(ads)
+
+        for prediction, ad in zip(batch, ads):
+            single = ml_service.predict(ad)
+            assert prediction["is_violation"] == single["is_violation"]
+            assert prediction["probability"] == pytest.approx(single["probability"])
+
+
+class TestIngestionEndpoints:
+    def test_ingest_sellers(self, admin_override, ingestion_service):
+        client = TestClient(app)
+
+        response = client.post(
+            "/admin/ingest/sellers",
+            content=(
+                b'{"id": 1, "is_verified": true}\n{"id": 2, "is_verified": false}\n'
+            ),
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "table": "sellers",
+            "rows": 2,
+            "chunks": 1,
+            "scored": 0,
+        }
+
+    def test_invalid_record(self, admin_override, ingestion_service):
+        client = TestClient(app)
+
+        response = client.post("/admin/ingest/advertisements", content=b'{"id": 1}\n')
+
+        assert response.status_code == 422
+        assert "Record 1" in response.json()["detail"]
@@ -0,0 +1,122 @@
+import asyncio
+import datetime
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from aiokafka.errors import KafkaTimeoutError
+
+from app.clients.kafka import KafkaProducer, parse_acks
+from app.clients.kafka_codec import (
+    decode_dlq_message,
+    decode_moderation_request,
+    encode_moderation_request,
+)
+from app.observability.metrics import KAFKA_MESSAGES_SENT_TOTAL
+
+
+def sent_total(topic: str, result: str) -> float:
+    return KAFKA_MESSAGES_SENT_TOTAL.labels(topic=topic, result=result)._value.get()
+
+
+@pytest.fixture
+def producer():
+    producer = KafkaProducer("localhost:9092", "moderation", "dlq")
+    producer._producer = Mock()
+    producer._producer.flush = AsyncMock()
+    producer._producer.stop = AsyncMock()
+    producer.deliveries = []
+
+    async def send(topic, value, key=None):
+        delivery = asyncio.get_running_loop().create_future()
+        producer.deliveries.append((delivery, topic, value, key))
+        return delivery
+
+    producer._producer.send = send
+    return producer
+
+
+class TestKafkaProducer:
+    @pytest.mark.asyncio
+    async def test_send_does_not_wait_for_ack(self, producer):
+        delivery = await producer.send_moderation_request(
+            1, 42, datetime.datetime(2026, 4, 20, 12)
+        )
+
+        assert not delivery.done()
+        _, topic, value, key = producer.deliveries[0]
+        assert topic == "moderation"
+        assert key == b"42"
+        assert decode_moderation_request(value) == {
+            "task_id": 1,
+            "item_id": 42,
+            "timestamp": datetime.datetime(2026, 4, 20, 12),
+        }
+
+    @pytest.mark.asyncio
+    async def test_json_event_format_by_default(self, producer):
+        await producer.send_moderation_request(
+            1, 42, datetime.datetime(2026, 4, 20, 12)
+        )
+
+        assert json.loads(producer.deliveries[0][2]) == {
+            "task_id": 1,
+            "item_id": 42,
+            "timestamp": "2026-04-20T12:00:00",
+        }
+
+    @pytest.mark.asyncio
+    async def test_binary_event_format(self, producer):
+        producer._event_format = "binary"
+
+        await producer.send_moderation_request(
+            1, 42, datetime.datetime(2026, 4, 20, 12)
+        )
+
+        assert producer.deliveries[0][2] == encode_moderation_request(
+            1, 42, datetime.datetime(2026, 4, 20, 12)
+        )
+
+    @pytest.mark.asyncio
+    async def test_binary_dlq_accepts_oversized_message(self, producer):
+        producer._event_format = "binary"
+        original_message = (b"\x00" * 100000).hex()
+
+        await producer.send_to_dlq(original_message, "UnsupportedEventFormatError", 0)
+
+        message = decode_dlq_message(producer.deliveries[0][2])
+        assert message["original_message"] == original_message
+        assert message["error"] == "UnsupportedEventFormatError"
+
+    @pytest.mark.asyncio
+    async def test_delivery_results_are_counted(self, producer):
+        ok_before = sent_total("dlq", "ok")
+        error_before = sent_total("dlq", "error")
+
+        await producer.send_to_dlq("boom", "Exception", 3, item_id=7)
+        await producer.send_to_dlq("boom", "Exception", 3, item_id=8)
+        producer.deliveries[0][0].set_result(None)
+        producer.deliveries[1][0].set_exception(KafkaTimeoutError())
+        await asyncio.sleep(0)
+
+        assert producer.deliveries[0][3] == b"7"
+        assert sent_total("dlq", "ok") == ok_before + 1
+        assert sent_total("dlq", "error") == error_before + 1
+        assert not producer._in_flight
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_in_flight_deliveries(self, producer):
+        await producer.send_to_dlq("boom", "Exception", 3)
+        delivery = producer.deliveries[0][0]
+        asyncio.get_running_loop().call_later(0.01, delivery.set_result, None)
+
+        await producer.stop()
+
+        assert delivery.done()
+        producer._producer.flush.assert_awaited_once()
+        producer._producer.stop.assert_awaited_once()
+
+    def test_parse_acks(self):
+        assert parse_acks("all") == "all"
+        assert parse_acks("0") == 0
+        assert parse_acks("1") == 1
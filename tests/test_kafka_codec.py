@@ -0,0 +1,111 @@
+import datetime
+import json
+
+import pytest
+
+from app.clients.kafka_codec import (
+    SCHEMA_VERSION,
+    decode_dlq_message,
+    decode_moderation_request,
+    encode_dlq_message,
+    encode_moderation_request,
+)
+from app.errors import UnsupportedEventFormatError
+
+TIMESTAMP = datetime.datetime(2026, 4, 20, 12, 30, 15, 123456)
+
+
+class TestModerationRequestCodec:
+    def test_round_trip(self):
+        data = encode_moderation_request(7, 42, TIMESTAMP)
+
+        assert data[0] == SCHEMA_VERSION
+        assert decode_moderation_request(data) == {
+            "task_id": 7,
+            "item_id": 42,
+            "timestamp": TIMESTAMP,
+        }
+
+    def test_smaller_than_json(self):
+        legacy = json.dumps(
+            {"task_id": 7, "item_id": 42, "timestamp": TIMESTAMP.isoformat()}
+        ).encode("utf-8")
+
+        assert len(encode_moderation_request(7, 42, TIMESTAMP)) < len(legacy) / 2
+
+    def test_decodes_legacy_json(self):
+        legacy = json.dumps(
+            {"task_id": 7, "item_id": 42, "timestamp": TIMESTAMP.isoformat()}
+        ).encode("utf-8")
+
+        assert decode_moderation_request(legacy) == {
+            "task_id": 7,
+            "item_id": 42,
+            "timestamp": TIMESTAMP,
+        }
+
+    def test_unknown_version(self):
+        data = bytes([SCHEMA_VERSION + 1]) + encode_moderation_request(
+            7, 42, TIMESTAMP
+        )[1:]
+
+        with pytest.raises(UnsupportedEventFormatError):
+            decode_moderation_request(data)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            encode_moderation_request(7, 42, TIMESTAMP)[:10],
+            b'{"task_id": 7',
+            b'{"task_id": 7, "item_id": 42}',
+        ],
+    )
+    def test_malformed(self, data):
+        with pytest.raises(UnsupportedEventFormatError):
+            decode_moderation_request(data)
+
+
+class TestDlqMessageCodec:
+    def test_round_trip(self):
+        data = encode_dlq_message(
+            "Ошибка в предсказании", "ErrorInPrediction", 3, TIMESTAMP, item_id=42
+        )
+
+        assert decode_dlq_message(data) == {
+            "original_message": "Ошибка в предсказании",
+            "error": "ErrorInPrediction",
+            "timestamp": TIMESTAMP,
+            "retry_count": 3,
+            "item_id": 42,
+        }
+
+    def test_round_trip_without_item_id(self):
+        data = encode_dlq_message("", "Exception", 1, TIMESTAMP)
+
+        message = decode_dlq_message(data)
+        assert message["item_id"] is None
+        assert message["original_message"] == ""
+
+    def test_round_trip_oversized(self):
+        original_message = (b"\xff" * 70000).hex()
+        error = "E" * 70000
+
+        data = encode_dlq_message(original_message, error, 70000, TIMESTAMP)
+
+        message = decode_dlq_message(data)
+        assert message["original_message"] == original_message
+        assert message["error"] == error
+        assert message["retry_count"] == 70000
+
+    def test_decodes_legacy_json(self):
+        legacy = json.dumps(
+            {
+                "original_message": "boom",
+                "error": "Exception",
+                "timestamp": TIMESTAMP.isoformat(),
+                "retry_count": 3,
+            }
+        ).encode("utf-8")
+
+        assert decode_dlq_message(legacy)["item_id"] is None
+        assert decode_dlq_message(legacy)["timestamp"] == TIMESTAMP
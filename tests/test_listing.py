@@ -0,0 +1,91 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.account import Account
+from app.models.seller import Seller
+from app.repositories.pagination import FIRST_PAGE_AFTER, iterate_pages
+from app.services.listing_service import get_listing_service
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def listing_service(monkeypatch):
+    service = get_listing_service()
+    for repo in ("ad_repo", "seller_repo", "moder_repo", "account_repo"):
+        monkeypatch.setattr(service, repo, AsyncMock())
+    return service
+
+
+class TestIteratePages:
+    @pytest.mark.asyncio
+    async def test_reads_table_page_by_page(self):
+        rows = [{"id": id} for id in range(1, 8)]
+        calls = []
+
+        async def fetch_page(after_id, limit):
+            calls.append(after_id)
+            return [row for row in rows if row["id"] > after_id][:limit]
+
+        result = [row async for row in iterate_pages(fetch_page, page_size=3)]
+
+        assert result == rows
+        assert calls == [FIRST_PAGE_AFTER, 3, 6]
+
+    @pytest.mark.asyncio
+    async def test_full_last_page_needs_one_more_request(self):
+        fetch_page = AsyncMock(side_effect=[[{"id": 1}, {"id": 2}], []])
+
+        result = [row async for row in iterate_pages(fetch_page, page_size=2)]
+
+        assert len(result) == 2
+        assert fetch_page.call_count == 2
+
+
+class TestListingEndpoints:
+    def test_first_page(self, client, auth_override, listing_service):
+        listing_service.seller_repo.get_page.return_value = [
+            Seller(id=1, is_verified=True),
+            Seller(id=5, is_verified=False),
+        ]
+
+        response = client.get("/sellers", params={"limit": 2})
+
+        assert response.status_code == 200
+        assert response.json()["next_after"] == 5
+        listing_service.seller_repo.get_page.assert_called_once_with(
+            FIRST_PAGE_AFTER, 2
+        )
+
+    def test_last_page(self, client, auth_override, listing_service):
+        listing_service.moder_repo.get_page.return_value = []
+
+        response = client.get("/moderation_results", params={"after": 10})
+
+        assert response.status_code == 200
+        assert response.json() == {"items": [], "next_after": None}
+        listing_service.moder_repo.get_page.assert_called_once_with(10, 100)
+
+    def test_limit_is_bounded(self, client, auth_override):
+        response = client.get("/advertisements", params={"limit": 100000})
+
+        assert response.status_code == 422
+
+    def test_accounts_without_passwords(self, client, admin_override, listing_service):
+        listing_service.account_repo.get_page.return_value = [
+            Account(id=1, login="admin", password="hashed", is_admin=True)
+        ]
+
+        response = client.get("/admin/accounts")
+
+        assert response.status_code == 200
+        assert response.json()["items"] == [
+            {"id": 1, "login": "admin", "is_blocked": False, "is_admin": True}
+        ]
@@ -0,0 +1,128 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from app.observability import logs
+from app.observability.logs import (
+    JSONFormatter,
+    LazyQueueHandler,
+    SamplingFilter,
+    parse_sample_rates,
+    setup_logging,
+    stop_logging,
+)
+
+
+def make_record(msg="item_id=%s", args=(1,), name="app", exc_info=None):
+    return logging.LogRecord(
+        name=name,
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg=msg,
+        args=args,
+        exc_info=exc_info,
+    )
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    stop_logging()
+    for name, sampling_filter in logs._sampling_filters.items():
+        logging.getLogger(name).removeFilter(sampling_filter)
+    logs._sampling_filters.clear()
+    root.handlers = handlers
+    root.setLevel(level)
+
+
+class TestFormatting:
+    def test_json_formatter(self):
+        data = json.loads(JSONFormatter().format(make_record()))
+
+        assert data["level"] == "INFO"
+        assert data["logger"] == "app"
+        assert data["message"] == "item_id=1"
+        assert "timestamp" in data
+
+    def test_json_formatter_with_exception(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+
+        data = json.loads(JSONFormatter().format(record))
+
+        assert "ValueError: boom" in data["exc_info"]
+
+    def test_queue_handler_does_not_format_message(self):
+        log_queue = queue.SimpleQueue()
+        handler = LazyQueueHandler(log_queue)
+
+        handler.handle(make_record())
+        queued = log_queue.get_nowait()
+
+        assert queued.msg == "item_id=%s"
+        assert queued.args == (1,)
+        assert queued.getMessage() == "item_id=1"
+
+    def test_queue_handler_keeps_exception_text(self):
+        log_queue = queue.SimpleQueue()
+        handler = LazyQueueHandler(log_queue)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            handler.handle(make_record(exc_info=sys.exc_info()))
+
+        queued = log_queue.get_nowait()
+
+        assert queued.exc_info is None
+        assert "ValueError: boom" in queued.exc_text
+
+
+class TestSampling:
+    def test_parse_sample_rates(self):
+        assert parse_sample_rates("app.cache=0.1, app.ml=1") == {
+            "app.cache": 0.1,
+            "app.ml": 1.0,
+        }
+        assert parse_sample_rates("") == {}
+
+    def test_sampling_filter_edges(self):
+        record = make_record()
+
+        assert all(SamplingFilter(1).filter(record) for _ in range(100))
+        assert not any(SamplingFilter(0).filter(record) for _ in range(100))
+
+
+class TestSetupLogging:
+    def test_writes_json_from_background_thread(
+        self, restore_logging, monkeypatch, capsys
+    ):
+        monkeypatch.setenv("LOG_FORMAT", "json")
+        monkeypatch.setenv("LOG_SAMPLE_RATES", "")
+        setup_logging()
+
+        logging.getLogger("app").info("Cache hit for item_id=%s", 7)
+        stop_logging()
+
+        line = capsys.readouterr().out.strip().splitlines()[-1]
+        assert json.loads(line)["message"] == "Cache hit for item_id=7"
+
+    def test_sampled_logger_is_dropped(self, restore_logging, monkeypatch, capsys):
+        monkeypatch.setenv("LOG_FORMAT", "text")
+        monkeypatch.setenv("LOG_SAMPLE_RATES", "app.cache=0")
+        setup_logging()
+
+        logging.getLogger("app.cache").info("Cache miss for item_id=%s", 1)
+        logging.getLogger("app").info("Request handled")
+        stop_logging()
+
+        out = capsys.readouterr().out
+        assert "Cache miss" not in out
+        assert "Request handled" in out
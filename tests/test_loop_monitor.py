@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.observability.loop_monitor import LoopMonitor
+
+
+def get_blocks_total(component: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "event_loop_blocks_total", {"component": component}
+    )
+    return value or 0.0
+
+
+def get_lag_count(component: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "event_loop_lag_seconds_count", {"component": component}
+    )
+    return value or 0.0
+
+
+def blocking_call(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.fixture
+def monitor():
+    monitor = LoopMonitor(component="test", interval=0.02, block_threshold=0.1)
+    monitor.enabled = True
+    return monitor
+
+
+class TestLoopMonitor:
+    @pytest.mark.asyncio
+    async def test_measures_loop_lag(self, monitor):
+        before = get_lag_count("test")
+
+        monitor.start()
+        await asyncio.sleep(0.15)
+        await monitor.stop()
+
+        assert get_lag_count("test") > before
+
+    @pytest.mark.asyncio
+    async def test_logs_stack_of_blocking_call(self, monitor, caplog):
+        before = get_blocks_total("test")
+
+        with caplog.at_level(logging.WARNING, logger="app.loop"):
+            monitor.start()
+            await asyncio.sleep(0.05)
+            blocking_call(0.4)
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+
+        assert get_blocks_total("test") == before + 1
+        assert "blocking_call" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_no_report_without_blocking(self, monitor, caplog):
+        before = get_blocks_total("test")
+
+        with caplog.at_level(logging.WARNING, logger="app.loop"):
+            monitor.start()
+            await asyncio.sleep(0.2)
+            await monitor.stop()
+
+        assert get_blocks_total("test") == before
+        assert caplog.text == ""
+
+    @pytest.mark.asyncio
+    async def test_disabled_monitor_does_nothing(self, monitor):
+        monitor.enabled = False
+
+        monitor.start()
+
+        assert monitor._task is None
+        await monitor.stop()
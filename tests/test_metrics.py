@@ -0,0 +1,155 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.observability.middleware import (
+    OVERFLOW_ENDPOINT,
+    UNMATCHED_ENDPOINT,
+    PrometheusMiddleware,
+)
+from app.observability.multiprocess import generate_metrics, prepare_multiprocess_dir
+
+
+def get_requests_total(method: str, endpoint: str, status: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "http_requests_total",
+        {"method": method, "endpoint": endpoint, "status": status},
+    )
+    return value or 0.0
+
+
+def create_metrics_app(**middleware_kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"item_id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"{i}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    @app.get("/metrics")
+    async def metrics():
+        return {}
+
+    app.add_middleware(PrometheusMiddleware, **middleware_kwargs)
+    return app
+
+
+@pytest.fixture
+def metrics_app():
+    return create_metrics_app()
+
+
+@pytest.fixture
+def metrics_client(metrics_app):
+    return TestClient(metrics_app, raise_server_exceptions=False)
+
+
+class TestPrometheusMiddleware:
+    def test_counts_request_with_status(self, metrics_client):
+        before = get_requests_total("GET", "/ping", "200")
+
+        response = metrics_client.get("/ping")
+
+        assert response.status_code == 200
+        assert get_requests_total("GET", "/ping", "200") == before + 1
+
+    def test_streaming_response_is_passed_through(self, metrics_client):
+        before = get_requests_total("GET", "/stream", "200")
+
+        response = metrics_client.get("/stream")
+
+        assert response.status_code == 200
+        assert response.text == "0\n1\n2\n"
+        assert get_requests_total("GET", "/stream", "200") == before + 1
+
+    def test_unhandled_exception_counted_as_500(self, metrics_client):
+        before = get_requests_total("GET", "/fail", "500")
+
+        response = metrics_client.get("/fail")
+
+        assert response.status_code == 500
+        assert get_requests_total("GET", "/fail", "500") == before + 1
+
+    def test_metrics_endpoint_is_skipped(self, metrics_client):
+        before = get_requests_total("GET", "/metrics", "200")
+
+        metrics_client.get("/metrics")
+
+        assert get_requests_total("GET", "/metrics", "200") == before
+
+    def test_endpoint_label_is_route_template(self, metrics_client):
+        before = get_requests_total("GET", "/items/{item_id}", "200")
+
+        for item_id in range(5):
+            metrics_client.get(f"/items/{item_id}")
+
+        assert get_requests_total("GET", "/items/{item_id}", "200") == before + 5
+        assert get_requests_total("GET", "/items/1", "200") == 0
+
+    def test_unmatched_paths_are_bucketed(self, metrics_client):
+        before = get_requests_total("GET", UNMATCHED_ENDPOINT, "404")
+
+        metrics_client.get("/no/such/path/1")
+        metrics_client.get("/no/such/path/2")
+
+        assert get_requests_total("GET", UNMATCHED_ENDPOINT, "404") == before + 2
+        assert get_requests_total("GET", "/no/such/path/1", "404") == 0
+
+    def test_endpoints_over_cap_are_bucketed(self):
+        client = TestClient(create_metrics_app(max_endpoints=1))
+        before = get_requests_total("GET", OVERFLOW_ENDPOINT, "200")
+
+        client.get("/ping")
+        client.get("/items/1")
+        client.get("/ping")
+
+        assert get_requests_total("GET", OVERFLOW_ENDPOINT, "200") == before + 1
+
+
+class TestMultiprocessMetrics:
+    def test_prepare_removes_stale_worker_files(self, tmp_path):
+        (tmp_path / "counter_123.db").write_bytes(b"stale")
+        (tmp_path / "histogram_123.db").write_bytes(b"stale")
+        (tmp_path / "keep.txt").write_text("other")
+
+        prepare_multiprocess_dir(str(tmp_path))
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["keep.txt"]
+
+    def test_prepare_creates_missing_dir(self, tmp_path):
+        path = tmp_path / "prometheus"
+
+        prepare_multiprocess_dir(str(path))
+
+        assert path.is_dir()
+
+    def test_generate_metrics_multiprocess_mode(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        output = generate_metrics()
+
+        assert b"http_requests_total" not in output
+
+    def test_generate_metrics_single_process_mode(self, monkeypatch):
+        monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+        output = generate_metrics()
+
+        assert b"http_requests_total" in output
@@ -0,0 +1,148 @@
+import asyncio
+import datetime
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.errors import ModerationTaskNotFoundError
+from app.main import app
+from app.models.moderation import Moderation, ModerationResult
+from app.services.moderation_notifier import ModerationResultNotifier
+from app.services.moderation_service import get_moder_service
+
+PENDING = ModerationResult(task_id=1, status="pending")
+COMPLETED = ModerationResult(
+    task_id=1, status="completed", is_violation=True, probability=0.9
+)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def notifier():
+    notifier = ModerationResultNotifier()
+    with patch("app.services.moderation_service.moderation_notifier", notifier):
+        yield notifier
+
+
+@pytest.fixture
+def moder_service(monkeypatch, notifier):
+    service = get_moder_service()
+    monkeypatch.setattr(service, "moder_repo", AsyncMock())
+    monkeypatch.setattr(service, "cache_repo", AsyncMock())
+    service.cache_repo.get_moderation_result.return_value = None
+    service.moder_repo.get.return_value = Moderation(
+        id=1,
+        item_id=2,
+        status="pending",
+        created_at=datetime.datetime.now(),
+        processed_at=None,
+    )
+    return service
+
+
+async def complete_later(notifier: ModerationResultNotifier, delay: float):
+    await asyncio.sleep(delay)
+    notifier.dispatch(json.dumps(COMPLETED.model_dump()))
+
+
+class TestModerationResultNotifier:
+    @pytest.mark.asyncio
+    async def test_dispatch_resolves_waiters(self, notifier):
+        with notifier.waiter(1) as first, notifier.waiter(1) as second:
+            with notifier.waiter(2) as other:
+                notifier.dispatch(json.dumps(COMPLETED.model_dump()))
+
+                assert first.result() == second.result() == COMPLETED.model_dump()
+                assert not other.done()
+
+        assert not notifier._waiters
+
+    @pytest.mark.asyncio
+    async def test_dispatch_without_waiters(self, notifier):
+        notifier.dispatch(json.dumps(COMPLETED.model_dump()))
+
+        assert not notifier._waiters
+
+
+class TestWaitModerationResult:
+    @pytest.mark.asyncio
+    async def test_returns_when_task_completes(self, moder_service, notifier):
+        asyncio.create_task(complete_later(notifier, 0.01))
+
+        result = await moder_service.wait_moderation_result(1, timeout=5)
+
+        assert result == COMPLETED
+        moder_service.moder_repo.get.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_returns_pending_after_timeout(self, moder_service):
+        result = await moder_service.wait_moderation_result(1, timeout=0.01)
+
+        assert result == PENDING
+        moder_service.moder_repo.get.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_watch_sends_keepalives(self, moder_service, notifier):
+        asyncio.create_task(complete_later(notifier, 0.05))
+
+        updates = [
+            update
+            async for update in moder_service.watch_moderation_result(
+                1, timeout=5, keepalive=0.01
+            )
+        ]
+
+        assert updates[0] == PENDING
+        assert updates[-1] == COMPLETED
+        assert None in updates[1:-1]
+
+
+class TestModerationResultEndpoints:
+    def test_wait_is_passed_in_seconds(self, client, auth_override):
+        with patch.object(
+            get_moder_service(),
+            "wait_moderation_result",
+            AsyncMock(return_value=COMPLETED),
+        ) as wait:
+            response = client.get("/moderation_result/1?wait=30s")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+        wait.assert_called_once_with(1, timeout=30)
+
+    def test_invalid_wait(self, client, auth_override):
+        response = client.get("/moderation_result/1?wait=soon")
+
+        assert response.status_code == 422
+
+    def test_events_stream(self, client, auth_override):
+        async def watch(task_id, timeout, keepalive):
+            yield PENDING
+            yield None
+            yield COMPLETED
+
+        with patch.object(get_moder_service(), "watch_moderation_result", watch):
+            response = client.get("/moderation_result/1/events")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = response.text.split("\n\n")
+        assert json.loads(events[0].split("data: ")[1])["status"] == "pending"
+        assert events[1] == ": keepalive"
+        assert json.loads(events[2].split("data: ")[1])["status"] == "completed"
+
+    def test_events_not_found(self, client, auth_override):
+        async def watch(task_id, timeout, keepalive):
+            raise ModerationTaskNotFoundError()
+            yield
+
+        with patch.object(get_moder_service(), "watch_moderation_result", watch):
+            response = client.get("/moderation_result/1/events")
+
+        assert response.status_code == 404
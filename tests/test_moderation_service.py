@@ -0,0 +1,168 @@
+import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.errors import ModerationTaskNotFoundError
+from app.models.moderation import Moderation, ModerationResult
+from app.services.moderation_notifier import moderation_notifier
+from app.services.moderation_service import get_moder_service
+
+
+def make_task(status: str) -> Moderation:
+    return Moderation(
+        id=1,
+        item_id=2,
+        status=status,
+        created_at=datetime.datetime.now(),
+        processed_at=None,
+    )
+
+
+@pytest.fixture
+def moder_service(monkeypatch):
+    service = get_moder_service()
+    monkeypatch.setattr(service, "ad_repo", AsyncMock())
+    monkeypatch.setattr(service, "moder_repo", AsyncMock())
+    monkeypatch.setattr(service, "cache_repo", AsyncMock())
+    service.cache_repo.get_moderation_result.return_value = None
+    monkeypatch.setattr(moderation_notifier, "publish", AsyncMock())
+    return service
+
+
+class TestIdempotentTaskUpdates:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "status, finished",
+        [("pending", False), ("completed", True), ("failed", True)],
+    )
+    async def test_is_task_finished(self, moder_service, status, finished):
+        moder_service.moder_repo.get.return_value = make_task(status)
+
+        assert await moder_service.is_task_finished(1) is finished
+
+    @pytest.mark.asyncio
+    async def test_deleted_task_is_finished(self, moder_service):
+        moder_service.moder_repo.get.side_effect = ModerationTaskNotFoundError()
+
+        assert await moder_service.is_task_finished(1) is True
+
+    @pytest.mark.asyncio
+    async def test_complete_only_pending_task(self, moder_service):
+        moder_service.moder_repo.update_if_pending.return_value = None
+
+        completed = await moder_service.complete_moderation_task(
+            1, {"is_violation": True, "probability": 0.9}
+        )
+
+        assert completed is False
+        moder_service.moder_repo.update.assert_not_called()
+        changes = moder_service.moder_repo.update_if_pending.call_args.kwargs
+        assert changes["status"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_fail_only_pending_task(self, moder_service):
+        moder_service.moder_repo.update_if_pending.return_value = make_task("failed")
+
+        assert await moder_service.fail_moderation_task(1, "boom") is True
+        result = moderation_notifier.publish.call_args.args[0]
+        assert (result.task_id, result.status) == (1, "failed")
+        moder_service.cache_repo.set_moderation_result.assert_called_once_with(result)
+
+
+class TestModerationResultCache:
+    @pytest.mark.asyncio
+    async def test_cached_result_skips_db(self, moder_service):
+        cached = ModerationResult(task_id=1, status="completed", is_violation=False)
+        moder_service.cache_repo.get_moderation_result.return_value = cached
+
+        assert await moder_service.get_moderation_result(1) == cached
+        assert await moder_service.is_task_finished(1) is True
+        moder_service.moder_repo.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_db_result_is_written_through(self, moder_service):
+        moder_service.moder_repo.get.return_value = make_task("failed")
+
+        result = await moder_service.get_moderation_result(1)
+
+        assert result.status == "failed"
+        moder_service.cache_repo.set_moderation_result.assert_called_once_with(result)
+
+    @pytest.mark.asyncio
+    async def test_cache_errors_fall_back_to_db(self, moder_service):
+        moder_service.cache_repo.get_moderation_result.side_effect = ConnectionError()
+        moder_service.cache_repo.set_moderation_result.side_effect = ConnectionError()
+        moder_service.moder_repo.get.return_value = make_task("pending")
+
+        result = await moder_service.get_moderation_result(1)
+
+        assert result.status == "pending"
+
+
+class TestAsyncPredictCoalescing:
+    @pytest.mark.asyncio
+    async def test_cached_prediction_completes_task(self, moder_service):
+        moder_service.cache_repo.get_prediction.return_value = {
+            "is_violation": 1,
+            "probability": 0.9,
+        }
+        moder_service.moder_repo.get_or_create_completed.return_value = (
+            make_task("completed"),
+            True,
+        )
+
+        task = await moder_service.async_predict(2)
+
+        assert task.status == "completed"
+        args = moder_service.moder_repo.get_or_create_completed.call_args.args
+        assert args[0] == 2
+        assert args[2:] == (True, 0.9)
+        moder_service.ad_repo.get.assert_not_called()
+        moder_service.moder_repo.get_or_create_pending.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_completed_task_is_reused(self, moder_service):
+        moder_service.cache_repo.get_prediction.return_value = {
+            "is_violation": 1,
+            "probability": 0.9,
+        }
+        moder_service.moder_repo.get_or_create_completed.return_value = (
+            make_task("completed"),
+            False,
+        )
+
+        task = await moder_service.async_predict(2)
+
+        assert task.id == 1
+        moder_service.cache_repo.set_moderation_result.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_error_falls_back_to_worker(self, moder_service):
+        moder_service.cache_repo.get_prediction.side_effect = ConnectionError()
+        moder_service.moder_repo.get_or_create_pending.return_value = (
+            make_task("pending"),
+            True,
+        )
+
+        with patch("app.services.moderation_service.outbox_relay") as relay:
+            task = await moder_service.async_predict(2)
+
+        assert task.status == "pending"
+        moder_service.ad_repo.get.assert_called_once_with(2)
+        relay.wake.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_pending_task_is_reused(self, moder_service):
+        moder_service.cache_repo.get_prediction.return_value = None
+        moder_service.moder_repo.get_or_create_pending.return_value = (
+            make_task("pending"),
+            False,
+        )
+
+        with patch("app.services.moderation_service.outbox_relay") as relay:
+            task = await moder_service.async_predict(2)
+
+        assert task.id == 1
+        relay.wake.assert_not_called()
+
@@ -0,0 +1,216 @@
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.clients.kafka import KafkaProducer
+from app.clients.kafka_codec import decode_moderation_request
+from app.clients.postgres import get_pg_connection
+from app.models.moderation import Moderation
+from app.repositories.moderation import ModerationRepository
+from app.repositories.outbox import OutboxRepository
+from app.services.moderation_service import get_moder_service
+from app.workers.outbox_relay import OutboxRelay
+
+
+def make_event(task_id: int, item_id: int):
+    return {
+        "topic": "moderation",
+        "key": str(item_id),
+        "payload": {
+            "task_id": task_id,
+            "item_id": item_id,
+            "timestamp": "2026-04-20T12:00:00",
+        },
+    }
+
+
+@pytest.fixture
+def relay():
+    relay = OutboxRelay(batch_size=2, poll_interval=0.01, linger=0)
+    relay.outbox_repo = Mock()
+    return relay
+
+
+class TestOutboxRelay:
+    @pytest.mark.asyncio
+    async def test_publish_once_sends_batch(self, relay):
+        events = [make_event(1, 10), make_event(2, 20)]
+
+        async def publish_batch(limit, publish):
+            await publish(events[:limit])
+            return len(events[:limit])
+
+        relay.outbox_repo.publish_batch = publish_batch
+
+        with patch("app.workers.outbox_relay.kafka_producer") as producer:
+            producer.send_batch = AsyncMock()
+            published = await relay.publish_once()
+
+        assert published == 2
+        producer.send_batch.assert_called_once_with(events)
+
+    @pytest.mark.asyncio
+    async def test_run_survives_publish_errors(self, relay):
+        relay.outbox_repo.publish_batch = AsyncMock(
+            side_effect=[ConnectionError("db is down"), 1, 0, 0, 0]
+        )
+
+        relay.enabled = True
+        relay.start()
+        await asyncio.sleep(0.1)
+        await relay.stop()
+
+        assert relay.outbox_repo.publish_batch.await_count >= 3
+
+    @pytest.mark.asyncio
+    async def test_wake_skips_poll_interval(self, relay):
+        relay.poll_interval = 10
+        relay.outbox_repo.publish_batch = AsyncMock(return_value=0)
+
+        relay.enabled = True
+        relay.start()
+        await asyncio.sleep(0.01)
+        relay.wake()
+        await asyncio.sleep(0.01)
+        await relay.stop()
+
+        assert relay.outbox_repo.publish_batch.await_count == 2
+
+
+class TestKafkaSendBatch:
+    @pytest.mark.asyncio
+    async def test_send_batch_waits_for_all_deliveries(self):
+        producer = KafkaProducer("localhost:9092", "moderation", "dlq")
+        deliveries = []
+
+        async def send(topic, value, key=None):
+            delivery = asyncio.get_running_loop().create_future()
+            delivery.set_result(None)
+            deliveries.append((topic, value, key))
+            return delivery
+
+        producer._producer = Mock()
+        producer._producer.send = send
+
+        await producer.send_batch([make_event(1, 10), make_event(2, 20)])
+
+        assert [topic for topic, _, _ in deliveries] == ["moderation", "moderation"]
+        assert [key for _, _, key in deliveries] == [b"10", b"20"]
+        assert decode_moderation_request(deliveries[0][1]) == {
+            "task_id": 1,
+            "item_id": 10,
+            "timestamp": datetime.datetime(2026, 4, 20, 12),
+        }
+
+
+class TestAsyncPredictOutbox:
+    @pytest.mark.asyncio
+    async def test_async_predict_writes_outbox_instead_of_kafka(self, monkeypatch):
+        service = get_moder_service()
+        monkeypatch.setattr(service, "ad_repo", AsyncMock())
+        monkeypatch.setattr(service, "moder_repo", AsyncMock())
+        monkeypatch.setattr(service, "cache_repo", AsyncMock())
+        service.cache_repo.get_prediction.return_value = None
+        service.moder_repo.get_or_create_pending.return_value = (
+            Moderation(
+                id=7,
+                item_id=1,
+                status="pending",
+                created_at=datetime.datetime.now(),
+                processed_at=None,
+            ),
+            True,
+        )
+
+        with (
+            patch("app.services.moderation_service.kafka_producer") as producer,
+            patch("app.services.moderation_service.outbox_relay") as relay,
+        ):
+            producer.moderation_topic = "moderation"
+            producer.send_moderation_request = AsyncMock()
+
+            task = await service.async_predict(1)
+
+        assert task.id == 7
+        service.moder_repo.get_or_create_pending.assert_called_once()
+        assert (
+            service.moder_repo.get_or_create_pending.call_args.args[-1] == "moderation"
+        )
+        producer.send_moderation_request.assert_not_called()
+        relay.wake.assert_called_once()
+
+
+async def clean_pending_tasks():
+    async with get_pg_connection() as conn:
+        await conn.execute("DELETE FROM outbox")
+        await conn.execute(
+            "DELETE FROM moderation_results WHERE item_id = 1 AND status = 'pending'"
+        )
+
+
+@pytest.mark.integration
+class TestOutboxIntegration:
+    @pytest.mark.asyncio
+    async def test_task_and_event_are_created_together(self):
+        await clean_pending_tasks()
+
+        task, created = await ModerationRepository().get_or_create_pending(
+            1, datetime.datetime.now(), "moderation"
+        )
+        assert created is True
+
+        published = []
+
+        async def publish(events):
+            published.extend(events)
+
+        count = await OutboxRepository().publish_batch(100, publish)
+
+        assert count == 1
+        assert published[0]["key"] == "1"
+        assert published[0]["payload"]["task_id"] == task.id
+
+        async with get_pg_connection() as conn:
+            assert await conn.fetchval("SELECT count(*) FROM outbox") == 0
+            await conn.execute("DELETE FROM moderation_results WHERE id = $1", task.id)
+
+    @pytest.mark.asyncio
+    async def test_failed_publish_keeps_events(self):
+        await clean_pending_tasks()
+
+        task, _ = await ModerationRepository().get_or_create_pending(
+            1, datetime.datetime.now(), "moderation"
+        )
+
+        async def publish(events):
+            raise ConnectionError("broker is down")
+
+        with pytest.raises(ConnectionError):
+            await OutboxRepository().publish_batch(100, publish)
+
+        async with get_pg_connection() as conn:
+            assert await conn.fetchval("SELECT count(*) FROM outbox") == 1
+            await conn.execute("DELETE FROM outbox")
+            await conn.execute("DELETE FROM moderation_results WHERE id = $1", task.id)
+
+    @pytest.mark.asyncio
+    async def test_pending_task_is_reused(self):
+        await clean_pending_tasks()
+        repo = ModerationRepository()
+
+        first, first_created = await repo.get_or_create_pending(
+            1, datetime.datetime.now(), "moderation"
+        )
+        second, second_created = await repo.get_or_create_pending(
+            1, datetime.datetime.now(), "moderation"
+        )
+
+        assert (first_created, second_created) == (True, False)
+        assert second.id == first.id
+
+        async with get_pg_connection() as conn:
+            assert await conn.fetchval("SELECT count(*) FROM outbox") == 1
+
+        await clean_pending_tasks()
@@ -155,6 +155,26 @@ class TestPredictions:
         mock_model.predict.assert_not_called()
         mock_cache.set_prediction.assert_not_called()
 
+    def test_prediction_response_matches_response_model(
+        self,
+        client,
+        mock_cache,
+        mock_ad_repo,
+        mock_model,
+        reset_ml_service,
+        auth_override,
+    ):
+        mock_cache.get_prediction.return_value = {
+            "is_violation": True,
+            "probability": 0.75,
+        }
+
+        response = client.post("/simple_predict", json={"id": 5})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == b'{"is_violation":1,"probability":0.75}'
+
     def test_negative_prediction(
         self, client, mock_cache, reset_ml_service, auth_override
     ):
@@ -219,9 +239,12 @@ class TestPredictions:
     @pytest.mark.asyncio
     async def test_async_predict(self, client, reset_ml_service, auth_override):
         moder_repo = ModerationRepository()
-        moderations = await moder_repo.get_many()
-        moderations_ids = [moderation.id for moderation in moderations]
-        max_moderations_id = max(moderations_ids) if moderations_ids else 0
+        max_moderations_id = 0
+        async for moderation in moder_repo.iterate_many():
+            max_moderations_id = max(max_moderations_id, moderation.id)
+            # Иначе запрос вернет уже существующую pending-задачу объявления
+            if moderation.item_id == 1 and moderation.status == "pending":
+                await moder_repo.delete(moderation.id)
 
         response = client.post("/async_predict", json={"id": 1})
         data = response.json()
@@ -241,8 +264,9 @@ class TestPredictions:
     @pytest.mark.asyncio
     async def test_moderation_result(self, client, reset_ml_service, auth_override):
         moder_repo = ModerationRepository()
-        moderations = await moder_repo.get_many()
-        moderations_ids = [moderation.id for moderation in moderations]
+        moderations_ids = [
+            moderation.id async for moderation in moder_repo.iterate_many()
+        ]
         if not moderations_ids:
             pytest.skip("No moderation tasks found")
 
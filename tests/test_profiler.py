@@ -0,0 +1,158 @@
+import asyncio
+import collections
+import json
+import os
+import signal
+import threading
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.dependencies.auth import get_current_account
+from app.errors import ProfilerBusyError
+from app.main import app
+from app.models.account import Account
+from app.observability import profiler
+from app.observability.profiler import (
+    install_signal_handler,
+    sample,
+    to_collapsed,
+    to_speedscope,
+)
+
+
+def busy_function(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_function, args=(stop,), name="busy")
+    thread.start()
+    yield
+    stop.set()
+    thread.join()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def override_account(is_admin: bool):
+    account = Account(
+        id=1,
+        login="admin" if is_admin else "testuser",
+        password="hashed",
+        is_admin=is_admin,
+        created_at=datetime.now(),
+    )
+    app.dependency_overrides[get_current_account] = lambda: account
+
+
+@pytest.fixture
+def admin_override():
+    override_account(is_admin=True)
+    yield
+    app.dependency_overrides.pop(get_current_account, None)
+
+
+@pytest.fixture
+def user_override():
+    override_account(is_admin=False)
+    yield
+    app.dependency_overrides.pop(get_current_account, None)
+
+
+class TestSampler:
+    def test_samples_running_threads(self, busy_thread):
+        samples = sample(duration=0.2, interval=0.005)
+
+        busy_stacks = [stack for stack in samples if stack[0] == "busy"]
+        assert busy_stacks
+        assert any("busy_function" in stack[-1] for stack in busy_stacks)
+
+    def test_concurrent_profiling_is_rejected(self):
+        profiler._profile_lock.acquire()
+        try:
+            with pytest.raises(ProfilerBusyError):
+                sample(duration=0.01, interval=0.005)
+        finally:
+            profiler._profile_lock.release()
+
+    def test_collapsed_format(self):
+        samples = {("MainThread", "main (a.py:1)", "work (a.py:5)"): 3}
+
+        assert (
+            to_collapsed(collections.Counter(samples))
+            == "MainThread;main (a.py:1);work (a.py:5) 3"
+        )
+
+    def test_speedscope_format(self):
+        samples = collections.Counter(
+            {("MainThread", "main (a.py:1)"): 2, ("MainThread", "idle (a.py:9)"): 1}
+        )
+
+        data = to_speedscope(samples, interval=0.01, name="api")
+
+        frames = [frame["name"] for frame in data["shared"]["frames"]]
+        assert frames == ["MainThread", "main (a.py:1)", "idle (a.py:9)"]
+        assert data["profiles"][0]["samples"] == [[0, 1], [0, 2]]
+        assert data["profiles"][0]["weights"] == [0.02, 0.01]
+
+    @pytest.mark.asyncio
+    async def test_signal_writes_profile_file(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PROFILE_OUTPUT_DIR", str(tmp_path))
+        install_signal_handler(component="test", duration=0.05, interval=0.005)
+        try:
+            os.kill(os.getpid(), signal.SIGUSR1)
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                files = list(tmp_path.glob("profile_test_*.json"))
+                if files:
+                    break
+        finally:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+
+        assert files
+        assert json.loads(files[0].read_text())["profiles"][0]["type"] == "sampled"
+
+
+class TestProfileEndpoint:
+    def test_requires_admin(self, client, user_override):
+        response = client.get("/admin/profile", params={"seconds": 0.05})
+
+        assert response.status_code == 403
+
+    def test_collapsed_profile(self, client, admin_override):
+        response = client.get("/admin/profile", params={"seconds": 0.05})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text.strip()
+
+    def test_speedscope_profile(self, client, admin_override):
+        response = client.get(
+            "/admin/profile", params={"seconds": 0.05, "format": "speedscope"}
+        )
+
+        assert response.status_code == 200
+        assert "attachment" in response.headers["content-disposition"]
+        assert response.json()["profiles"][0]["type"] == "sampled"
+
+    def test_busy_profiler_returns_conflict(self, client, admin_override):
+        profiler._profile_lock.acquire()
+        try:
+            response = client.get("/admin/profile", params={"seconds": 0.05})
+        finally:
+            profiler._profile_lock.release()
+
+        assert response.status_code == 409
+
+    def test_duration_is_limited(self, client, admin_override):
+        response = client.get("/admin/profile", params={"seconds": 600})
+
+        assert response.status_code == 422
@@ -0,0 +1,229 @@
+import datetime
+import json
+from typing import Any, Dict, Iterator
+
+import pytest
+
+from app.clients.postgres import get_pg_connection
+from app.repositories import accounts, advertisements, moderation, outbox, sellers
+from app.repositories.statements import update_statement
+
+SEED_SELLERS = 2000
+SEED_ADS_PER_SELLER = 5
+SEED_ID_OFFSET = 900000
+
+ITEM_ID = SEED_ID_OFFSET + 1
+NOW = datetime.datetime(2026, 5, 10, 12)
+
+UPDATE_IF_PENDING_QUERY, UPDATE_IF_PENDING_ARGS = update_statement(
+    "moderation_results",
+    {
+        "status": "completed",
+        "is_violation": True,
+        "probability": 0.9,
+        "processed_at": NOW,
+    },
+    condition=moderation.PENDING_CONDITION,
+)
+
+# Запросы из app/repositories, которые выполняются на каждый запрос
+# к API, на каждое событие воркера или на каждую страницу списка,
+# с аргументами и таблицами, которые они не должны читать целиком.
+# Запросы берутся из модулей репозиториев, а не копируются сюда.
+HOT_QUERIES = {
+    "AdvertisementPostgresStorage.select": (
+        advertisements.SELECT_QUERY,
+        (ITEM_ID,),
+        {"advertisements", "sellers"},
+    ),
+    "AdvertisementPostgresStorage.select_many_by_ids": (
+        advertisements.SELECT_MANY_BY_IDS_QUERY,
+        ([ITEM_ID, ITEM_ID + 1],),
+        {"advertisements", "sellers"},
+    ),
+    "AdvertisementPostgresStorage.select_page": (
+        advertisements.SELECT_PAGE_QUERY,
+        (ITEM_ID, 100),
+        {"advertisements", "sellers"},
+    ),
+    "AdvertisementPostgresStorage.copy_upsert": (
+        advertisements.COPY_UPSERT_QUERY,
+        (),
+        {"advertisements"},
+    ),
+    "AdvertisementPostgresStorage.select_ids_by_seller_ids": (
+        advertisements.SELECT_IDS_BY_SELLER_IDS_QUERY,
+        ([SEED_ID_OFFSET + 1, SEED_ID_OFFSET + 2],),
+        {"advertisements"},
+    ),
+    "AdvertisementPostgresStorage.close_many": (
+        advertisements.CLOSE_MANY_QUERY,
+        ([ITEM_ID, ITEM_ID + 1],),
+        {"advertisements", "moderation_results"},
+    ),
+    "SellerPostgresStorage.select_page": (
+        sellers.SELECT_PAGE_QUERY,
+        (SEED_ID_OFFSET, 100),
+        {"sellers"},
+    ),
+    "SellerPostgresStorage.copy_upsert": (
+        sellers.COPY_UPSERT_QUERY,
+        (),
+        {"sellers"},
+    ),
+    "ModerationPostgresStorage.select": (
+        moderation.SELECT_QUERY,
+        (1,),
+        {"moderation_results"},
+    ),
+    "ModerationPostgresStorage.select_page": (
+        moderation.SELECT_PAGE_QUERY,
+        (1, 100),
+        {"moderation_results"},
+    ),
+    "ModerationPostgresStorage.update_if_pending": (
+        UPDATE_IF_PENDING_QUERY,
+        (1, *UPDATE_IF_PENDING_ARGS),
+        {"moderation_results"},
+    ),
+    "ModerationPostgresStorage.get_or_create_pending": (
+        moderation.GET_OR_CREATE_PENDING_QUERY,
+        (ITEM_ID, NOW, "moderation"),
+        {"moderation_results"},
+    ),
+    "ModerationPostgresStorage.get_or_create_completed": (
+        moderation.GET_OR_CREATE_COMPLETED_QUERY,
+        (ITEM_ID, True, 0.9, NOW),
+        {"moderation_results"},
+    ),
+    "ModerationPostgresStorage.delete_by_item_id": (
+        moderation.DELETE_BY_ITEM_ID_QUERY,
+        (ITEM_ID,),
+        {"moderation_results"},
+    ),
+    "AccountPostgresStorage.get_by_login": (
+        accounts.GET_BY_LOGIN_QUERY,
+        ("explain-user-1",),
+        {"accounts"},
+    ),
+    "AccountPostgresStorage.get_page": (
+        accounts.GET_PAGE_QUERY,
+        (1, 100),
+        {"accounts"},
+    ),
+    "OutboxPostgresStorage.publish_batch": (
+        outbox.SELECT_BATCH_QUERY,
+        (100,),
+        {"outbox"},
+    ),
+    # Запросы, которые Postgres сам выполняет для ON DELETE CASCADE
+    # при SellerPostgresStorage.delete и AdvertisementPostgresStorage.delete
+    "sellers ON DELETE CASCADE": (
+        "SELECT 1 FROM advertisements WHERE seller_id = $1::INTEGER",
+        (SEED_ID_OFFSET + 1,),
+        {"advertisements"},
+    ),
+    "advertisements ON DELETE CASCADE": (
+        "SELECT 1 FROM moderation_results WHERE item_id = $1::INTEGER",
+        (ITEM_ID,),
+        {"moderation_results"},
+    ),
+}
+
+
+async def seed(connection) -> None:
+    await connection.execute(
+        """
+        INSERT INTO sellers (id, is_verified)
+        SELECT id, id % 2 = 0
+        FROM generate_series($1::INTEGER, $1::INTEGER + $2::INTEGER - 1) AS id
+        """,
+        SEED_ID_OFFSET,
+        SEED_SELLERS,
+    )
+    await connection.execute(
+        """
+        INSERT INTO advertisements (
+            seller_id, id, name, description, category, images_qty
+        )
+        SELECT
+            $1::INTEGER + n / $3::INTEGER,
+            $1::INTEGER + n,
+            'explain ' || n,
+            'explain',
+            n % 10,
+            n % 5
+        FROM generate_series(0, $2::INTEGER * $3::INTEGER - 1) AS n
+        """,
+        SEED_ID_OFFSET,
+        SEED_SELLERS,
+        SEED_ADS_PER_SELLER,
+    )
+    await connection.execute(
+        """
+        INSERT INTO moderation_results (item_id, status, created_at)
+        SELECT
+            $1::INTEGER + n,
+            CASE WHEN n % 20 = 0 THEN 'pending' ELSE 'completed' END,
+            NOW() - n * INTERVAL '1 minute'
+        FROM generate_series(0, $2::INTEGER * $3::INTEGER - 1) AS n
+        """,
+        SEED_ID_OFFSET,
+        SEED_SELLERS,
+        SEED_ADS_PER_SELLER,
+    )
+    await connection.execute(
+        """
+        INSERT INTO accounts (login, password)
+        SELECT 'explain-user-' || n, 'hashed'
+        FROM generate_series(1, $1::INTEGER) AS n
+        """,
+        SEED_SELLERS * SEED_ADS_PER_SELLER,
+    )
+    await connection.execute(
+        """
+        INSERT INTO outbox (topic, payload)
+        SELECT 'explain', '{}'::JSONB
+        FROM generate_series(1, $1::INTEGER)
+        """,
+        SEED_SELLERS * SEED_ADS_PER_SELLER,
+    )
+    await connection.execute(
+        "ANALYZE sellers, advertisements, moderation_results, accounts, outbox"
+    )
+    # Таблицы для copy_upsert удаляются вместе с транзакцией
+    await connection.execute(advertisements.CREATE_STAGING_QUERY)
+    await connection.execute(sellers.CREATE_STAGING_QUERY)
+
+
+def plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+@pytest.mark.integration
+class TestQueryPlans:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", list(HOT_QUERIES))
+    async def test_hot_query_does_not_seq_scan(self, name):
+        query, args, relations = HOT_QUERIES[name]
+
+        async with get_pg_connection() as connection:
+            # Сиды и ANALYZE откатываются вместе с транзакцией
+            transaction = connection.transaction()
+            await transaction.start()
+            try:
+                await seed(connection)
+                plan = json.loads(
+                    await connection.fetchval(f"EXPLAIN (FORMAT JSON) {query}", *args)
+                )
+            finally:
+                await transaction.rollback()
+
+        seq_scans = {
+            node["Relation Name"]
+            for node in plan_nodes(plan[0]["Plan"])
+            if node["Node Type"] == "Seq Scan"
+        }
+        assert not seq_scans & relations, f"{name}: {json.dumps(plan, indent=2)}"
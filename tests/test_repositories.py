@@ -3,6 +3,8 @@ import pytest_asyncio
 
 from app.clients.postgres import get_pg_connection
 from app.errors import AdvertisementNotFoundError, SellerNotFoundError
+from app.models.advertisement import Advertisement
+from app.models.seller import Seller
 from app.repositories.advertisements import AdvertisementRepository
 from app.repositories.sellers import SellerRepository
 
@@ -77,6 +79,34 @@ class TestSellerRepository:
         assert list_is_verified == [True, False, True, True]
         await teardown_database()
 
+    @pytest.mark.integration
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_sellers(self, seller_repository: SellerRepository):
+        await setup_database()
+
+        rows = await seller_repository.bulk_upsert(
+            [Seller(id=101, is_verified=False), Seller(id=105, is_verified=True)]
+        )
+
+        assert rows == 2
+        assert (await seller_repository.get(id=101)).is_verified is False
+        assert (await seller_repository.get(id=105)).is_verified is True
+        await seller_repository.delete(id=105)
+        await teardown_database()
+
+    @pytest.mark.integration
+    @pytest.mark.asyncio
+    async def test_iterate_many_sellers(self, seller_repository: SellerRepository):
+        await setup_database()
+        sellers = [
+            seller
+            async for seller in seller_repository.iterate_many(page_size=2)
+            if seller.id >= 100
+        ]
+
+        assert [seller.id for seller in sellers] == [101, 102, 103, 104]
+        await teardown_database()
+
     @pytest.mark.asyncio
     async def test_create_seller(self, seller_repository: SellerRepository):
         await setup_database()
@@ -186,6 +216,44 @@ class TestAdvertisementRepository:
         assert closed_ad.is_closed == True
         await teardown_database()
 
+    @pytest.mark.integration
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_keeps_closed_advertisement(
+        self, advertisement_repository: AdvertisementRepository
+    ):
+        await setup_database()
+        await advertisement_repository.close(1001)
+
+        rows = await advertisement_repository.bulk_upsert(
+            [
+                Advertisement(
+                    seller_id=101,
+                    id=1001,
+                    name="Обновленный товар",
+                    description="Описание",
+                    category=1,
+                    images_qty=3,
+                ),
+                Advertisement(
+                    seller_id=101,
+                    id=2001,
+                    name="Новый товар",
+                    description="Описание",
+                    category=1,
+                    images_qty=3,
+                ),
+            ]
+        )
+
+        assert rows == 2
+        updated = await advertisement_repository.get(item_id=1001)
+        assert (updated.name, updated.is_closed) == ("Обновленный товар", True)
+        assert (await advertisement_repository.get(item_id=2001)).is_closed is False
+        assert sorted(
+            await advertisement_repository.get_ids_by_seller_ids([101, 102])
+        ) == [1001, 1002, 2001]
+        await teardown_database()
+
     @pytest.mark.asyncio
     async def test_update_advertisement(
         self, advertisement_repository: AdvertisementRepository
@@ -0,0 +1,91 @@
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from app.repositories.model import model_client
+from app.server import ServerSettings, main
+
+
+class TestServerSettings:
+    def test_defaults(self, monkeypatch):
+        for name in (
+            "HOST",
+            "PORT",
+            "SERVER_MODE",
+            "WEB_CONCURRENCY",
+            "SERVER_LOOP",
+            "SERVER_HTTP",
+            "SERVER_KEEPALIVE",
+            "SERVER_BACKLOG",
+            "SERVER_ACCESS_LOG",
+            "SERVER_PRELOAD_MODEL",
+        ):
+            monkeypatch.delenv(name, raising=False)
+
+        settings = ServerSettings.from_env()
+
+        assert settings == ServerSettings()
+        assert settings.workers == 1
+        assert settings.loop == "auto"
+        assert settings.http == "auto"
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("PORT", "9000")
+        monkeypatch.setenv("SERVER_MODE", "gunicorn")
+        monkeypatch.setenv("WEB_CONCURRENCY", "8")
+        monkeypatch.setenv("SERVER_LOOP", "uvloop")
+        monkeypatch.setenv("SERVER_HTTP", "httptools")
+        monkeypatch.setenv("SERVER_KEEPALIVE", "30")
+        monkeypatch.setenv("SERVER_BACKLOG", "4096")
+        monkeypatch.setenv("SERVER_ACCESS_LOG", "false")
+        monkeypatch.setenv("SERVER_PRELOAD_MODEL", "0")
+
+        settings = ServerSettings.from_env()
+
+        assert settings.port == 9000
+        assert settings.mode == "gunicorn"
+        assert settings.workers == 8
+        assert settings.loop == "uvloop"
+        assert settings.http == "httptools"
+        assert settings.keepalive == 30
+        assert settings.backlog == 4096
+        assert settings.access_log is False
+        assert settings.preload_model is False
+
+    def test_unknown_mode(self, monkeypatch):
+        monkeypatch.setenv("SERVER_MODE", "hypercorn")
+
+        with pytest.raises(ValueError):
+            main()
+
+    def test_uvicorn_mode_passes_settings(self, monkeypatch):
+        monkeypatch.setenv("SERVER_MODE", "uvicorn")
+        monkeypatch.setenv("WEB_CONCURRENCY", "1")
+        monkeypatch.setenv("SERVER_LOOP", "uvloop")
+        monkeypatch.setenv("SERVER_HTTP", "httptools")
+
+        with patch("uvicorn.run") as mock_run:
+            main()
+
+        kwargs = mock_run.call_args.kwargs
+        assert mock_run.call_args.args == ("app.main:app",)
+        assert kwargs["workers"] == 1
+        assert kwargs["loop"] == "uvloop"
+        assert kwargs["http"] == "httptools"
+
+
+def test_initialize_model_reuses_preloaded_model():
+    model = model_client.initialize_model()
+
+    assert model_client.initialize_model() is model
+
+
+def test_app_import_does_not_load_launcher():
+    code = (
+        "import sys, app.main; "
+        "assert not {'app.server', 'gunicorn', 'uvicorn_worker'} & set(sys.modules)"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
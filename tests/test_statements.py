@@ -0,0 +1,44 @@
+import pytest
+
+from app.errors import InvalidUpdateFieldError
+from app.repositories.statements import _build_update, update_statement
+
+
+class TestUpdateStatement:
+    def test_same_fields_give_same_query(self):
+        first, first_args = update_statement(
+            "moderation_results", {"status": "failed", "error_message": "boom"}
+        )
+        second, second_args = update_statement(
+            "moderation_results", {"error_message": "oops", "status": "failed"}
+        )
+
+        assert first is second
+        assert "SET error_message = $2, status = $3" in first
+        assert first_args == ["boom", "failed"]
+        assert second_args == ["oops", "failed"]
+
+    def test_query_is_built_once(self):
+        _build_update.cache_clear()
+
+        for _ in range(3):
+            update_statement("sellers", {"is_verified": True})
+
+        assert _build_update.cache_info().misses == 1
+
+    def test_condition(self):
+        query, _ = update_statement(
+            "moderation_results",
+            {"status": "completed"},
+            condition=" AND status = 'pending'",
+        )
+
+        assert "WHERE id = $1::INTEGER AND status = 'pending'" in query
+
+    @pytest.mark.parametrize(
+        "updates",
+        [{"id": 1}, {"name = 'x', is_closed": True}, {}],
+    )
+    def test_rejects_unknown_fields(self, updates):
+        with pytest.raises(InvalidUpdateFieldError):
+            update_statement("advertisements", updates)
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.observability.middleware import PrometheusMiddleware
+from app.observability.tracing import (
+    BACKGROUND_ENDPOINT,
+    Span,
+    current_endpoint,
+    reset_endpoint,
+    set_endpoint,
+    traced,
+)
+
+
+def get_stage_count(endpoint: str, stage: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "request_stage_duration_seconds_count",
+        {"endpoint": endpoint, "stage": stage},
+    )
+    return value or 0.0
+
+
+@traced("test.async_stage")
+async def async_stage():
+    await asyncio.sleep(0)
+    return current_endpoint()
+
+
+@traced("test.sync_stage")
+def sync_stage():
+    return current_endpoint()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        with Span("test.outer"):
+            endpoint = await async_stage()
+            thread_endpoint = await asyncio.to_thread(sync_stage)
+        return {"endpoint": endpoint, "thread_endpoint": thread_endpoint}
+
+    return TestClient(app)
+
+
+class TestSpans:
+    def test_stage_without_request_is_background(self):
+        before = get_stage_count(BACKGROUND_ENDPOINT, "test.sync_stage")
+
+        assert sync_stage() == BACKGROUND_ENDPOINT
+        assert get_stage_count(BACKGROUND_ENDPOINT, "test.sync_stage") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_endpoint_propagates_to_tasks(self):
+        token = set_endpoint("worker")
+        try:
+            endpoint = await asyncio.create_task(async_stage())
+        finally:
+            reset_endpoint(token)
+
+        assert endpoint == "worker"
+        assert current_endpoint() == BACKGROUND_ENDPOINT
+
+    def test_stages_are_labelled_with_route_template(self, client):
+        endpoint = "/items/{item_id}"
+        before = {
+            stage: get_stage_count(endpoint, stage)
+            for stage in ("test.outer", "test.async_stage", "test.sync_stage")
+        }
+
+        response = client.get("/items/42")
+
+        assert response.json() == {"endpoint": endpoint, "thread_endpoint": endpoint}
+        for stage, count in before.items():
+            assert get_stage_count(endpoint, stage) == count + 1
+
+    def test_span_records_failed_stage(self):
+        before = get_stage_count(BACKGROUND_ENDPOINT, "test.failed")
+
+        with pytest.raises(ValueError):
+            with Span("test.failed"):
+                raise ValueError("boom")
+
+        assert get_stage_count(BACKGROUND_ENDPOINT, "test.failed") == before + 1
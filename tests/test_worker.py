@@ -5,7 +5,7 @@ from unittest.mock import AsyncMock, Mock
 import pytest
 from aiokafka import ConsumerRecord
 
-from app.errors import AdvertisementNotFoundError
+from app.errors import AdvertisementNotFoundError, ErrorInPrediction
 from app.workers.moderation_worker import ModerationWorker
 
 
@@ -37,6 +37,7 @@ def mock_moder_service():
     moder_service = AsyncMock()
     moder_service.complete_moderation_task = AsyncMock()
     moder_service.fail_moderation_task = AsyncMock()
+    moder_service.is_task_finished = AsyncMock(return_value=False)
     return moder_service
 
 
@@ -48,6 +49,8 @@ def worker(mock_consumer, mock_producer, mock_ml_service, mock_moder_service):
     worker.ml_service_client = mock_ml_service
     worker.moder_service_client = mock_moder_service
     worker.n_retries = 3
+    worker.processing_delay = 0
+    worker.retry_delay = 0
     return worker
 
 
@@ -59,6 +62,10 @@ def create_test_message(task_id: int, item_id: int, timestamp: str = None):
         {"task_id": task_id, "item_id": item_id, "timestamp": timestamp}
     ).encode("utf-8")
 
+    return create_raw_message(value)
+
+
+def create_raw_message(value: bytes):
     return ConsumerRecord(
         topic="moderation",
         partition=0,
@@ -113,3 +120,85 @@ async def test_process_moderation_request_advertisement_not_found(worker):
 
     worker.moder_service_client.fail_moderation_task.assert_called_once()
     assert worker.moder_service_client.fail_moderation_task.call_args[0][0] == task_id
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_after_success(worker):
+    message = create_test_message(1, 2)
+    prediction = {"is_violation": False, "probability": 0.1}
+    worker.ml_service_client.simple_predict.side_effect = [
+        ErrorInPrediction(),
+        prediction,
+    ]
+
+    await worker.process_moderation_request(message)
+
+    assert worker.ml_service_client.simple_predict.call_count == 2
+    worker.moder_service_client.complete_moderation_task.assert_called_once_with(
+        1, prediction
+    )
+    worker.producer.send_to_dlq.assert_not_called()
+    worker.moder_service_client.fail_moderation_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_finished_task_is_skipped(worker):
+    worker.moder_service_client.is_task_finished.return_value = True
+
+    await worker.process_moderation_request(create_test_message(1, 2))
+
+    worker.ml_service_client.simple_predict.assert_not_called()
+    worker.moder_service_client.complete_moderation_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_redelivered_message_is_skipped_without_db(worker):
+    worker.ml_service_client.simple_predict.return_value = {
+        "is_violation": False,
+        "probability": 0.1,
+    }
+
+    await worker.process_moderation_request(create_test_message(1, 2))
+    await worker.process_moderation_request(create_test_message(1, 2))
+
+    worker.ml_service_client.simple_predict.assert_called_once()
+    worker.moder_service_client.is_task_finished.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_dedupe_set_is_bounded(worker):
+    worker.dedupe_size = 2
+    worker.ml_service_client.simple_predict.return_value = {
+        "is_violation": False,
+        "probability": 0.1,
+    }
+
+    for task_id in (1, 2, 3):
+        await worker.process_moderation_request(create_test_message(task_id, 2))
+
+    assert list(worker._finished_tasks) == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_undecodable_message_goes_to_dlq(worker):
+    await worker.process_moderation_request(create_raw_message(b"\x07garbage"))
+
+    worker.producer.send_to_dlq.assert_called_once_with(
+        b"\x07garbage".hex(), "UnsupportedEventFormatError", 0
+    )
+    worker.ml_service_client.simple_predict.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_continues_after_undecodable_message(worker, monkeypatch):
+    worker.consumer.__aiter__.return_value = [
+        create_raw_message(b"\x01"),
+        create_test_message(1, 2),
+    ]
+    monkeypatch.setattr(worker, "start", AsyncMock())
+    monkeypatch.setattr(worker, "stop", AsyncMock())
+
+    await worker.run()
+
+    worker.ml_service_client.simple_predict.assert_called_once_with(2)
+    assert worker.consumer.commit.call_count == 2